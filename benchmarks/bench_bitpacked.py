@@ -0,0 +1,54 @@
+"""Step time and memory per cell of the bit-packed backend against the object and byte-per-cell engines.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_bitpacked [--sizes 256 1024 4096] [--generations 10]
+"""
+import argparse
+import tracemalloc
+
+import numpy as np
+
+from benchmarks.bench_parallel import time_steps
+from engine import BitGrid, Grid, NumpyGrid
+
+OBJECT_MAX_SIZE = 256  # das Objekt-Grid ist darüber zu langsam
+ENGINES = {
+    "object": lambda size: Grid(size, size, 1),
+    "numpy": lambda size: NumpyGrid(size, size, 1),
+    "bitpacked": lambda size: BitGrid(size, size, 1),
+    "bitpacked+ages": lambda size: BitGrid(size, size, 1, track_ages=True),
+}
+
+
+def build(engine: str, size: int):
+    """Random board (fixed seed) and the bytes allocated for it."""
+    np.random.seed(0)
+    tracemalloc.start()
+    grid = ENGINES[engine](size)
+    grid.initialize_random()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return grid, allocated
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[256, 1024, 4096])
+    parser.add_argument("--generations", type=int, default=10)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        numpy_time = None
+        for engine in ENGINES:
+            if engine == "object" and size > OBJECT_MAX_SIZE:
+                continue
+            grid, allocated = build(engine, size)
+            seconds = time_steps(grid, 2 if engine == "object" else args.generations)
+            numpy_time = seconds if engine == "numpy" else numpy_time
+            speedup = f"{numpy_time / seconds:6.1f}x numpy" if numpy_time else ""
+            print(f"{size}x{size}  {engine:<15} {seconds * 1000:9.2f} ms/gen  "
+                  f"{allocated * 8 / (size * size):7.1f} bits/cell  {speedup}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,35 @@
+"""Step time of each boundary topology compared with the dead edge.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_boundary [--size 1000] [--generations 50] [--backends numpy tiled]
+"""
+import argparse
+
+import numpy as np
+
+from benchmarks.bench_parallel import time_steps
+from engine import BOUNDARIES, GRID_BACKENDS
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=1000)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--backends", nargs="+", default=["numpy", "tiled"])
+    args = parser.parse_args()
+
+    for backend in args.backends:
+        dead_time = None
+        for boundary in BOUNDARIES:
+            grid = GRID_BACKENDS[backend](args.size, args.size, 1, boundary=boundary)
+            np.random.seed(0)
+            grid.initialize_random()
+            seconds = time_steps(grid, args.generations)
+            if hasattr(grid, "close"):
+                grid.close()
+            dead_time = dead_time or seconds
+            print(f"{backend:<8} {boundary:<6} {seconds * 1000:8.2f} ms/gen  {seconds / dead_time:5.2f}x dead")
+
+
+if __name__ == "__main__":
+    main()
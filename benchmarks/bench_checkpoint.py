@@ -0,0 +1,61 @@
+"""Save and load times of binary checkpoints against RLE for large boards.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_checkpoint [--sizes 2000 10000] [--backends bitpacked numpy] [--repeat 3]
+"""
+import argparse
+import os
+import tempfile
+
+import numpy as np
+
+import rle
+from benchmarks.bench_rle import best_of
+from engine import GameOfLife, pack_bits
+
+RLE_MAX_SIZE = 4000  # RLE braucht darüber mehrere Sekunden pro Durchlauf
+
+
+def random_game(backend: str, size: int) -> GameOfLife:
+    """Board with 30% live cells (fixed seed), without a float array of the full size."""
+    game = GameOfLife(size, size, 1, backend=backend)
+    rng = np.random.default_rng(0)
+    state = np.empty((size, size), dtype=np.uint8)
+    for x in range(0, size, 1000):  # streifenweise, damit 10k x 10k nicht 800 MB Zufallszahlen braucht
+        state[x:x + 1000] = rng.random((min(1000, size - x), size)) < 0.3
+    if backend == "bitpacked":
+        game.grid.set_bit_planes({"alive": pack_bits(state), "fresh": game.grid.fresh})
+    else:
+        game.grid.set_state_array(state)
+    return game
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 10000])
+    parser.add_argument("--backends", nargs="+", default=["bitpacked", "numpy"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "board.golc")
+        for size in args.sizes:
+            for backend in args.backends:
+                game = random_game(backend, size)
+                loaded = GameOfLife(1, 1, 1, backend=backend)
+                save = best_of(args.repeat, game.save_checkpoint, path)
+                load = best_of(args.repeat, loaded.load_checkpoint, path, None, False)
+                verified = best_of(args.repeat, loaded.load_checkpoint, path, None, True)
+                print(f"{size}x{size}  {backend:<10} {os.path.getsize(path) / 2 ** 20:8.1f} MiB  "
+                      f"save {save * 1000:8.1f} ms  load {load * 1000:8.1f} ms  verified {verified * 1000:8.1f} ms")
+            if size <= RLE_MAX_SIZE:
+                state = game.grid.get_state_array()
+                text = rle.encode(state)
+                encode = best_of(1, rle.encode, state)
+                decode = best_of(1, rle.decode, text)
+                print(f"{size}x{size}  {'rle':<10} {len(text) / 2 ** 20:8.1f} MiB  "
+                      f"save {encode * 1000:8.1f} ms  load {decode * 1000:8.1f} ms  (states only)")
+
+
+if __name__ == "__main__":
+    main()
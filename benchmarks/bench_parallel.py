@@ -0,0 +1,47 @@
+"""Scaling of ParallelGrid across worker counts.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_parallel [--sizes 2000 4000] [--workers 1 2 4 8] [--generations 20]
+"""
+import argparse
+import time
+
+import numpy as np
+
+from engine import NumpyGrid, ParallelGrid
+
+
+def time_steps(grid, generations: int) -> float:
+    """Seconds per generation (after one warm-up step)."""
+    grid.update()
+    start = time.perf_counter()
+    for _ in range(generations):
+        grid.update()
+    return (time.perf_counter() - start) / generations
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 4000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--generations", type=int, default=20)
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        np.random.seed(0)
+        serial = NumpyGrid(size, size, 1)
+        serial.initialize_random()
+        serial_time = time_steps(serial, args.generations)
+        print(f"{size}x{size}  serial      {serial_time * 1000:8.1f} ms/gen")
+
+        for workers in args.workers:
+            grid = ParallelGrid(size, size, 1, workers=workers)
+            np.random.seed(0)
+            grid.initialize_random()
+            seconds = time_steps(grid, args.generations)
+            grid.close()
+            print(f"{size}x{size}  {workers} worker(s) {seconds * 1000:8.1f} ms/gen  speedup {serial_time / seconds:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()
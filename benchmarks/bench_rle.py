@@ -0,0 +1,49 @@
+"""Throughput of the RLE decoder and encoder in MB/s.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_rle [--size 2000] [--density 0.3] [--repeat 3]
+"""
+import argparse
+import time
+
+import numpy as np
+
+import rle
+
+
+def best_of(repeat: int, function, *args) -> float:
+    """Fastest of ``repeat`` runs in seconds."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=2000)
+    parser.add_argument("--density", type=float, default=0.3)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    bitmap = (np.random.default_rng(0).random((args.size, args.size)) < args.density).astype(np.uint8)
+    text = rle.encode(bitmap)
+    header, decoded = rle.decode(text)
+    assert (decoded == bitmap).all(), "round trip failed"
+    megabytes = len(text) / 1e6
+
+    encode_time = best_of(args.repeat, rle.encode, bitmap)
+    decode_time = best_of(args.repeat, rle.decode, text)
+    headerless = text.split("\n", 1)[1]
+    headerless_time = best_of(args.repeat, rle.decode, headerless)
+
+    print(f"{args.size}x{args.size} cells, density {args.density}, {megabytes:.2f} MB of RLE")
+    print(f"  decode             {megabytes / decode_time:8.2f} MB/s")
+    print(f"  decode (no header) {megabytes / headerless_time:8.2f} MB/s")
+    print(f"  encode             {megabytes / encode_time:8.2f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+"""Benchmark suite for the engine, the RLE parser and the renderer, with JSON baselines.
+
+Usage (from the repository root):
+    python -m benchmarks.bench_suite [--sizes 100 512 1024 4096] [--filter step/]
+                                     [--save FILE] [--compare FILE] [--tolerance 0.10] [--json]
+
+Workloads:
+    step/BACKEND/SIZE    random board (fixed seed), generations/s
+    pattern/NAME         pattern from pattern_library on the tiled backend, generations/s
+    render/MODE/CELL     offscreen GridRenderer (SDL dummy driver), ms/frame
+    parse/FUNCTION       RLE decoding, MB/s
+
+Every workload runs in a fresh process, so its ``peak_rss`` is the peak of
+that workload alone. Nothing needs a display or the network. ``--save``
+writes the results as a baseline; ``--compare`` reads one and exits with
+status 1 if any metric is worse by more than ``--tolerance``.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import sys
+import time
+
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")  # vor dem Import von pygame, gilt auch für die Kindprozesse
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import numpy as np
+
+from benchmarks.bench_parallel import time_steps
+from benchmarks.bench_rle import best_of
+
+SEED = 0
+SIZES = [100, 512, 1024, 4096]
+OBJECT_MAX_SIZE = 256  # das Objekt-Grid ist darüber zu langsam für einen Benchmark
+PATTERN_SIZE = 256
+PATTERN_GENERATIONS = 200
+RENDER_WORLD = 180  # wie im Spiel: 900 // 5 Zellen
+RENDER_FRAMES = 30
+PARSE_SIZE = 1000
+
+
+def step_workload(backend: str, size: int) -> dict:
+    from engine import GRID_BACKENDS
+
+    random.seed(SEED)
+    np.random.seed(SEED)
+    grid = GRID_BACKENDS[backend](size, size, 1)
+    grid.initialize_random()
+    generations = 3 if backend == "object" else max(2, min(50, 2_000_000 // (size * size)))
+    seconds = time_steps(grid, generations)
+    if hasattr(grid, "close"):
+        grid.close()
+    return {"value": 1 / seconds, "unit": "gen/s", "higher_is_better": True}
+
+
+def pattern_workload(name: str) -> dict:
+    from engine import TiledGrid
+    from pattern_library import patterns
+
+    grid = TiledGrid(PATTERN_SIZE, PATTERN_SIZE, 1)
+    grid.apply_rle_pattern(patterns[name])
+    start = time.perf_counter()
+    for _ in range(PATTERN_GENERATIONS):
+        grid.update()
+    return {"value": PATTERN_GENERATIONS / (time.perf_counter() - start), "unit": "gen/s", "higher_is_better": True}
+
+
+def render_workload(mode: str, cell_size: int) -> dict:
+    """``full`` repaints the whole board every frame, ``incremental`` draws after one step."""
+    import pygame
+
+    from engine import TiledGrid
+    from renderer import GridRenderer
+    from viewport import Viewport
+
+    pygame.display.init()
+    screen = pygame.Surface((900, 900))
+    np.random.seed(SEED)
+    grid = TiledGrid(RENDER_WORLD, RENDER_WORLD, cell_size)
+    grid.initialize_random()
+    viewport = Viewport(RENDER_WORLD, RENDER_WORLD, cell_size)
+    renderer = GridRenderer()
+    renderer.draw(screen, grid, viewport)
+
+    seconds = 0.0
+    for _ in range(RENDER_FRAMES):
+        if mode == "full":
+            renderer.invalidate()
+        else:
+            grid.update()
+        start = time.perf_counter()
+        renderer.draw(screen, grid, viewport)
+        seconds += time.perf_counter() - start
+    pygame.display.quit()
+    return {"value": seconds / RENDER_FRAMES * 1000, "unit": "ms/frame", "higher_is_better": False}
+
+
+def parse_workload(function: str) -> dict:
+    import rle
+    from engine import Grid
+
+    bitmap = (np.random.default_rng(SEED).random((PARSE_SIZE, PARSE_SIZE)) < 0.3).astype(np.uint8)
+    text = rle.encode(bitmap)
+    parse = rle.decode if function == "rle.decode" else Grid.parse_rle
+    return {"value": len(text) / 1e6 / best_of(3, parse, text), "unit": "MB/s", "higher_is_better": True}
+
+
+def workloads(sizes: list) -> dict:
+    """All workloads by name: name -> (function, args)."""
+    from engine import GRID_BACKENDS
+    from pattern_library import patterns
+
+    result = {}
+    for size in sizes:
+        for backend in GRID_BACKENDS:
+            if backend == "parallel" or (backend == "object" and size > OBJECT_MAX_SIZE):
+                continue  # ParallelGrid hat seinen eigenen Benchmark (bench_parallel)
+            result[f"step/{backend}/{size}"] = (step_workload, (backend, size))
+    for name in patterns:
+        result[f"pattern/{name}"] = (pattern_workload, (name,))
+    for mode in ("full", "incremental"):
+        for cell_size in (5, 20):
+            result[f"render/{mode}/{cell_size}"] = (render_workload, (mode, cell_size))
+    for function in ("rle.decode", "Grid.parse_rle"):
+        result[f"parse/{function}"] = (parse_workload, (function,))
+    return result
+
+
+def _child(function, args, connection):
+    try:
+        result = function(*args)
+        result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # Linux: KiB
+        connection.send(result)
+    except Exception as error:  # Fehler an den Elternprozess melden statt den ganzen Lauf abzubrechen
+        connection.send({"error": f"{type(error).__name__}: {error}"})
+    connection.close()
+
+
+def run_isolated(function, args) -> dict:
+    """Run one workload in a fresh (spawned) process and return its result."""
+    context = multiprocessing.get_context("spawn")
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_child, args=(function, args, sender))
+    process.start()
+    sender.close()
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = {"error": "workload process died"}
+    process.join()
+    return result
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    """Names of the metrics that are worse than the baseline by more than ``tolerance``."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base is None or "value" not in result:
+            continue
+        for key, higher_is_better in (("value", result["higher_is_better"]), ("peak_rss_mb", False)):
+            old, new = base.get(key), result.get(key)
+            if not old or new is None:
+                continue
+            worse = new < old * (1 - tolerance) if higher_is_better else new > old * (1 + tolerance)
+            if worse:
+                regressions.append(name if key == "value" else f"{name} ({key})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--filter", default="", help="only run workloads whose name contains this text")
+    parser.add_argument("--save", help="write the results as a JSON baseline")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="allowed slowdown (0.10 = 10%%)")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args()
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)["results"]
+
+    results = {}
+    for name, (function, function_args) in workloads(args.sizes).items():
+        if args.filter not in name:
+            continue
+        results[name] = result = run_isolated(function, function_args)
+        if args.json:
+            continue
+        if "error" in result:
+            print(f"{name:<28} ERROR {result['error']}")
+            continue
+        line = f"{name:<28} {result['value']:12.2f} {result['unit']:<8} {result['peak_rss_mb']:8.1f} MB peak"
+        old = baseline.get(name, {}).get("value")
+        if old:
+            line += f"  {(result['value'] / old - 1) * 100:+6.1f}% vs baseline"
+        print(line, flush=True)
+
+    report = {
+        "machine": {"python": platform.python_version(), "numpy": np.__version__,
+                    "platform": platform.platform(), "cpus": os.cpu_count()},
+        "results": results,
+    }
+    if args.json:
+        print(json.dumps(report, indent=2))
+    if args.save:
+        with open(args.save, "w") as file:
+            json.dump(report, file, indent=2)
+
+    regressions = compare(results, baseline, args.tolerance)
+    failed = [name for name, result in results.items() if "error" in result]
+    if regressions:
+        print(f"{len(regressions)} regression(s) over {args.tolerance:.0%}: {', '.join(regressions)}", file=sys.stderr)
+    if regressions or failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
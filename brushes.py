@@ -0,0 +1,56 @@
+import math
+from functools import lru_cache
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Form eines Pinsels: Abstand (dx, dy) zum Mittelpunkt -> liegt die Zelle im Pinsel?
+BRUSHES = {
+    "disc": lambda dx, dy, radius: np.sqrt(dx ** 2 + dy ** 2) <= radius,
+    "square": lambda dx, dy, radius: (np.abs(dx) <= radius) & (np.abs(dy) <= radius),
+    "diamond": lambda dx, dy, radius: np.abs(dx) + np.abs(dy) <= radius,
+}
+
+
+def check_brush(brush: str) -> str:
+    if brush not in BRUSHES:
+        raise ValueError(f"unknown brush {brush!r}, expected one of {list(BRUSHES)}")
+    return brush
+
+
+@lru_cache(maxsize=256)
+def _stencil(frac_x: float, frac_y: float, radius: float, brush: str) -> Tuple[int, int, np.ndarray]:
+    x0, x1 = math.ceil(frac_x - radius), math.floor(frac_x + radius) + 1
+    y0, y1 = math.ceil(frac_y - radius), math.floor(frac_y + radius) + 1
+    xs = np.arange(x0, x1)[:, None]
+    ys = np.arange(y0, y1)[None, :]
+    mask = BRUSHES[brush](xs - frac_x, ys - frac_y, radius)
+    mask.setflags(write=False)  # wird zwischen allen Aufrufen geteilt
+    return x0, y0, mask
+
+
+def stencil(pos_x: float, pos_y: float, radius: float = 10, brush: str = "disc") -> Tuple[int, int, np.ndarray]:
+    """Cells covered by a brush centred on (pos_x, pos_y).
+
+    Returns the first cell ``(x0, y0)`` of the bounding box and a read-only
+    bool mask of the box, indexed [x, y]. The mask only depends on the
+    fractional part of the position, so it is computed once per
+    (fraction, radius, brush) and then reused; the cost of a spell is
+    proportional to the brush area, not the board.
+    """
+    base_x, base_y = math.floor(pos_x), math.floor(pos_y)
+    x0, y0, mask = _stencil(pos_x - base_x, pos_y - base_y, radius, check_brush(brush))
+    return base_x + x0, base_y + y0, mask
+
+
+def clip(x0: int, y0: int, mask: np.ndarray, width: int, height: int) -> Optional[Tuple[slice, slice, np.ndarray]]:
+    """Clip a stencil to a ``width`` x ``height`` board.
+
+    Returns the slices of the board and the matching part of the mask, or
+    None if the stencil lies completely outside.
+    """
+    cx0, cy0 = max(x0, 0), max(y0, 0)
+    cx1, cy1 = min(x0 + mask.shape[0], width), min(y0 + mask.shape[1], height)
+    if cx0 >= cx1 or cy0 >= cy1:
+        return None
+    return slice(cx0, cx1), slice(cy0, cy1), mask[cx0 - x0:cx1 - x0, cy0 - y0:cy1 - y0]
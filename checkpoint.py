@@ -0,0 +1,111 @@
+"""Binary checkpoint format: a JSON header plus raw, memory-mappable planes.
+
+Layout of a file (integers little-endian)::
+
+    magic     8 bytes   b"GOLCKPT\\0"
+    version   uint32    VERSION
+    length    uint32    byte length of the JSON header
+    crc32     uint32    of the JSON header
+    header    JSON      metadata and the plane table
+    planes              raw arrays in C order, each starting at a multiple of ALIGN
+
+The plane table (``header["planes"]``) gives dtype, shape, offset and crc32
+of every plane. ``read`` maps the file with ``mmap`` (copy-on-write) and
+returns the planes as arrays backed by the mapping, so nothing is read
+before it is used and writing to a plane never touches the file. What the
+planes mean is up to the caller (see ``GameOfLife.save_checkpoint``).
+"""
+import json
+import mmap
+import os
+import struct
+import zlib
+from typing import Dict, Tuple
+
+import numpy as np
+
+MAGIC = b"GOLCKPT\0"
+VERSION = 1
+ALIGN = 64  # Ebenen beginnen an Cache-Line-Grenzen
+_PREFIX = struct.Struct("<8sIII")  # magic, version, Länge und crc32 des Headers
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGN) * ALIGN
+
+
+def _little_endian(plane: np.ndarray) -> np.ndarray:
+    plane = np.asarray(plane)
+    return np.ascontiguousarray(plane, dtype=plane.dtype.newbyteorder("<"))
+
+
+def write(path: str, header: Dict[str, object], planes: Dict[str, np.ndarray]):
+    """Write ``header`` (JSON-serialisable) and ``planes`` to ``path``.
+
+    The planes are written in bulk, one ``write`` each. The file is written
+    next to ``path`` and renamed at the end, so a failed save never leaves
+    a half-written checkpoint behind.
+    """
+    planes = {name: _little_endian(plane) for name, plane in planes.items()}
+    table, offset = {}, 0
+    for name, plane in planes.items():
+        table[name] = {"dtype": plane.dtype.str, "shape": list(plane.shape), "offset": offset,
+                       "crc32": zlib.crc32(plane)}
+        offset = _aligned(offset + plane.nbytes)
+    encoded = json.dumps(dict(header, planes=table)).encode()
+    data_start = _aligned(_PREFIX.size + len(encoded))  # Offsets in der Tabelle zählen ab hier
+
+    temporary = f"{path}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(_PREFIX.pack(MAGIC, VERSION, len(encoded), zlib.crc32(encoded)))
+        file.write(encoded)
+        for name, plane in planes.items():
+            file.seek(data_start + table[name]["offset"])
+            file.write(plane)
+        file.truncate(max(file.tell(), data_start))
+    os.replace(temporary, path)
+
+
+def read_header(path: str) -> Dict[str, object]:
+    """The header of a checkpoint (including the plane table) without mapping the planes."""
+    with open(path, "rb") as file:
+        return _parse_header(file.read(_PREFIX.size), file.read)[0]
+
+
+def _parse_header(prefix: bytes, read) -> Tuple[Dict[str, object], int]:
+    if len(prefix) < _PREFIX.size:
+        raise ValueError("not a checkpoint (file too short)")
+    magic, version, length, checksum = _PREFIX.unpack(prefix)
+    if magic != MAGIC:
+        raise ValueError("not a checkpoint (wrong magic bytes)")
+    if version != VERSION:
+        raise ValueError(f"unsupported checkpoint version {version}, expected {VERSION}")
+    encoded = read(length)
+    if len(encoded) != length or zlib.crc32(encoded) != checksum:
+        raise ValueError("corrupt checkpoint header (checksum mismatch)")
+    return json.loads(encoded), _aligned(_PREFIX.size + length)
+
+
+def read(path: str, verify: bool = True) -> Tuple[Dict[str, object], Dict[str, np.ndarray]]:
+    """Map a checkpoint; returns the header and the planes (copy-on-write views of the file).
+
+    With ``verify`` the crc32 of every plane is checked, which reads the
+    whole file; without it only the header is read now and each page of a
+    plane is loaded when it is first touched.
+    """
+    with open(path, "rb") as file:
+        size = os.fstat(file.fileno()).st_size
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY) if size else b""
+    header, data_start = _parse_header(buffer[:_PREFIX.size], lambda length: buffer[_PREFIX.size:_PREFIX.size + length])
+    planes = {}
+    for name, entry in header["planes"].items():
+        dtype, shape = np.dtype(entry["dtype"]), tuple(entry["shape"])
+        start = data_start + entry["offset"]
+        count = int(np.prod(shape, dtype=np.int64))
+        if start + count * dtype.itemsize > size:
+            raise ValueError(f"corrupt checkpoint (plane {name!r} is truncated)")
+        plane = np.frombuffer(buffer, dtype=dtype, count=count, offset=start).reshape(shape)
+        if verify and zlib.crc32(plane) != entry["crc32"]:
+            raise ValueError(f"corrupt checkpoint (checksum mismatch in plane {name!r})")
+        planes[name] = plane
+    return header, planes
@@ -0,0 +1,129 @@
+from collections import deque
+from typing import Dict, Optional
+
+import numpy as np
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_Y_FACTOR = np.uint64(0xC2B2AE3D27D4EB4F)
+_STATE_FACTOR = np.uint64(0x165667B19E3779F9)
+
+
+def _mix(z: np.ndarray) -> np.ndarray:
+    """splitmix64-Finalizer, verteilt die Bits der Eingabe gleichmäßig."""
+    z = (z ^ (z >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    z = (z ^ (z >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return z ^ (z >> np.uint64(31))
+
+
+def _keys(xs: np.ndarray, ys: np.ndarray, states: np.ndarray) -> np.ndarray:
+    z = (np.asarray(xs).astype(np.uint64) * _GOLDEN + np.asarray(ys).astype(np.uint64) * _Y_FACTOR
+         + np.asarray(states).astype(np.uint64) * _STATE_FACTOR)
+    return _mix(z)
+
+
+def zobrist(xs: np.ndarray, ys: np.ndarray, states: np.ndarray) -> int:
+    """XOR of the Zobrist keys of the cells (x, y) in the given states.
+
+    Keys are derived from the coordinates and the state with a hash function
+    instead of a stored table, so they work for any board size (and for
+    negative coordinates on the unbounded plane). Dead cells (state 0) have
+    no key, so the hash of a board is the XOR over its non-dead cells.
+    """
+    states = np.asarray(states)
+    keep = states != 0
+    return int(np.bitwise_xor.reduce(_keys(np.asarray(xs)[keep], np.asarray(ys)[keep], states[keep])))
+
+
+def key_table(width: int, height: int) -> np.ndarray:
+    """Keys of state 1 for every cell of a ``width`` x ``height`` board, indexed [x, y].
+
+    Dense grids keep this table so that two-state steps can hash their
+    flipped cells with one masked reduction (see ``masked_hash``).
+    """
+    xs, ys = np.indices((width, height))
+    return _keys(xs, ys, np.ones_like(xs))
+
+
+def masked_hash(keys: np.ndarray, mask: np.ndarray) -> int:
+    """XOR of the keys where ``mask`` is set."""
+    return int(np.bitwise_xor.reduce((keys * mask).reshape(-1)))
+
+
+def region_hash(state: np.ndarray, x0: int = 0, y0: int = 0) -> int:
+    """Zobrist hash of a state array whose first cell is (x0, y0)."""
+    xs, ys = np.nonzero(state)
+    return zobrist(xs + x0, ys + y0, state[xs, ys])
+
+
+def flip_hash(xs: np.ndarray, ys: np.ndarray, old: np.ndarray, new: np.ndarray) -> int:
+    """Hash change when the cells (x, y) go from the states ``old`` to ``new``."""
+    return zobrist(xs, ys, old) ^ zobrist(xs, ys, new)
+
+
+# Erkennt Wiederholungen des Spielfelds über den laufenden Hash
+class CycleDetector:
+    """Detects extinction and period-N cycles from the rolling board hash.
+
+    ``observe`` is called once per generation with the grid's ``state_hash``.
+    The last ``capacity`` hashes are kept in a table (hash -> generation), so
+    every period up to ``capacity`` is found as soon as the first state of
+    the cycle repeats. Any edit of the board (the grid's ``edits`` counter
+    changes) clears the table, because states from before the edit say
+    nothing about the future. After a detection ``period`` and
+    ``cycle_start`` stay set until the next edit. An empty board (hash 0) is
+    reported right away as extinction: ``extinct`` is True, with period 1.
+    """
+
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self._seen: Dict[int, int] = {}
+        self._order = deque()
+        self._edits = None
+        self._generation = None
+        self.period: Optional[int] = None
+        self.cycle_start: Optional[int] = None
+        self.extinct = False
+
+    @property
+    def detected(self) -> bool:
+        return self.period is not None
+
+    def reset(self):
+        self._seen.clear()
+        self._order.clear()
+        self.period = None
+        self.cycle_start = None
+        self.extinct = False
+
+    def observe(self, generation: int, state_hash: int, edits: int = 0) -> bool:
+        """Record one generation; returns True when a cycle was found in this call."""
+        if edits != self._edits:
+            self._edits = edits
+            self.reset()
+        elif generation == self._generation:
+            return False  # diese Generation wurde schon beobachtet
+        self._generation = generation
+        if self.period is not None:
+            return False
+
+        if state_hash == 0:
+            self.period, self.cycle_start, self.extinct = 1, generation, True
+            return True
+        start = self._seen.get(state_hash)
+        if start is not None:
+            self.period = generation - start
+            self.cycle_start = start
+            return True
+
+        self._seen[state_hash] = generation
+        self._order.append(state_hash)
+        if len(self._order) > self.capacity:
+            del self._seen[self._order.popleft()]
+        return False
+
+    def describe(self) -> str:
+        if self.extinct:
+            return f"ausgestorben ab Gen. {self.cycle_start}"
+        if self.period is not None:
+            return f"Periode {self.period} ab Gen. {self.cycle_start}"
+        return "kein Zyklus"
@@ -0,0 +1,1934 @@
+import multiprocessing
+import os
+import random
+import weakref
+from enum import Enum
+from multiprocessing import shared_memory
+from typing import List, Tuple
+
+import numpy as np
+
+import checkpoint
+import rle as rle_codec
+from brushes import clip, stencil
+from cycles import CycleDetector, flip_hash, key_table, masked_hash, region_hash, zobrist
+from hashlife import HashlifeEngine
+from palette import DEFAULT_PALETTE, MAX_AGE, Palette
+from rules import LIFE, Rule, count_alive_neighbors, parse_rule
+from stats_history import StatsHistory
+
+
+# Enum for cell states
+class CellState(Enum):
+    ALIVE = 1
+    DEAD = 0
+
+# Class for each cell in the grid
+class Cell:
+    def __init__(self, x: int, y: int, state: CellState = CellState.DEAD, freezed: bool = False) -> None:
+        self.x = x
+        self.y = y
+        self.state = state
+        self.next_state = state  # Speichert nächsten Stand nachdem Regeln angewendet wurden
+        self.time_not_changed = 0
+        self.freezed = freezed
+
+    def determine_next_state(self, neighbors: List['Cell'], rule: Rule = LIFE):
+        """Determine the cell's next state based on the rule (B3/S23 by default)"""
+        alive_neighbors = sum(1 for neighbor in neighbors if neighbor.state == CellState.ALIVE)
+
+        if self.state == CellState.ALIVE:
+            self.next_state = CellState.ALIVE if alive_neighbors in rule.survival else CellState.DEAD
+        else:
+            self.next_state = CellState.ALIVE if alive_neighbors in rule.birth else CellState.DEAD
+
+        '''Count, that a cell did not change'''
+        if self.state == self.next_state:
+            if not self.freezed:
+                self.time_not_changed += 1
+        else:
+            self.time_not_changed = 0
+
+    def update_state(self):
+        """Update cell's state to its next state"""
+        self.state = self.next_state
+
+
+# Randbedingungen: toter Rand, Torus, Spiegelung, Kleinsche Flasche
+BOUNDARIES = ("dead", "torus", "mirror", "klein")
+
+
+def check_boundary(boundary: str) -> str:
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"unknown boundary {boundary!r}, expected one of {BOUNDARIES}")
+    return boundary
+
+
+def fill_halo(padded: np.ndarray, boundary: str):
+    """Fill the one-cell border of ``padded`` (indexed [x, y]) from its interior.
+
+    dead: zeros. torus: both axes wrap. mirror: the halo repeats the edge
+    cells. klein: x wraps, y wraps with x flipped (Klein bottle). Only the
+    border is written, so this costs O(width + height).
+    """
+    if boundary == "dead":
+        padded[[0, -1], :] = 0
+        padded[:, [0, -1]] = 0
+    elif boundary == "mirror":
+        padded[0, 1:-1], padded[-1, 1:-1] = padded[1, 1:-1], padded[-2, 1:-1]
+        padded[:, 0], padded[:, -1] = padded[:, 1], padded[:, -2]
+    else:
+        padded[0, 1:-1], padded[-1, 1:-1] = padded[-2, 1:-1], padded[1, 1:-1]
+        if boundary == "torus":
+            padded[:, 0], padded[:, -1] = padded[:, -2], padded[:, 1]
+        else:  # klein: über den Rand in y landet man gespiegelt in x
+            padded[:, 0], padded[:, -1] = padded[::-1, -2], padded[::-1, 1]
+
+
+def header_rule(header: dict):
+    """Rule from the ``rule =`` field of an RLE header, or None if there is none."""
+    return parse_rule(header["rule"]) if header.get("rule") else None
+
+
+def neighbor_coordinates(x: int, y: int, width: int, height: int, boundary: str):
+    """Map a (possibly out-of-range) cell position onto the board, or None for a dead edge."""
+    if 0 <= x < width and 0 <= y < height:
+        return x, y
+    if boundary == "dead":
+        return None
+    if boundary == "mirror":
+        return min(max(x, 0), width - 1), min(max(y, 0), height - 1)
+    if boundary == "klein" and not 0 <= y < height:
+        x = width - 1 - x
+    return x % width, y % height
+
+
+# Class for the grid of cells
+class Grid:
+    def __init__(self, width: int, height: int, cell_size: int, boundary: str = "dead", rule: str = "B3/S23") -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.boundary = check_boundary(boundary)
+        self.cells = [[Cell(x, y) for y in range(height)] for x in range(width)]
+        self.stats = [0, 0, 0, 0]  # Alive, Dead, New Alive, New Dead
+        self.set_rule(rule)
+
+    def set_rule(self, rule):
+        """Switch the rule (B/S notation, a name from rules.RULES or a Rule); only two-state rules."""
+        rule = parse_rule(rule)
+        if rule.states > 2:
+            raise ValueError("the object grid only supports two-state rules, use a numpy backend for Generations")
+        self.rule = rule
+
+    def apply_rle_pattern(self, rle: str):
+        """Wendet ein RLE-Pattern auf das Grid an (mit der Regel aus dem Header, falls vorhanden)."""
+        header, bitmap = rle_codec.decode(rle)
+        rule = header_rule(header)
+        if rule is not None:
+            self.set_rule(rule)
+
+        # Größe des RLE-Musters bestimmen
+        pattern_width = bitmap.shape[1]
+        pattern_height = bitmap.shape[0]
+
+        # Berechnung der Offsets für die Zentrierung
+        offset_x = (self.width - pattern_width) // 2
+        offset_y = (self.height - pattern_height) // 2
+        self.stamp(bitmap, offset_x, offset_y)
+
+    def stamp(self, bitmap: np.ndarray, x0: int, y0: int):
+        """Write a pattern bitmap (indexed [x, y], 1 = ALIVE) with its first cell at (x0, y0), clipped to the grid."""
+        for x, row in enumerate(bitmap.tolist()):
+            for y, value in enumerate(row):
+                if 0 <= x + x0 < self.width and 0 <= y + y0 < self.height:
+                    self.cells[x + x0][y + y0].state = CellState.ALIVE if value == 1 else CellState.DEAD
+                    self.cells[x + x0][y + y0].time_not_changed = 0
+
+    @staticmethod
+    def parse_rle(rle, width=None, height=None):
+        """Parst ein RLE-Pattern in ein 2D-Grid."""
+        header, bitmap = rle_codec.decode(rle)
+        grid = bitmap.tolist()
+
+        # Optional: Größe anpassen
+        if width or height:
+            target_width = width if width else len(grid[0])
+            target_height = height if height else len(grid)
+            padded_grid = [[0] * target_width for _ in range(target_height)]
+
+            for i in range(min(target_height, len(grid))):
+                for j in range(min(target_width, len(grid[i]))):
+                    padded_grid[i][j] = grid[i][j]
+            grid = padded_grid
+
+        return grid
+
+    def initialize_random(self):
+        """Randomly initialize the grid with alive and dead cells."""
+        for row in self.cells:
+            for cell in row:
+                cell.state = CellState.ALIVE if random.random() > 0.7 else CellState.DEAD # mehr DEAD Zellen (größere Wahrscheinlichkeit)
+                cell.time_not_changed = 0
+    
+    def change_cell_state(self, x, y):
+        cell = self.cells[x][y]
+        if cell.state == CellState.ALIVE:
+            cell.state = CellState.DEAD
+        else:
+            cell.state = CellState.ALIVE
+    
+    def initialize_manually(self):
+        for row in self.cells:
+            for cell in row:
+                cell.state = CellState.DEAD
+
+    def get_state_array(self) -> np.ndarray:
+        """Return the cell states as an array indexed [x, y] (1 = ALIVE)."""
+        return np.array([[cell.state.value for cell in row] for row in self.cells], dtype=np.uint8)
+
+    def get_cell_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return copies of state, time_not_changed and freezed, each indexed [x, y]."""
+        state = self.get_state_array()
+        ages = np.array([[cell.time_not_changed for cell in row] for row in self.cells], dtype=np.int64)
+        freezed = np.array([[cell.freezed for cell in row] for row in self.cells], dtype=bool)
+        return state, ages, freezed
+
+    def set_state_array(self, state: np.ndarray):
+        """Overwrite all cell states from an array indexed [x, y] and reset the ages."""
+        for x, row in enumerate(self.cells):
+            for y, cell in enumerate(row):
+                cell.state = CellState.ALIVE if state[x, y] else CellState.DEAD
+                cell.next_state = cell.state
+                cell.time_not_changed = 0
+
+    def set_cell_arrays(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray):
+        """Overwrite state, time_not_changed and freezed from arrays indexed [x, y] (see ``get_cell_arrays``)."""
+        for x, row in enumerate(self.cells):
+            for y, cell in enumerate(row):
+                cell.state = CellState.ALIVE if state[x, y] == 1 else CellState.DEAD
+                cell.next_state = cell.state
+                cell.time_not_changed = int(ages[x, y])
+                cell.freezed = bool(freezed[x, y])
+
+    def reset_field(self):
+        for row in self.cells:
+            for cell in row:
+                cell.next_state = CellState.DEAD
+                cell.time_not_changed = 0
+                cell.update_state()
+
+    def get_neighbors(self, cell: Cell) -> List[Cell]:
+        """Return a list of neighboring cells for a given cell."""
+        neighbors = []
+        for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
+            position = neighbor_coordinates(cell.x + dx, cell.y + dy, self.width, self.height, self.boundary)
+            try:
+                if position is not None:
+                    neighbors.append(self.cells[position[0]][position[1]])
+            except IndexError as e:
+                pass
+
+        return neighbors
+
+
+    def update(self):
+        """Apply Game of Life rules to each cell in the grid."""
+        # Determine next state for each cell
+        for row in self.cells:
+            for cell in row:
+                neighbors = self.get_neighbors(cell)
+                cell.determine_next_state(neighbors, self.rule)
+        
+        # Update state to the next state
+        for row in self.cells:
+            for cell in row:
+                if not cell.freezed:
+                    cell.update_state()
+
+ 
+
+    def _brush_cells(self, pos_x: float, pos_y: float, radius: float, brush: str) -> List[Cell]:
+        """Cells under a brush (see ``brushes``), only the bounding box is visited."""
+        region = clip(*stencil(pos_x, pos_y, radius, brush), len(self.cells), len(self.cells[0]))
+        if region is None:
+            return []
+        xs, ys, mask = region
+        return [self.cells[xs.start + i][ys.start + j] for i, j in zip(*np.nonzero(mask))]
+
+    def apply_lightning(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        for cell in self._brush_cells(pos_x, pos_y, radius, brush):
+            cell.next_state = CellState.ALIVE if cell.state == CellState.DEAD else CellState.DEAD
+            cell.time_not_changed = 0
+            cell.update_state()
+    
+    def apply_freeze(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        for cell in self._brush_cells(pos_x, pos_y, radius, brush):
+            cell.freezed = True
+
+    def apply_unfreeze(self):
+        for i, row in enumerate(self.cells):
+            for j, cell in enumerate(row):
+                cell.freezed = False
+    
+    def apply_earthquake(self):
+        for row in self.cells:
+            for cell in row:
+                cell.next_state = CellState.ALIVE if cell.state == CellState.DEAD else CellState.DEAD
+                cell.time_not_changed = 0
+                cell.update_state()
+
+    def get_stats(self):
+        self.stats = [0, 0, 0, 0]
+        for row in self.cells:
+            for cell in row:
+                if cell.state == CellState.ALIVE:
+                    self.stats[0] += 1
+                    if cell.time_not_changed == 0:
+                        self.stats[2] += 1
+                else:
+                    self.stats[1] += 1
+                    if cell.time_not_changed == 0:
+                        self.stats[3] += 1
+        return self.stats
+
+    def adjust_grid(self):
+        old_num = len(self.cells)
+        new_num = int(self.width)
+
+        difference = new_num - old_num
+
+        if difference < 0: # reinzoomen
+            diff_top = difference // 2
+            diff_bottom = difference - diff_top
+
+            diff_left = diff_top
+            diff_right = diff_bottom
+
+            new_cells = [[Cell(x, y) for y in range(new_num)] for x in range(new_num)]
+
+            for row_index, row in enumerate(new_cells): #
+                for col_index, cell in enumerate(row):
+                    if (diff_top-1 < row_index) and (row_index < new_num-diff_bottom-1) and (diff_left - 1 < col_index) and (col_index < new_num - diff_right-1):
+                        # Zelle aus self.cells holen
+                        old_cell = self.cells[row_index-diff_top][col_index-diff_left]
+                        new_cells[row_index][col_index].state, new_cells[row_index][col_index].next_state, new_cells[row_index][col_index].freezed, new_cells[row_index][col_index].time_not_changed = old_cell.state, old_cell.next_state, old_cell.freezed, old_cell.time_not_changed
+
+            self.cells = []
+            self.cells.extend(new_cells)
+
+        elif difference > 0: # rauszoomen
+            diff_top = difference // 2
+            diff_bottom = difference - diff_top
+
+            diff_left = diff_top
+            diff_right = diff_bottom
+
+            new_cells = [[Cell(x, y) for y in range(new_num)] for x in range(new_num)]
+
+            for row_index, row in enumerate(self.cells): #
+                for col_index, cell in enumerate(row):
+                    if (diff_top-1 < row_index) and (row_index < new_num-diff_bottom-1) and (diff_left - 1 < col_index) and (col_index < new_num - diff_right-1):
+                        # Zelle aus self.cells holen
+                        old_cell = self.cells[row_index-diff_top][col_index-diff_left]
+                        new_cells[row_index][col_index].state, new_cells[row_index][col_index].next_state, new_cells[row_index][col_index].freezed, new_cells[row_index][col_index].time_not_changed = old_cell.state, old_cell.next_state, old_cell.freezed, old_cell.time_not_changed
+
+            self.cells = []
+            self.cells.extend(new_cells)
+
+
+def _flipped_hash(flipped: np.ndarray, next_state: np.ndarray, rule: Rule, keys: np.ndarray,
+                  x0: int = 0, y0: int = 0) -> int:
+    """Change of the Zobrist hash from the flipped cells of a step.
+
+    ``keys`` is the part of the grid's key table for the region (top-left
+    cell x0, y0). With two states every flip toggles exactly the key of
+    state 1, so the table is enough; Generations rules hash the old and new
+    state of each flipped cell.
+    """
+    if rule.states == 2:
+        return masked_hash(keys, flipped)
+    xs, ys = np.nonzero(flipped)
+    new = next_state[xs, ys]
+    return flip_hash(xs + x0, ys + y0, rule.previous[new], new)
+
+
+def resize_centered(array: np.ndarray, width: int, height: int) -> np.ndarray:
+    """Copy of ``array`` (indexed [x, y]) grown or cropped to width x height around its centre."""
+    resized = np.zeros((width, height), dtype=array.dtype)
+    old_w, old_h = array.shape
+    # Verschiebung, sodass die Mitte erhalten bleibt
+    dx, dy = (width - old_w) // 2, (height - old_h) // 2
+    x0, y0 = max(dx, 0), max(dy, 0)
+    x1, y1 = min(dx + old_w, width), min(dy + old_h, height)
+    resized[x0:x1, y0:y1] = array[x0 - dx:x1 - dx, y0 - dy:y1 - dy]
+    return resized
+
+
+# Grid-Backend auf Basis von NumPy-Arrays (gleiche Schnittstelle wie Grid)
+class NumpyGrid:
+    """Grid that stores the cell attributes as contiguous NumPy arrays.
+
+    The arrays are indexed ``[x, y]`` like ``Grid.cells`` and the step follows
+    exactly the semantics of the object engine: freezed cells keep their state
+    and don't age, ``time_not_changed`` resets whenever a cell wants to change.
+    The edge is given by ``boundary`` (see ``BOUNDARIES``) and handled with a
+    halo around the state, so edge cells cost the same as interior cells.
+    ``rule`` is any Life-like or Generations rule (see ``rules.parse_rule``);
+    with Generations rules ``state`` also holds the dying states 2, 3, ...
+
+    ``state_hash`` is a Zobrist hash of the board (see ``cycles``), updated
+    from the flipped cells of every step and from the region of every
+    mutation. ``edits`` counts mutations, so a ``CycleDetector`` knows when
+    the history of hashes no longer applies.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, boundary: str = "dead", rule: str = "B3/S23") -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.boundary = check_boundary(boundary)
+        self.state = np.zeros((width, height), dtype=np.uint8)  # 1 = ALIVE, 0 = DEAD
+        self.next_state = np.zeros((width, height), dtype=np.uint8)
+        self.time_not_changed = np.zeros((width, height), dtype=np.int64)
+        self.freezed = np.zeros((width, height), dtype=bool)
+        self.stats = [0, 0, 0, 0]  # Alive, Dead, New Alive, New Dead (laufende Zähler)
+        self.generation = 0
+        self.history = StatsHistory()  # Population, Geburten und Tode pro Generation
+        self._keys = key_table(width, height)  # Zobrist-Schlüssel für Zustand 1
+        self.state_hash = 0
+        self.edits = 0  # Anzahl der Änderungen von außen (Muster, Zauber, Regelwechsel, ...)
+        self.rule = parse_rule(rule)
+        self._recount_stats()
+
+    def set_rule(self, rule):
+        """Switch the rule (B/S notation, a name from rules.RULES or a Rule)."""
+        self.rule = parse_rule(rule)
+        # Zustände, die es in der neuen Regel nicht gibt, sind tot (sie zählen schon jetzt nicht als lebendig)
+        self.state[self.state >= self.rule.states] = 0
+        self.state_hash = region_hash(self.state)
+        self.edits += 1
+
+    def _region_stats(self, xs: slice = slice(None), ys: slice = slice(None)) -> List[int]:
+        """Counts alive, dead, new alive and new dead cells inside a region."""
+        alive = self.state[xs, ys] == 1
+        new = self.time_not_changed[xs, ys] == 0
+        total_alive = int(np.count_nonzero(alive))
+        new_alive = int(np.count_nonzero(alive & new))
+        return [total_alive, alive.size - total_alive, new_alive, int(np.count_nonzero(new)) - new_alive]
+
+    def _region_hash(self, xs: slice, ys: slice) -> int:
+        return region_hash(self.state[xs, ys], xs.start or 0, ys.start or 0)
+
+    def _region_snapshot(self, xs: slice, ys: slice) -> Tuple[List[int], int]:
+        """Counts and hash of a region, taken before a mutation."""
+        return self._region_stats(xs, ys), self._region_hash(xs, ys)
+
+    def _recount_stats(self):
+        """Full rescan, only used after mutations that touch the whole grid anyway."""
+        self.stats = self._region_stats()
+        self.state_hash = region_hash(self.state)
+        self.edits += 1
+
+    def _replace_region(self, before: Tuple[List[int], int], xs: slice, ys: slice):
+        """Swaps counts and hash of a mutated region (``before`` from ``_region_snapshot``)."""
+        stats, state_hash = before
+        after = self._region_stats(xs, ys)
+        self.stats = [total - old + new for total, old, new in zip(self.stats, stats, after)]
+        self.state_hash ^= state_hash ^ self._region_hash(xs, ys)
+        self.edits += 1
+
+    def apply_rle_pattern(self, rle: str):
+        """Wendet ein RLE-Pattern auf das Grid an (mit der Regel aus dem Header, falls vorhanden)."""
+        header, pattern = rle_codec.decode(rle)
+        rule = header_rule(header)
+        if rule is not None:
+            self.set_rule(rule)
+        pattern_width, pattern_height = pattern.shape[1], pattern.shape[0]
+
+        # wie in Grid: erster Index des Musters ist x
+        offset_x = (self.width - pattern_width) // 2
+        offset_y = (self.height - pattern_height) // 2
+        self.stamp(pattern, offset_x, offset_y)
+
+    def stamp(self, bitmap: np.ndarray, x0: int, y0: int):
+        """Write a pattern bitmap (indexed [x, y], cell states) with its first cell at (x0, y0), clipped to the grid."""
+        pattern = np.where(bitmap < self.rule.states, bitmap, 1).astype(np.uint8)  # unbekannte Zustände gelten als lebendig
+        region = clip(x0, y0, pattern, *self.state.shape)  # Ausschnitt des Musters, der im Grid liegt
+        if region is None:
+            return
+        xs, ys, part = region
+        before = self._region_snapshot(xs, ys)
+        self.state[xs, ys] = part
+        self.time_not_changed[xs, ys] = 0
+        self._replace_region(before, xs, ys)
+
+    def initialize_random(self):
+        """Randomly initialize the grid with alive and dead cells."""
+        self.state[...] = np.random.random(self.state.shape) > 0.7
+        self.time_not_changed[...] = 0
+        self._recount_stats()
+
+    def change_cell_state(self, x, y):
+        before = self._region_snapshot(slice(x, x + 1), slice(y, y + 1))
+        self.state[x, y] = self.state[x, y] != 1
+        self._replace_region(before, slice(x, x + 1), slice(y, y + 1))
+
+    def initialize_manually(self):
+        self.state[...] = 0
+        self._recount_stats()
+
+    def get_state_array(self) -> np.ndarray:
+        """Return a copy of the cell states indexed [x, y] (1 = ALIVE)."""
+        return self.state.copy()
+
+    def get_cell_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return copies of state, time_not_changed and freezed, each indexed [x, y]."""
+        return self.state.copy(), self.time_not_changed.copy(), self.freezed.copy()
+
+    def set_state_array(self, state: np.ndarray):
+        """Overwrite all cell states from an array indexed [x, y] and reset the ages."""
+        self.state[...] = state != 0
+        self.next_state[...] = self.state
+        self.time_not_changed[...] = 0
+        self._recount_stats()
+
+    def set_cell_arrays(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray):
+        """Overwrite state, time_not_changed and freezed from arrays indexed [x, y] (see ``get_cell_arrays``)."""
+        self.state[...] = state
+        self.next_state[...] = self.state
+        self.time_not_changed[...] = ages
+        self.freezed[...] = freezed
+        self._recount_stats()
+
+    def reset_field(self):
+        self.next_state[...] = 0
+        self.state[...] = 0
+        self.time_not_changed[...] = 0
+        self.stats = [0, self.state.size, 0, self.state.size]
+        self.state_hash = 0
+        self.edits += 1
+
+    def count_neighbors(self) -> np.ndarray:
+        """Return the number of alive neighbours of every cell (edge as given by ``boundary``)."""
+        padded = np.pad(self.rule.alive_cells(self.state), 1)
+        if self.boundary != "dead":
+            fill_halo(padded, self.boundary)
+        return count_alive_neighbors(padded)
+
+    def update(self):
+        """Apply the rule to each cell in the grid."""
+        alive_neighbors = self.count_neighbors()
+        self.next_state = self.rule.next_state(self.state, alive_neighbors)
+
+        # Count, that a cell did not change (freezed Zellen altern nicht)
+        changed = self.state != self.next_state
+        self.time_not_changed[~changed & ~self.freezed] += 1
+        self.time_not_changed[changed] = 0
+
+        np.copyto(self.state, self.next_state, where=~self.freezed)
+        self._record_step(changed)
+
+    def _record_step(self, changed: np.ndarray):
+        """Updates the running stats from the flipped cells and the new ages of this step."""
+        flipped = changed & ~self.freezed
+        births = int(np.count_nonzero(flipped & (self.next_state == 1)))
+        deaths = int(np.count_nonzero(flipped & (self.next_state == self.rule.death_state)))
+        new = self.time_not_changed == 0
+        new_alive = int(np.count_nonzero(new & (self.state == 1)))
+        self._finish_step(births, deaths, new_alive, int(np.count_nonzero(new)) - new_alive,
+                          _flipped_hash(flipped, self.next_state, self.rule, self._keys))
+
+    def _finish_step(self, births: int, deaths: int, new_alive: int, new_dead: int, hash_change: int = 0):
+        alive = self.stats[0] + births - deaths
+        self.stats = [alive, self.state.size - alive, new_alive, new_dead]
+        self.state_hash ^= hash_change
+        self.generation += 1
+        self.history.record(self.generation, alive, births, deaths)
+
+    def _brush(self, pos_x: float, pos_y: float, radius: float, brush: str):
+        """Slices and mask of a brush (see ``brushes``) clipped to the grid, or None outside."""
+        return clip(*stencil(pos_x, pos_y, radius, brush), *self.state.shape)
+
+    def apply_lightning(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush(pos_x, pos_y, radius, brush)
+        if region is None:
+            return
+        xs, ys, mask = region
+        before = self._region_snapshot(xs, ys)
+        state = self.state[xs, ys]
+        state[mask] = state[mask] != 1  # lebendig <-> tot (sterbende Zellen werden lebendig)
+        self.next_state[xs, ys][mask] = state[mask]
+        self.time_not_changed[xs, ys][mask] = 0
+        self._replace_region(before, xs, ys)
+
+    def apply_freeze(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush(pos_x, pos_y, radius, brush)
+        if region is None:
+            return
+        xs, ys, mask = region
+        self.freezed[xs, ys] |= mask
+        self.edits += 1  # eingefrorene Zellen ändern den weiteren Verlauf
+
+    def apply_unfreeze(self):
+        self.freezed[...] = False
+        self.edits += 1
+
+    def apply_earthquake(self):
+        self.state[...] = self.state != 1
+        self.next_state[...] = self.state
+        self.time_not_changed[...] = 0
+        alive, dead = self.stats[1], self.stats[0]  # alle Zellen sind umgedreht und neu
+        self.stats = [alive, dead, alive, dead]
+        self.state_hash = region_hash(self.state)
+        self.edits += 1
+
+    def get_stats(self):
+        """Stats are running counters kept by the step and every mutation, so this is O(1)."""
+        return self.stats
+
+    def get_colors(self, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        """Return the RGB colour of every cell (or of the region ``xs``/``ys``), looked up in ``palette``."""
+        return palette.apply(self.state[xs, ys], self.freezed[xs, ys], self.time_not_changed[xs, ys])
+
+    def adjust_grid(self):
+        """Passt die Arrays an width/height an (zentriert, wie beim Zoomen)."""
+        if self.state.shape == (self.width, self.height):
+            return
+        self.state = self._resize(self.state)
+        self.next_state = self._resize(self.next_state)
+        self.time_not_changed = self._resize(self.time_not_changed)
+        self.freezed = self._resize(self.freezed)
+        self._keys = key_table(self.width, self.height)
+        self._recount_stats()
+
+    def _resize(self, array: np.ndarray) -> np.ndarray:
+        return resize_centered(array, self.width, self.height)
+
+
+# Grid, das nur die aktiven Kacheln (Tiles) neu berechnet
+class TiledGrid(NumpyGrid):
+    """NumpyGrid that only recomputes tiles whose neighbourhood changed.
+
+    A tile is stepped when it or one of its 8 neighbour tiles changed in the
+    last generation (or was touched by a mutation). All other tiles are
+    skipped; their ``time_not_changed`` counters are advanced lazily in bulk
+    via ``pending_ages`` before anything reads them.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, tile_size: int = 16, boundary: str = "dead",
+                 rule: str = "B3/S23") -> None:
+        super().__init__(width, height, cell_size, boundary, rule)
+        self.tile_size = tile_size
+        self.tile_counters = {"active": 0, "skipped": 0, "total_active": 0, "total_skipped": 0}
+        self._setup_tiles()
+
+    def _setup_tiles(self):
+        """(Re)builds the padded state buffer and the per-tile bookkeeping."""
+        width, height = self.state.shape
+        self._buffer = np.zeros((width + 2, height + 2), dtype=np.uint8)  # Rand (Halo) je nach boundary
+        self._buffer[1:-1, 1:-1] = self.state
+        self.state = self._buffer[1:-1, 1:-1]
+        tiles_x = -(-width // self.tile_size)
+        tiles_y = -(-height // self.tile_size)
+        self.active_tiles = np.ones((tiles_x, tiles_y), dtype=bool)  # am Anfang alles berechnen
+        self.pending_ages = np.zeros((tiles_x, tiles_y), dtype=np.int64)
+        self.tile_new_cells = np.zeros((tiles_x, tiles_y, 2), dtype=np.int64)  # New Alive / New Dead pro Tile
+
+    def _tile_slices(self, tx: int, ty: int) -> Tuple[slice, slice]:
+        size = self.tile_size
+        return slice(tx * size, (tx + 1) * size), slice(ty * size, (ty + 1) * size)
+
+    def _sync_ages(self, xs: slice = slice(None), ys: slice = slice(None)):
+        """Adds the skipped generations of idle tiles (overlapping ``xs``/``ys``) to time_not_changed."""
+        size = self.tile_size
+        width, height = self.state.shape
+        x0, x1, _ = xs.indices(width)
+        y0, y1, _ = ys.indices(height)
+        tiles = (slice(x0 // size, -(-x1 // size)), slice(y0 // size, -(-y1 // size)))
+        if not self.pending_ages[tiles].any():
+            return
+        cells = (slice(tiles[0].start * size, tiles[0].stop * size), slice(tiles[1].start * size, tiles[1].stop * size))
+        ages = self.time_not_changed[cells]
+        pending = np.repeat(np.repeat(self.pending_ages[tiles], size, axis=0), size, axis=1)[:ages.shape[0], :ages.shape[1]]
+        ages += np.where(self.freezed[cells], 0, pending)
+        self.pending_ages[tiles] = 0
+
+    def _mark_dirty(self, x0: int = 0, x1: int = None, y0: int = 0, y1: int = None):
+        """Marks the tiles of the cell range [x0, x1) x [y0, y1) and their neighbours as active."""
+        width, height = self.state.shape
+        x1 = width if x1 is None else x1
+        y1 = height if y1 is None else y1
+        size = self.tile_size
+        tx0, ty0 = max(int(x0) // size - 1, 0), max(int(y0) // size - 1, 0)
+        tx1, ty1 = (int(x1) - 1) // size + 2, (int(y1) - 1) // size + 2
+        self.active_tiles[tx0:tx1, ty0:ty1] = True
+        self._wrap_active_tiles()
+
+    def _wrap_active_tiles(self):
+        """With wrapping edges, activity on one edge also activates the opposite edge."""
+        if self.boundary not in ("torus", "klein"):
+            return
+        active = self.active_tiles
+        if active[0].any() or active[-1].any():
+            active[0] = active[-1] = True
+        if active[:, 0].any() or active[:, -1].any():
+            active[:, 0] = active[:, -1] = True
+
+    def update(self):
+        """Apply the rule, but only inside the active tiles."""
+        active = np.argwhere(self.active_tiles)
+        buffer = self._buffer
+        rule = self.rule
+        if self.boundary != "dead":
+            fill_halo(buffer, self.boundary)  # nur der Rand, O(Breite + Höhe)
+
+        # 1. Phase: nächste Zustände aller aktiven Tiles aus dem alten Zustand berechnen
+        results = []
+        for tx, ty in active:
+            xs, ys = self._tile_slices(tx, ty)
+            window = buffer[xs.start:xs.stop + 2, ys.start:ys.stop + 2]
+            alive_neighbors = count_alive_neighbors(rule.alive_cells(window))
+            next_state = rule.next_state(window[1:-1, 1:-1], alive_neighbors)
+            results.append((xs, ys, next_state))
+
+        # 2. Phase: Ergebnisse übernehmen und geänderte Tiles merken
+        changed_tiles = np.zeros_like(self.active_tiles)
+        births, deaths, hash_change = 0, 0, 0
+        for (tx, ty), (xs, ys, next_state) in zip(active, results):
+            state = self.state[xs, ys]
+            freezed = self.freezed[xs, ys]
+            ages = self.time_not_changed[xs, ys]
+            if self.pending_ages[tx, ty]:
+                ages[~freezed] += self.pending_ages[tx, ty]
+                self.pending_ages[tx, ty] = 0
+
+            changed = state != next_state
+            ages[~changed & ~freezed] += 1
+            ages[changed] = 0
+            self.next_state[xs, ys] = next_state
+            flipped = changed & ~freezed
+            if flipped.any():
+                state[flipped] = next_state[flipped]
+                changed_tiles[tx, ty] = True
+                births += int(np.count_nonzero(flipped & (next_state == 1)))
+                deaths += int(np.count_nonzero(flipped & (next_state == rule.death_state)))
+                hash_change ^= _flipped_hash(flipped, next_state, rule, self._keys[xs, ys], xs.start, ys.start)
+            # inaktive Tiles behalten ihre Werte (dort ändert sich time_not_changed == 0 nicht)
+            new = ages == 0
+            new_alive = int(np.count_nonzero(new & (state == 1)))
+            self.tile_new_cells[tx, ty] = (new_alive, int(np.count_nonzero(new)) - new_alive)
+
+        # Inaktive Tiles altern nur (lazy), ohne Neuberechnung
+        self.pending_ages[~self.active_tiles] += 1
+
+        n_active = len(active)
+        n_skipped = self.active_tiles.size - n_active
+        self.tile_counters["active"] = n_active
+        self.tile_counters["skipped"] = n_skipped
+        self.tile_counters["total_active"] += n_active
+        self.tile_counters["total_skipped"] += n_skipped
+        new_alive, new_dead = self.tile_new_cells.sum(axis=(0, 1)).tolist()
+        self._finish_step(births, deaths, new_alive, new_dead, hash_change)
+
+        # Tiles, die sich geändert haben, plus ihre Nachbarn sind in der nächsten Generation aktiv
+        padded = np.pad(changed_tiles, 1)
+        self.active_tiles = (padded[:-2, :-2] | padded[:-2, 1:-1] | padded[:-2, 2:]
+                             | padded[1:-1, :-2] | padded[1:-1, 1:-1] | padded[1:-1, 2:]
+                             | padded[2:, :-2] | padded[2:, 1:-1] | padded[2:, 2:])
+        self._wrap_active_tiles()
+
+    def set_rule(self, rule):
+        super().set_rule(rule)
+        self._mark_dirty()  # mit der neuen Regel kann sich überall etwas ändern
+
+    def stamp(self, bitmap: np.ndarray, x0: int, y0: int):
+        region = clip(x0, y0, bitmap, *self.state.shape)
+        if region is not None:
+            xs, ys, _ = region
+            self._sync_ages(xs, ys)
+            super().stamp(bitmap, x0, y0)
+            self._mark_dirty(xs.start, xs.stop, ys.start, ys.stop)
+
+    def initialize_random(self):
+        self._sync_ages()
+        super().initialize_random()
+        self._mark_dirty()
+
+    def change_cell_state(self, x, y):
+        super().change_cell_state(x, y)
+        self._mark_dirty(x, x + 1, y, y + 1)
+
+    def initialize_manually(self):
+        super().initialize_manually()
+        self._mark_dirty()
+
+    def set_state_array(self, state: np.ndarray):
+        super().set_state_array(state)
+        self.pending_ages[...] = 0
+        self._mark_dirty()
+
+    def set_cell_arrays(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray):
+        super().set_cell_arrays(state, ages, freezed)
+        self.pending_ages[...] = 0
+        self._mark_dirty()
+
+    def reset_field(self):
+        super().reset_field()
+        self.pending_ages[...] = 0
+        self._mark_dirty()
+
+    def _brush_region(self, pos_x: float, pos_y: float, radius: float, brush: str):
+        """Syncs the ages under a brush; returns its clipped slices (or None outside the grid)."""
+        region = self._brush(pos_x, pos_y, radius, brush)
+        if region is not None:
+            self._sync_ages(region[0], region[1])  # nur die Kacheln unter dem Pinsel
+        return region
+
+    def apply_lightning(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush_region(pos_x, pos_y, radius, brush)
+        if region is not None:
+            super().apply_lightning(pos_x, pos_y, radius, brush)
+            self._mark_dirty(region[0].start, region[0].stop, region[1].start, region[1].stop)
+
+    def apply_freeze(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush_region(pos_x, pos_y, radius, brush)
+        if region is not None:
+            super().apply_freeze(pos_x, pos_y, radius, brush)
+            self._mark_dirty(region[0].start, region[0].stop, region[1].start, region[1].stop)
+
+    def apply_unfreeze(self):
+        self._sync_ages()
+        super().apply_unfreeze()
+        self._mark_dirty()
+
+    def apply_earthquake(self):
+        self._sync_ages()
+        super().apply_earthquake()
+        self._mark_dirty()
+
+    def get_cell_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        self._sync_ages()
+        return super().get_cell_arrays()
+
+    def get_colors(self, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        self._sync_ages(xs, ys)  # nur die sichtbaren Kacheln nachziehen
+        return super().get_colors(palette, xs, ys)
+
+    def adjust_grid(self):
+        if self.state.shape == (self.width, self.height):
+            return
+        self._sync_ages()
+        super().adjust_grid()
+        self._setup_tiles()
+
+
+# Shared-Memory-Puffer, an die sich jeder Worker-Prozess einmal anhängt
+_worker_arrays = {}
+
+
+def _attach_worker(names: dict, shape: Tuple[int, int]):
+    """Pool initializer: map the shared grid buffers into this worker."""
+    for name, (shm_name, dtype) in names.items():
+        shm = shared_memory.SharedMemory(name=shm_name)
+        _worker_arrays[name] = (shm, np.ndarray(shape, dtype=dtype, buffer=shm.buf))
+
+
+def _step_strip(task: Tuple[int, int, int, str, Rule]) -> Tuple[int, int, int, int, int]:
+    """Step the strip of rows [x0, x1) from state buffer ``source`` into the other one.
+
+    Returns births, deaths, new alive and new dead cells of the strip and the
+    change of the board hash from its flipped cells.
+    """
+    x0, x1, source, boundary, rule = task
+    current = _worker_arrays[f"state{source}"][1]
+    target = _worker_arrays[f"state{1 - source}"][1]
+    next_state = _worker_arrays["next_state"][1]
+    ages = _worker_arrays["time_not_changed"][1]
+    freezed = _worker_arrays["freezed"][1]
+    keys = _worker_arrays["keys"][1]
+
+    # Halo: je eine Zeile über und unter dem Streifen direkt aus dem geteilten Puffer lesen
+    width = current.shape[0]
+    window = np.zeros((x1 - x0 + 2, current.shape[1] + 2), dtype=np.uint8)
+    window[1 if x0 == 0 else 0:x1 - x0 + 1 if x1 == width else x1 - x0 + 2, 1:-1] = current[max(x0 - 1, 0):min(x1 + 1, width)]
+    if boundary != "dead":
+        # Randzeilen und -spalten wie fill_halo, aber nur für die Zeilen dieses Streifens
+        rows = np.arange(x0 - 1, x1 + 1)
+        rows = np.clip(rows, 0, width - 1) if boundary == "mirror" else rows % width
+        window[[0, -1], 1:-1] = current[rows[[0, -1]]]
+        if boundary == "mirror":
+            window[:, [0, -1]] = current[np.ix_(rows, [0, -1])]
+        elif boundary == "torus":
+            window[:, [0, -1]] = current[np.ix_(rows, [-1, 0])]
+        else:
+            window[:, [0, -1]] = current[np.ix_(width - 1 - rows, [-1, 0])]
+    alive_neighbors = count_alive_neighbors(rule.alive_cells(window))
+    state = current[x0:x1]
+    strip_next = rule.next_state(state, alive_neighbors)
+    next_state[x0:x1] = strip_next
+
+    changed = state != strip_next
+    strip_freezed = freezed[x0:x1]
+    strip_ages = ages[x0:x1]
+    strip_ages[~changed & ~strip_freezed] += 1
+    strip_ages[changed] = 0
+    target[x0:x1] = np.where(strip_freezed, state, strip_next)
+
+    flipped = changed & ~strip_freezed
+    births = int(np.count_nonzero(flipped & (strip_next == 1)))
+    deaths = int(np.count_nonzero(flipped & (strip_next == rule.death_state)))
+    new = strip_ages == 0
+    new_alive = int(np.count_nonzero(new & (target[x0:x1] == 1)))
+    return (births, deaths, new_alive, int(np.count_nonzero(new)) - new_alive,
+            _flipped_hash(flipped, strip_next, rule, keys[x0:x1], x0))
+
+
+def _release_shared(pool, blocks: list):
+    pool.terminate()
+    pool.join()
+    for shm in blocks:
+        shm.unlink()
+        try:
+            shm.close()
+        except BufferError:
+            pass  # es gibt noch Views auf den Puffer, das mmap wird mit ihnen freigegeben
+
+
+# Grid, das jede Generation in horizontalen Streifen auf mehrere Prozesse verteilt
+class ParallelGrid(NumpyGrid):
+    """NumpyGrid stepped by a process pool over shared-memory strips.
+
+    The board is split into ``workers`` strips along x. All arrays live in
+    ``multiprocessing.shared_memory`` blocks, so workers read their halo rows
+    straight from the shared state instead of receiving pickled data. The
+    state is double-buffered: a generation reads one buffer and writes the
+    other, which makes the result identical to the serial step.
+    Call ``close()`` (or drop the grid) to stop the pool and free the memory.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, workers: int = None, boundary: str = "dead",
+                 rule: str = "B3/S23") -> None:
+        super().__init__(width, height, cell_size, boundary, rule)
+        self.workers = workers or os.cpu_count() or 1
+        self._pool = None
+        self._setup_shared()
+
+    def _setup_shared(self):
+        """Moves the grid arrays into shared memory and starts the pool."""
+        arrays = {
+            "state0": self.state,
+            "state1": self.state,
+            "next_state": self.next_state,
+            "time_not_changed": self.time_not_changed,
+            "freezed": self.freezed,
+            "keys": self._keys,
+        }
+        self._blocks = []
+        names = {}
+        shared = {}
+        for name, array in arrays.items():
+            shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+            shared[name] = np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)
+            shared[name][...] = array
+            self._blocks.append(shm)
+            names[name] = (shm.name, array.dtype)
+        self._buffers = (shared["state0"], shared["state1"])
+        self._source = 0
+        self.state = self._buffers[0]
+        self.next_state = shared["next_state"]
+        self.time_not_changed = shared["time_not_changed"]
+        self.freezed = shared["freezed"]
+        self._keys = shared["keys"]
+
+        self._pool = multiprocessing.Pool(self.workers, initializer=_attach_worker, initargs=(names, self.state.shape))
+        self._finalizer = weakref.finalize(self, _release_shared, self._pool, self._blocks)
+
+        # Streifengrenzen (gleich große Streifen entlang x)
+        bounds = np.linspace(0, self.state.shape[0], self.workers + 1).astype(int)
+        self._strips = [(x0, x1) for x0, x1 in zip(bounds[:-1], bounds[1:]) if x1 > x0]
+
+    def close(self):
+        """Stop the worker pool and free the shared memory."""
+        if self._pool is not None:
+            # lokale Kopien behalten, damit das Grid nach close() weiter benutzbar ist
+            self.state = self.state.copy()
+            self.next_state = self.next_state.copy()
+            self.time_not_changed = self.time_not_changed.copy()
+            self.freezed = self.freezed.copy()
+            self._keys = self._keys.copy()
+            self._buffers = None
+            self._finalizer()
+            self._pool = None
+
+    def update(self):
+        """Apply Game of Life rules, one strip per worker."""
+        if self._pool is None:  # nach close() seriell weiterrechnen
+            super().update()
+            return
+        counts = self._pool.map(_step_strip, [(x0, x1, self._source, self.boundary, self.rule)
+                                                   for x0, x1 in self._strips])
+        self._source = 1 - self._source
+        self.state = self._buffers[self._source]
+        births, deaths, new_alive, new_dead = np.sum([strip[:4] for strip in counts], axis=0).tolist()
+        hash_change = 0
+        for strip in counts:
+            hash_change ^= strip[4]
+        self._finish_step(births, deaths, new_alive, new_dead, hash_change)
+
+    def adjust_grid(self):
+        if self.state.shape == (self.width, self.height):
+            return
+        super().adjust_grid()  # neue (lokale) Arrays, danach wieder in Shared Memory verschieben
+        self.close()
+        self._setup_shared()
+
+
+# Ein Block der unendlichen Ebene (nur für Bereiche mit Leben oder jungen Zellen)
+class Chunk:
+    __slots__ = ("state", "ages", "freezed")
+
+    def __init__(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray = None) -> None:
+        self.state = state
+        self.ages = ages
+        self.freezed = freezed  # None, solange keine Zelle im Chunk eingefroren ist
+
+
+# Unbegrenzte Ebene aus Chunks, die nur dort existieren, wo etwas los ist
+class ChunkGrid:
+    """Sparse grid on an unbounded plane, stored as a dict of chunk bitmaps.
+
+    The plane is split into ``chunk_size`` x ``chunk_size`` chunks keyed by
+    chunk coordinates. A chunk is created on demand when a cell in it comes
+    alive and freed again once it has no live or freezed cells and all its
+    cells are at least ``idle_age`` generations old. Cells outside any chunk
+    are dead with age ``idle_age`` (old enough for every palette), so colours
+    match the dense backends. ``freezed`` is only allocated for chunks that
+    contain freezed cells.
+
+    ``width``/``height`` describe the window that is drawn and that
+    ``get_state_array``, ``initialize_random``, ``apply_earthquake`` and the
+    pattern placement use; patterns keep running past it. ``stats`` cover
+    the window, ``population``, ``history`` and ``state_hash`` the whole
+    plane. Rules with B0 are rejected, since they would fill the whole plane.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, chunk_size: int = 16,
+                 idle_age: int = MAX_AGE, rule: str = "B3/S23") -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.chunk_size = chunk_size
+        self.idle_age = max(idle_age, 1)  # Alter 0 hieße "neu", das gilt nie für Zellen ohne Chunk
+        self.chunks = {}  # (cx, cy) -> Chunk
+        self.population = 0
+        self.stats = [0, width * height, 0, 0]  # Alive, Dead, New Alive, New Dead (im Fenster)
+        self.generation = 0
+        self.history = StatsHistory()
+        self.state_hash = 0
+        self.edits = 0
+        self.set_rule(rule)
+
+    def set_rule(self, rule):
+        """Switch the rule (B/S notation, a name from rules.RULES or a Rule)."""
+        rule = parse_rule(rule)
+        if 0 in rule.birth:
+            raise ValueError("rules with B0 would fill the unbounded plane")
+        self.rule = rule
+        self.state_hash = 0
+        for (cx, cy), chunk in self.chunks.items():
+            chunk.state[chunk.state >= rule.states] = 0
+            self.state_hash ^= region_hash(chunk.state, cx * self.chunk_size, cy * self.chunk_size)
+        self.edits += 1
+
+    @property
+    def chunk_count(self) -> int:
+        return len(self.chunks)
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the chunk arrays."""
+        return sum(chunk.state.nbytes + chunk.ages.nbytes + (chunk.freezed.nbytes if chunk.freezed is not None else 0)
+                   for chunk in self.chunks.values())
+
+    def _new_chunk(self) -> Chunk:
+        size = self.chunk_size
+        return Chunk(np.zeros((size, size), dtype=np.uint8), np.full((size, size), self.idle_age, dtype=np.int64))
+
+    def _is_idle(self, chunk: Chunk) -> bool:
+        return (not chunk.state.any() and (chunk.freezed is None or not chunk.freezed.any())
+                and chunk.ages.min() >= self.idle_age)
+
+    def _keys(self, x0: int, x1: int, y0: int, y1: int):
+        """Chunk keys overlapping the cell range [x0, x1) x [y0, y1)."""
+        size = self.chunk_size
+        for cx in range(x0 // size, (x1 - 1) // size + 1):
+            for cy in range(y0 // size, (y1 - 1) // size + 1):
+                yield cx, cy
+
+    def _overlap(self, key: Tuple[int, int], x0: int, x1: int, y0: int, y1: int) -> Tuple[tuple, tuple]:
+        """Index of the overlap of a chunk and a region, in region and in chunk coordinates."""
+        size = self.chunk_size
+        left, top = key[0] * size, key[1] * size
+        ox0, ox1 = max(x0, left), min(x1, left + size)
+        oy0, oy1 = max(y0, top), min(y1, top + size)
+        return ((slice(ox0 - x0, ox1 - x0), slice(oy0 - y0, oy1 - y0)),
+                (slice(ox0 - left, ox1 - left), slice(oy0 - top, oy1 - top)))
+
+    def _read(self, x0: int, x1: int, y0: int, y1: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Copy state, ages and freeze flags of the region [x0, x1) x [y0, y1) into dense arrays."""
+        state = np.zeros((x1 - x0, y1 - y0), dtype=np.uint8)
+        ages = np.full((x1 - x0, y1 - y0), self.idle_age, dtype=np.int64)
+        freezed = np.zeros((x1 - x0, y1 - y0), dtype=bool)
+        for key in self._keys(x0, x1, y0, y1):
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                continue
+            region, local = self._overlap(key, x0, x1, y0, y1)
+            state[region] = chunk.state[local]
+            ages[region] = chunk.ages[local]
+            if chunk.freezed is not None:
+                freezed[region] = chunk.freezed[local]
+        return state, ages, freezed
+
+    def _window_stats(self, x0: int, y0: int, state: np.ndarray, ages: np.ndarray) -> List[int]:
+        """Counts of the part of a region (top-left cell x0, y0) that lies in the window."""
+        xs = slice(min(max(-x0, 0), state.shape[0]), max(min(self.width - x0, state.shape[0]), 0))
+        ys = slice(min(max(-y0, 0), state.shape[1]), max(min(self.height - y0, state.shape[1]), 0))
+        alive = state[xs, ys] == 1
+        new = ages[xs, ys] == 0
+        total_alive = int(np.count_nonzero(alive))
+        new_alive = int(np.count_nonzero(alive & new))
+        return [total_alive, alive.size - total_alive, new_alive, int(np.count_nonzero(new)) - new_alive]
+
+    def _write(self, x0: int, y0: int, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray, before: tuple):
+        """Write a region read with ``_read`` back into the chunks.
+
+        ``before`` holds the window stats, population and hash of the region
+        before the mutation; the running counters are updated from the difference.
+        """
+        stats, population, state_hash = before
+        after = self._window_stats(x0, y0, state, ages)
+        self.stats = [total - old + new for total, old, new in zip(self.stats, stats, after)]
+        self.population += int(np.count_nonzero(state)) - population
+        self.state_hash ^= state_hash ^ region_hash(state, x0, y0)
+        self.edits += 1
+
+        x1, y1 = x0 + state.shape[0], y0 + state.shape[1]
+        for key in self._keys(x0, x1, y0, y1):
+            region, local = self._overlap(key, x0, x1, y0, y1)
+            chunk = self.chunks.get(key)
+            if chunk is None:
+                if not (state[region].any() or freezed[region].any() or (ages[region] < self.idle_age).any()):
+                    continue
+                chunk = self.chunks[key] = self._new_chunk()
+            chunk.state[local] = state[region]
+            chunk.ages[local] = ages[region]
+            if freezed[region].any() and chunk.freezed is None:
+                chunk.freezed = np.zeros_like(chunk.state, dtype=bool)
+            if chunk.freezed is not None:
+                chunk.freezed[local] = freezed[region]
+            if self._is_idle(chunk):
+                del self.chunks[key]
+
+    def _edit(self, x0: int, x1: int, y0: int, y1: int):
+        """Read a region for a mutation; returns the arrays and the ``before`` counts for ``_write``."""
+        state, ages, freezed = self._read(x0, x1, y0, y1)
+        return state, ages, freezed, (self._window_stats(x0, y0, state, ages), int(np.count_nonzero(state)),
+                                      region_hash(state, x0, y0))
+
+    def _clear(self):
+        self.chunks = {}
+        self.population = 0
+        self.stats = [0, self.width * self.height, 0, 0]
+        self.state_hash = 0
+        self.edits += 1
+
+    def apply_rle_pattern(self, rle: str):
+        """Wendet ein RLE-Pattern auf das Grid an (in der Mitte des Fensters, ohne Abschneiden)."""
+        header, pattern = rle_codec.decode(rle)
+        rule = header_rule(header)
+        if rule is not None:
+            self.set_rule(rule)
+        # wie in Grid: erster Index des Musters ist x
+        self.stamp(pattern, (self.width - pattern.shape[1]) // 2, (self.height - pattern.shape[0]) // 2)
+
+    def stamp(self, bitmap: np.ndarray, x0: int, y0: int):
+        """Write a pattern bitmap (indexed [x, y], cell states) with its first cell at (x0, y0), anywhere on the plane."""
+        x1, y1 = x0 + bitmap.shape[0], y0 + bitmap.shape[1]
+        if x0 >= x1 or y0 >= y1:
+            return
+        state, ages, freezed, before = self._edit(x0, x1, y0, y1)
+        state[...] = np.where(bitmap < self.rule.states, bitmap, 1)
+        ages[...] = 0
+        self._write(x0, y0, state, ages, freezed, before)
+
+    def initialize_random(self):
+        """Randomly initialize the window with alive and dead cells (the rest of the plane is cleared)."""
+        self.set_state_array(np.random.random((self.width, self.height)) > 0.7)
+
+    def change_cell_state(self, x, y):
+        state, ages, freezed, before = self._edit(x, x + 1, y, y + 1)
+        state[...] = state != 1
+        self._write(x, y, state, ages, freezed, before)
+
+    def initialize_manually(self):
+        self._clear()
+
+    def get_state_array(self) -> np.ndarray:
+        """Return a copy of the cell states in the window, indexed [x, y] (1 = ALIVE)."""
+        return self._read(0, self.width, 0, self.height)[0]
+
+    def set_state_array(self, state: np.ndarray):
+        """Clear the plane and set the window from an array indexed [x, y]; resets the ages."""
+        self._clear()
+        cells, ages, freezed, before = self._edit(0, state.shape[0], 0, state.shape[1])
+        cells[...] = state != 0
+        ages[...] = 0
+        self._write(0, 0, cells, ages, freezed, before)
+
+    def set_cell_arrays(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray):
+        """Clear the plane and set state, ages and freeze flags of the window from arrays indexed [x, y]."""
+        self._clear()
+        cells, cell_ages, cell_freezed, before = self._edit(0, state.shape[0], 0, state.shape[1])
+        cells[...], cell_ages[...], cell_freezed[...] = state, ages, freezed
+        self._write(0, 0, cells, cell_ages, cell_freezed, before)
+
+    def reset_field(self):
+        self._clear()
+
+    def _candidates(self) -> List[Tuple[int, int]]:
+        """Existing chunks plus the neighbours of chunks with live cells on their edge."""
+        keys = set(self.chunks)
+        for (cx, cy), chunk in self.chunks.items():
+            state = chunk.state
+            if state[0].any() or state[-1].any() or state[:, 0].any() or state[:, -1].any():
+                keys.update((cx + dx, cy + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1))
+        return list(keys)
+
+    def update(self):
+        """Apply the rule to every chunk (and the empty chunks next to live edges)."""
+        size = self.chunk_size
+        keys = self._candidates()
+        count = len(keys)
+        index = {key: i for i, key in enumerate(keys)}
+
+        # alle Chunks plus ein leerer (Index count) übereinanderlegen
+        states = np.zeros((count + 1, size, size), dtype=np.uint8)
+        ages = np.full((count, size, size), self.idle_age, dtype=np.int64)
+        freezed = np.zeros((count, size, size), dtype=bool)
+        for key, i in index.items():
+            chunk = self.chunks.get(key)
+            if chunk is not None:
+                states[i] = chunk.state
+                ages[i] = chunk.ages
+                if chunk.freezed is not None:
+                    freezed[i] = chunk.freezed
+        neighbors = np.array([[[index.get((cx + dx, cy + dy), count) for dy in (-1, 0, 1)] for dx in (-1, 0, 1)]
+                              for cx, cy in keys], dtype=np.intp).reshape(count, 3, 3)
+
+        # 3x3 Chunks zu einem Block zusammensetzen, davon das Innere plus eine Zelle Rand
+        blocks = states[neighbors].transpose(0, 1, 3, 2, 4).reshape(count, 3 * size, 3 * size)
+        padded = blocks[:, size - 1:2 * size + 1, size - 1:2 * size + 1]
+        alive_neighbors = count_alive_neighbors(self.rule.alive_cells(padded))
+        state = states[:count]
+        next_state = self.rule.next_state(state, alive_neighbors)
+
+        changed = state != next_state
+        ages[~changed & ~freezed] += 1
+        ages[changed] = 0
+        state = np.where(freezed, state, next_state)
+        self._record_step(keys, changed & ~freezed, next_state, state, ages)
+
+        live = state.any(axis=(1, 2))
+        frozen = freezed.any(axis=(1, 2))
+        young = (ages < self.idle_age).any(axis=(1, 2))
+        self.chunks = {key: Chunk(state[i].copy(), ages[i].copy(), freezed[i].copy() if frozen[i] else None)
+                       for i, key in enumerate(keys) if live[i] or frozen[i] or young[i]}
+
+    def _record_step(self, keys: list, flipped: np.ndarray, next_state: np.ndarray, state: np.ndarray, ages: np.ndarray):
+        """Updates stats (window) and population/history (plane) from the stepped chunks."""
+        size = self.chunk_size
+        births = flipped & (next_state == 1)
+        deaths = flipped & (next_state == self.rule.death_state)
+        plane_births, plane_deaths = int(np.count_nonzero(births)), int(np.count_nonzero(deaths))
+
+        # Maske der Zellen im Fenster, je Chunk aus Zeilen- und Spaltenbereich
+        corners = np.array(keys, dtype=np.int64).reshape(-1, 2) * size
+        cells = np.arange(size)
+        in_x = (corners[:, :1] + cells >= 0) & (corners[:, :1] + cells < self.width)
+        in_y = (corners[:, 1:] + cells >= 0) & (corners[:, 1:] + cells < self.height)
+        window = in_x[:, :, None] & in_y[:, None, :]
+
+        new = (ages == 0) & window
+        new_alive = int(np.count_nonzero(new & (state == 1)))
+        alive = self.stats[0] + int(np.count_nonzero(births & window)) - int(np.count_nonzero(deaths & window))
+        self.stats = [alive, self.width * self.height - alive, new_alive, int(np.count_nonzero(new)) - new_alive]
+        self.population += plane_births - plane_deaths
+        chunk_ids, xs, ys = np.nonzero(flipped)
+        new_states = next_state[chunk_ids, xs, ys]
+        self.state_hash ^= flip_hash(corners[chunk_ids, 0] + xs, corners[chunk_ids, 1] + ys,
+                                     self.rule.previous[new_states], new_states)
+        self.generation += 1
+        self.history.record(self.generation, self.population, plane_births, plane_deaths)
+
+    def apply_lightning(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        x0, y0, mask = stencil(pos_x, pos_y, radius, brush)  # die Ebene ist unbegrenzt, kein Abschneiden
+        state, ages, freezed, before = self._edit(x0, x0 + mask.shape[0], y0, y0 + mask.shape[1])
+        state[mask] = state[mask] != 1
+        ages[mask] = 0
+        self._write(x0, y0, state, ages, freezed, before)
+
+    def apply_freeze(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        x0, y0, mask = stencil(pos_x, pos_y, radius, brush)
+        state, ages, freezed, before = self._edit(x0, x0 + mask.shape[0], y0, y0 + mask.shape[1])
+        freezed |= mask
+        self._write(x0, y0, state, ages, freezed, before)
+
+    def apply_unfreeze(self):
+        for key, chunk in list(self.chunks.items()):
+            chunk.freezed = None
+            if self._is_idle(chunk):
+                del self.chunks[key]
+        self.edits += 1
+
+    def apply_earthquake(self):
+        """Flips every cell in the window."""
+        state, ages, freezed, before = self._edit(0, self.width, 0, self.height)
+        state[...] = state != 1
+        ages[...] = 0
+        self._write(0, 0, state, ages, freezed, before)
+
+    def get_cell_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return state, ages and freeze flags of the window, each indexed [x, y]."""
+        return self._read(0, self.width, 0, self.height)
+
+    def has_freezed(self) -> bool:
+        return any(chunk.freezed is not None and chunk.freezed.any() for chunk in self.chunks.values())
+
+    def get_stats(self):
+        """Stats are running counters kept by the step and every mutation, so this is O(1)."""
+        return self.stats
+
+    def get_colors(self, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        """Return the RGB colour of every cell in the window (or of the region ``xs``/``ys`` of it)."""
+        x0, x1, _ = xs.indices(self.width)
+        y0, y1, _ = ys.indices(self.height)
+        state, ages, freezed = self._read(x0, x1, y0, y1)
+        return palette.apply(state, freezed, ages)
+
+    def adjust_grid(self):
+        """Nothing to reallocate: ``width``/``height`` only move the window."""
+
+
+# Bit-gepackte Zeilen: 64 Zellen pro uint64-Wort
+WORD_BITS = 64
+_ONE = np.uint64(1)
+_TOP_BIT = np.uint64(WORD_BITS - 1)
+_AGE_LIMIT = np.iinfo(np.uint16).max  # Alter bleiben hier stehen (die Paletten enden bei MAX_AGE)
+
+
+def pack_bits(cells: np.ndarray) -> np.ndarray:
+    """Pack a 0/1 array indexed [x, y] into uint64 words: bit b of word k of row x is cell (x, 64k + b)."""
+    width, height = cells.shape
+    padded = np.zeros((width, -(-height // WORD_BITS) * WORD_BITS), dtype=np.uint8)
+    padded[:, :height] = cells != 0
+    return np.packbits(padded, axis=1, bitorder="little").view("<u8").astype(np.uint64, copy=False)
+
+
+def unpack_bits(words: np.ndarray) -> np.ndarray:
+    """0/1 array (uint8) of all 64 bits of every word, the inverse of ``pack_bits`` (including padding bits)."""
+    return np.unpackbits(np.ascontiguousarray(words, dtype="<u8").view(np.uint8), axis=1, bitorder="little")
+
+
+def popcount(words: np.ndarray) -> int:
+    """Number of set bits."""
+    return int(np.bitwise_count(words).sum(dtype=np.int64))
+
+
+def _bit_counts(neighbors: list) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Bit-sliced adder: the 8 neighbour planes -> count bits (1, 2, 4, 8) for 64 cells per word."""
+    def full_add(a, b, c):
+        partial = a ^ b
+        return partial ^ c, (a & b) | (partial & c)
+
+    n0, n1, n2, n3, n4, n5, n6, n7 = neighbors
+    sum_a, carry_a = full_add(n0, n1, n2)
+    sum_b, carry_b = full_add(n3, n4, n5)
+    sum_c, carry_c = n6 ^ n7, n6 & n7
+    ones, carry_ones = full_add(sum_a, sum_b, sum_c)  # Überträge haben Gewicht 2
+    sum_twos, fours = full_add(carry_a, carry_b, carry_c)
+    twos, carry_twos = sum_twos ^ carry_ones, sum_twos & carry_ones  # Gewicht 4
+    return ones, twos, fours ^ carry_twos, fours & carry_twos
+
+
+def _count_equals(n: int, counts: tuple, inverted: tuple) -> np.ndarray:
+    result = None
+    for i, (bit, inverse) in enumerate(zip(counts, inverted)):
+        term = bit if n >> i & 1 else inverse
+        result = term if result is None else result & term
+    return result
+
+
+# Grid mit einem Bit pro Zelle, Schritt mit Bit-Operationen auf ganzen Wörtern (SWAR)
+class BitGrid:
+    """Grid that stores one bit per cell and steps 64 cells per word operation.
+
+    Every row x is a run of uint64 words along y (see ``pack_bits``), so the
+    live cells of a 4096 x 4096 board take 2 MB. The neighbour counts come
+    from shifted copies of the planes summed with a bit-sliced adder, and
+    the rule (any two-state B/S rule) is applied as boolean algebra on the
+    count bits. The edge is given by ``boundary`` as in ``NumpyGrid``.
+
+    Besides the live plane the grid keeps a ``fresh`` plane (cells whose age
+    is 0), which is enough for the stats and the "new" colours. Freezed
+    cells live in an optional bit plane that only exists after the first
+    freeze. ``time_not_changed`` is only kept with ``track_ages`` (uint16,
+    saturating); without it a cell's age is reported as 0 if fresh and 1
+    otherwise, and the step never leaves the packed representation.
+    ``state_hash`` is a Zobrist hash over the (row, word, value) of the
+    non-empty words, updated from the changed words of each step.
+    Generations rules are rejected.
+    """
+
+    def __init__(self, width: int, height: int, cell_size: int, boundary: str = "dead", rule: str = "B3/S23",
+                 track_ages: bool = False) -> None:
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.boundary = check_boundary(boundary)
+        self.track_ages = track_ages
+        self.stats = [0, width * height, 0, width * height]  # Alive, Dead, New Alive, New Dead (laufende Zähler)
+        self.generation = 0
+        self.history = StatsHistory()
+        self.state_hash = 0
+        self.edits = 0
+        self.set_rule(rule)
+        # leeres Feld direkt in gepackter Form (alle Zellen neu), ohne ein Byte-Array zu packen
+        self._set_shape(width, height)
+        self.alive = np.zeros((width, len(self._valid)), dtype=np.uint64)
+        self.fresh = np.tile(self._valid, (width, 1))
+        self.frozen = None
+        self.time_not_changed = np.zeros((width, height), dtype=np.uint16) if track_ages else None
+
+    def _set_shape(self, width: int, height: int):
+        self._shape = (width, height)
+        self._valid = np.full(-(-height // WORD_BITS), np.iinfo(np.uint64).max, dtype=np.uint64)
+        if height % WORD_BITS:  # Füllbits des letzten Worts bleiben immer 0
+            self._valid[-1] = np.uint64((1 << height % WORD_BITS) - 1)
+        self._last = divmod(height - 1, WORD_BITS)  # Wort und Bit der letzten Zelle einer Zeile
+
+    def _allocate(self, alive: np.ndarray, fresh: np.ndarray = None, frozen: np.ndarray = None,
+                  ages: np.ndarray = None):
+        """(Re)build all planes from 0/1 arrays indexed [x, y]."""
+        self._set_shape(*alive.shape)
+        self.alive = pack_bits(alive)
+        self.fresh = pack_bits(np.ones_like(alive) if fresh is None else fresh)
+        self.frozen = pack_bits(frozen) if frozen is not None and frozen.any() else None
+        if self.track_ages:
+            self.time_not_changed = np.zeros(alive.shape, dtype=np.uint16) if ages is None else ages
+        else:
+            self.time_not_changed = None
+        self._recount()
+
+    def set_rule(self, rule):
+        """Switch the rule (B/S notation, a name from rules.RULES or a Rule); only two-state rules."""
+        rule = parse_rule(rule)
+        if rule.states > 2:
+            raise ValueError("the bitpacked backend only supports two-state rules")
+        self.rule = rule
+        self._always = sorted(rule.birth & rule.survival)
+        self._birth_only = sorted(rule.birth - rule.survival)
+        self._survival_only = sorted(rule.survival - rule.birth)
+        self.edits += 1
+
+    @property
+    def memory_bytes(self) -> int:
+        """Bytes held by the planes."""
+        planes = [self.alive, self.fresh, self.frozen, self.time_not_changed]
+        return sum(plane.nbytes for plane in planes if plane is not None)
+
+    def _words_hash(self, words: np.ndarray, x0: int = 0, k0: int = 0) -> int:
+        rows, cols = np.nonzero(words)
+        return zobrist(rows + x0, cols + k0, words[rows, cols])
+
+    def _recount(self):
+        """Full recount of stats and hash, only used after mutations that touch the whole grid anyway."""
+        alive = popcount(self.alive)
+        fresh = popcount(self.fresh)
+        new_alive = popcount(self.fresh & self.alive)
+        size = self.width * self.height
+        self.stats = [alive, size - alive, new_alive, fresh - new_alive]
+        self.state_hash = self._words_hash(self.alive)
+        self.edits += 1
+
+    def _word_span(self, ys: slice) -> Tuple[slice, int, int]:
+        """Words covering ``ys`` and the range of ``ys`` inside their unpacked bits."""
+        y0, y1, _ = ys.indices(self._shape[1])
+        k0 = y0 // WORD_BITS
+        return slice(k0, -(-y1 // WORD_BITS)), y0 - k0 * WORD_BITS, y1 - k0 * WORD_BITS
+
+    def _read_bits(self, plane: np.ndarray, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        words, y0, y1 = self._word_span(ys)
+        if plane is None:
+            return np.zeros((len(range(*xs.indices(self._shape[0]))), y1 - y0), dtype=np.uint8)
+        return unpack_bits(plane[xs, words])[:, y0:y1]
+
+    def _write_cells(self, xs: slice, ys: slice, cells: np.ndarray, mask: np.ndarray = None, reset_age: bool = True):
+        """Set the live cells of a region (only where ``mask`` is set) and update counts and hash."""
+        words, y0, y1 = self._word_span(ys)
+        x0 = xs.indices(self._shape[0])[0]
+        old_alive, old_fresh = self.alive[xs, words].copy(), self.fresh[xs, words].copy()
+        alive = unpack_bits(old_alive)
+        fresh = unpack_bits(old_fresh)
+        mask = np.ones(cells.shape, dtype=bool) if mask is None else mask
+        alive[:, y0:y1][mask] = cells[mask] != 0
+        if reset_age:
+            fresh[:, y0:y1][mask] = 1
+            if self.time_not_changed is not None:
+                self.time_not_changed[xs, ys][mask] = 0
+        self.alive[xs, words] = new_alive = pack_bits(alive)
+        self.fresh[xs, words] = new_fresh = pack_bits(fresh)
+
+        before = popcount(old_alive), popcount(old_fresh & old_alive), popcount(old_fresh)
+        after = popcount(new_alive), popcount(new_fresh & new_alive), popcount(new_fresh)
+        alive_count = self.stats[0] + after[0] - before[0]
+        new_alive_count = self.stats[2] + after[1] - before[1]
+        fresh_count = self.stats[2] + self.stats[3] + after[2] - before[2]
+        self.stats = [alive_count, self.width * self.height - alive_count, new_alive_count, fresh_count - new_alive_count]
+        rows, cols = np.nonzero(old_alive != new_alive)
+        self.state_hash ^= flip_hash(rows + x0, cols + words.start, old_alive[rows, cols], new_alive[rows, cols])
+        self.edits += 1
+
+    def apply_rle_pattern(self, rle: str):
+        """Wendet ein RLE-Pattern auf das Grid an (mit der Regel aus dem Header, falls vorhanden)."""
+        header, pattern = rle_codec.decode(rle)
+        rule = header_rule(header)
+        if rule is not None:
+            self.set_rule(rule)
+        pattern_width, pattern_height = pattern.shape[1], pattern.shape[0]
+
+        # wie in NumpyGrid: erster Index des Musters ist x
+        self.stamp(pattern, (self.width - pattern_width) // 2, (self.height - pattern_height) // 2)
+
+    def stamp(self, bitmap: np.ndarray, x0: int, y0: int):
+        """Write a pattern bitmap (indexed [x, y], non-zero = alive) with its first cell at (x0, y0), clipped to the grid."""
+        region = clip(x0, y0, bitmap, *self._shape)
+        if region is not None:
+            xs, ys, part = region
+            self._write_cells(xs, ys, (part != 0).astype(np.uint8))
+
+    def initialize_random(self):
+        """Randomly initialize the grid with alive and dead cells."""
+        self.alive = pack_bits(np.random.random(self._shape) > 0.7)
+        self.fresh[...] = self._valid
+        if self.time_not_changed is not None:
+            self.time_not_changed[...] = 0
+        self._recount()
+
+    def change_cell_state(self, x, y):
+        cell = self._read_bits(self.alive, slice(x, x + 1), slice(y, y + 1))
+        self._write_cells(slice(x, x + 1), slice(y, y + 1), 1 - cell, reset_age=False)
+
+    def initialize_manually(self):
+        self.alive[...] = 0
+        self._recount()
+
+    def get_state_array(self) -> np.ndarray:
+        """Return the cell states as an array indexed [x, y] (1 = ALIVE)."""
+        return self._read_bits(self.alive)
+
+    def get_cell_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return state, ages and freeze flags, each indexed [x, y] (ages 0/1 without ``track_ages``)."""
+        return self._region_arrays(slice(None), slice(None))
+
+    def _region_arrays(self, xs: slice, ys: slice) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        state = self._read_bits(self.alive, xs, ys)
+        if self.time_not_changed is not None:
+            ages = self.time_not_changed[xs, ys].astype(np.int64)
+        else:
+            ages = 1 - self._read_bits(self.fresh, xs, ys).astype(np.int64)
+        return state, ages, self._read_bits(self.frozen, xs, ys).view(bool)
+
+    def set_state_array(self, state: np.ndarray):
+        """Overwrite all cell states from an array indexed [x, y] and reset the ages."""
+        self.alive = pack_bits(state)
+        self.fresh[...] = self._valid
+        if self.time_not_changed is not None:
+            self.time_not_changed[...] = 0
+        self._recount()
+
+    def set_cell_arrays(self, state: np.ndarray, ages: np.ndarray, freezed: np.ndarray):
+        """Overwrite state, time_not_changed and freezed from arrays indexed [x, y] (see ``get_cell_arrays``)."""
+        if state.max(initial=0) > 1:
+            raise ValueError("the bitpacked backend only supports two-state rules")
+        ages = np.asarray(ages)
+        self._allocate(state, ages == 0, freezed, np.minimum(ages, _AGE_LIMIT).astype(np.uint16))
+
+    def get_bit_planes(self) -> dict:
+        """The planes themselves, not copies: ``alive``, ``fresh`` and, if present, ``frozen`` and ``time_not_changed``."""
+        planes = {"alive": self.alive, "fresh": self.fresh, "frozen": self.frozen, "time_not_changed": self.time_not_changed}
+        return {name: plane for name, plane in planes.items() if plane is not None}
+
+    def set_bit_planes(self, planes: dict, stats: List[int] = None, state_hash: int = None):
+        """Adopt planes from ``get_bit_planes`` of a grid with the same size, without copying.
+
+        The planes may be read-only or memory-mapped (see ``checkpoint``):
+        the grid replaces them instead of writing into them, except for
+        in-place edits, which need writable (e.g. copy-on-write) planes.
+        ``stats`` and ``state_hash`` of the saved grid skip the recount.
+        """
+        self._set_shape(self.width, self.height)
+        for name, plane in planes.items():
+            expected = self._shape if name == "time_not_changed" else (self.width, len(self._valid))
+            if plane.shape != expected:
+                raise ValueError(f"plane {name!r} has shape {plane.shape}, expected {expected}")
+        self.alive, self.fresh, self.frozen = planes["alive"], planes["fresh"], planes.get("frozen")
+        ages = planes.get("time_not_changed")
+        if not self.track_ages:
+            self.time_not_changed = None
+        elif ages is None:  # nur "neu" oder "alt" bekannt
+            self.time_not_changed = (1 - self._read_bits(self.fresh)).astype(np.uint16)
+        else:
+            self.time_not_changed = ages
+        if stats is None or state_hash is None:
+            self._recount()
+        else:
+            self.stats, self.state_hash = list(stats), state_hash
+            self.edits += 1
+
+    def reset_field(self):
+        self.alive[...] = 0
+        self.fresh[...] = self._valid
+        if self.time_not_changed is not None:
+            self.time_not_changed[...] = 0
+        self._recount()
+
+    def _shifted_planes(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Live plane with a halo row on both sides in x, and its copies shifted by one cell in y."""
+        alive = self.alive
+        padded = np.empty((alive.shape[0] + 2, alive.shape[1]), dtype=np.uint64)
+        padded[1:-1] = alive
+        if self.boundary == "dead":
+            padded[0] = padded[-1] = 0
+        elif self.boundary == "mirror":
+            padded[0], padded[-1] = alive[0], alive[-1]
+        else:  # torus und klein wickeln in x einfach um
+            padded[0], padded[-1] = alive[-1], alive[0]
+
+        # north: Bit y enthält Zelle y - 1, south: Zelle y + 1 (Überträge über Wortgrenzen)
+        north = padded << _ONE
+        north[:, 1:] |= padded[:, :-1] >> _TOP_BIT
+        south = padded >> _ONE
+        south[:, :-1] |= padded[:, 1:] << _TOP_BIT
+        if self.boundary != "dead":  # Halo in y, wie fill_halo (Ecken aus den Halo-Zeilen in x)
+            word, bit = self._last
+            first = padded[:, 0] & _ONE
+            last = (padded[:, word] >> np.uint64(bit)) & _ONE
+            if self.boundary == "torus":
+                top, bottom = last, first
+            elif self.boundary == "mirror":
+                top, bottom = first, last
+            else:  # klein: über den Rand in y landet man gespiegelt in x
+                top, bottom = last[::-1], first[::-1]
+            north[:, 0] |= top
+            south[:, word] |= bottom << np.uint64(bit)
+        return padded, north, south
+
+    def _next_alive(self) -> np.ndarray:
+        """Live plane of the next generation before freezing (64 cells per word operation)."""
+        padded, north, south = self._shifted_planes()
+        counts = _bit_counts([padded[:-2], padded[2:], north[:-2], north[1:-1], north[2:],
+                              south[:-2], south[1:-1], south[2:]])
+        inverted = tuple(~count for count in counts)
+
+        def any_count(numbers):
+            result = None
+            for n in numbers:
+                equals = _count_equals(n, counts, inverted)
+                result = equals if result is None else result | equals
+            return result
+
+        alive = self.alive
+        result = np.zeros_like(alive)
+        always, birth_only, survival_only = (any_count(self._always), any_count(self._birth_only),
+                                             any_count(self._survival_only))
+        if always is not None:
+            result |= always
+        if birth_only is not None:
+            result |= birth_only & ~alive
+        if survival_only is not None:
+            result |= survival_only & alive
+        result &= self._valid
+        return result
+
+    def update(self):
+        """Apply the rule to each cell in the grid."""
+        alive = self.alive
+        wanted = self._next_alive()
+        want = wanted ^ alive  # Zellen, die sich ändern wollen (auch eingefrorene)
+        if self.frozen is None:
+            new_alive, flipped = wanted, want
+            self.fresh = want
+        else:  # eingefrorene Zellen behalten Zustand und Alter
+            new_alive = (wanted & ~self.frozen) | (alive & self.frozen)
+            flipped = want & ~self.frozen
+            self.fresh = want | (self.fresh & self.frozen)
+        if self.time_not_changed is not None:
+            width, height = self._shape
+            changed = unpack_bits(want)[:, :height].view(bool)
+            ages = self.time_not_changed
+            aging = ~changed & (ages < _AGE_LIMIT)
+            if self.frozen is not None:
+                aging &= ~unpack_bits(self.frozen)[:, :height].view(bool)
+            ages += aging
+            ages[changed] = 0
+
+        births = popcount(flipped & new_alive)
+        deaths = popcount(flipped) - births
+        rows, cols = np.nonzero(alive != new_alive)
+        hash_change = flip_hash(rows, cols, alive[rows, cols], new_alive[rows, cols])
+        self.alive = new_alive
+
+        alive_count = self.stats[0] + births - deaths
+        new_alive_count = popcount(self.fresh & new_alive)
+        self.stats = [alive_count, self.width * self.height - alive_count, new_alive_count,
+                      popcount(self.fresh) - new_alive_count]
+        self.state_hash ^= hash_change
+        self.generation += 1
+        self.history.record(self.generation, alive_count, births, deaths)
+
+    def _brush(self, pos_x: float, pos_y: float, radius: float, brush: str):
+        """Slices and mask of a brush (see ``brushes``) clipped to the grid, or None outside."""
+        return clip(*stencil(pos_x, pos_y, radius, brush), *self._shape)
+
+    def apply_lightning(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush(pos_x, pos_y, radius, brush)
+        if region is None:
+            return
+        xs, ys, mask = region
+        self._write_cells(xs, ys, 1 - self._read_bits(self.alive, xs, ys), mask)
+
+    def apply_freeze(self, pos_x: int, pos_y: int, radius: float = 10, brush: str = "disc"):
+        region = self._brush(pos_x, pos_y, radius, brush)
+        if region is None:
+            return
+        xs, ys, mask = region
+        if self.frozen is None:
+            self.frozen = np.zeros_like(self.alive)
+        words, y0, y1 = self._word_span(ys)
+        frozen = unpack_bits(self.frozen[xs, words])
+        frozen[:, y0:y1] |= mask
+        self.frozen[xs, words] = pack_bits(frozen)
+        self.edits += 1  # eingefrorene Zellen ändern den weiteren Verlauf
+
+    def apply_unfreeze(self):
+        self.frozen = None
+        self.edits += 1
+
+    def apply_earthquake(self):
+        self.alive = ~self.alive & self._valid
+        self.fresh[...] = self._valid
+        if self.time_not_changed is not None:
+            self.time_not_changed[...] = 0
+        self._recount()
+
+    def has_freezed(self) -> bool:
+        return self.frozen is not None and bool(self.frozen.any())
+
+    def get_stats(self):
+        """Stats are running counters kept by the step and every mutation, so this is O(1)."""
+        return self.stats
+
+    def get_colors(self, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        """Return the RGB colour of every cell (or of the region ``xs``/``ys``), looked up in ``palette``."""
+        state, ages, freezed = self._region_arrays(xs, ys)
+        return palette.apply(state, freezed, ages)
+
+    def adjust_grid(self):
+        """Repacks the planes for a new width/height (zentriert, wie beim Zoomen)."""
+        if self._shape == (self.width, self.height):
+            return
+        state, _, freezed = self.get_cell_arrays()
+        stale = 1 - self._read_bits(self.fresh)  # neue Zellen am Rand haben Alter 0
+        ages = self.time_not_changed
+        state, stale, freezed = (resize_centered(array, self.width, self.height) for array in (state, stale, freezed))
+        self._allocate(state, 1 - stale, freezed, None if ages is None else resize_centered(ages, self.width, self.height))
+
+
+GRID_BACKENDS = {"object": Grid, "numpy": NumpyGrid, "tiled": TiledGrid, "parallel": ParallelGrid, "chunked": ChunkGrid,
+                 "bitpacked": BitGrid}
+
+
+def make_grid(backend: str, width: int, height: int, cell_size: int, boundary: str = "dead", rule: str = "B3/S23",
+              **options):
+    """Create a grid of one of the ``GRID_BACKENDS``; ``options`` go to its constructor (e.g. ``track_ages``)."""
+    check_boundary(boundary)
+    if backend == "chunked":  # unendliche Ebene, hat keinen Rand
+        if boundary != "dead":
+            raise ValueError("the chunked backend is unbounded and takes no boundary")
+        return ChunkGrid(width, height, cell_size, rule=rule, **options)
+    return GRID_BACKENDS[backend](width, height, cell_size, boundary=boundary, rule=rule, **options)
+
+
+def backend_name(grid) -> str:
+    """Key of the grid's class in ``GRID_BACKENDS``."""
+    return next(name for name, backend in GRID_BACKENDS.items() if type(grid) is backend)
+
+
+def checkpoint_arrays(header: dict, planes: dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """State, ages and freeze flags (indexed [x, y]) from the planes of a checkpoint of any layout."""
+    if header["layout"] == "cells":
+        return planes["state"], planes["time_not_changed"], planes["freezed"]
+    height = header["height"]
+    state = unpack_bits(planes["alive"])[:, :height]
+    if "time_not_changed" in planes:
+        ages = planes["time_not_changed"].astype(np.int64)
+    else:
+        ages = 1 - unpack_bits(planes["fresh"])[:, :height].astype(np.int64)
+    freezed = unpack_bits(planes["frozen"])[:, :height].view(bool) if "frozen" in planes else np.zeros(state.shape, dtype=bool)
+    return state, ages, freezed
+
+# Main Game of Life class to control the game flow
+class GameOfLife:
+    def __init__(self, width: int, height: int, cell_size: int, backend: str = "object", boundary: str = "dead",
+                 rule: str = "B3/S23"):
+        self.width = width
+        self.height = height
+        self.cell_size = cell_size
+        self.grid = make_grid(backend, width, height, cell_size, boundary, rule)
+        self.hashlife = None  # wird erst bei fast_forward erzeugt
+        self.cycles = CycleDetector()  # Periode und Beginn eines Zyklus (nicht beim Objekt-Grid, das hat keinen Hash)
+
+    def initialize(self):
+        """Initialize the grid with a random setup of alive and dead cells."""
+        #self.grid.initialize_random()
+        self.grid.initialize_manually()
+    
+    def initialize_automatically(self):
+        """Initialize the grid with a random setup of alive and dead cells."""
+        self.grid.initialize_random()
+
+    def observe_cycles(self) -> bool:
+        """Feed the current board hash to ``cycles``; True if a cycle was just found."""
+        if isinstance(self.grid, Grid):
+            return False
+        return self.cycles.observe(self.grid.generation, self.grid.state_hash, self.grid.edits)
+
+    def next_generation(self) -> bool:
+        """Advance the grid to the next generation.
+
+        Returns True when this step completed a cycle or emptied the board
+        (see ``cycles.period``/``cycles.cycle_start``).
+        """
+        self.observe_cycles()  # Zustand nach Änderungen als möglichen Zyklusanfang festhalten
+        self.grid.update()
+        return self.observe_cycles()
+
+    def fast_forward(self, generations: int, max_nodes: int = 2_000_000):
+        """Jump ``generations`` ahead in one call using the Hashlife engine.
+
+        Not supported in this mode: freezed cells and boundaries other than
+        "dead" (both raise ValueError), and ``time_not_changed`` (all ages are
+        reset to 0). Hashlife runs on an unbounded plane, so cells that leave
+        the board keep evolving while jumping and are cropped when the result
+        is copied back into the grid.
+        The node cache is shared between calls and kept under ``max_nodes``.
+        """
+        if isinstance(self.grid, Grid):
+            freezed = any(cell.freezed for row in self.grid.cells for cell in row)
+        elif isinstance(self.grid, (ChunkGrid, BitGrid)):
+            freezed = self.grid.has_freezed()
+        else:
+            freezed = bool(self.grid.freezed.any())
+        if freezed:
+            raise ValueError("fast_forward does not support freezed cells, apply unfreeze first")
+        if getattr(self.grid, "boundary", "dead") != "dead":
+            raise ValueError("fast_forward only supports the dead boundary (Hashlife has no wrapping edges)")
+
+        if self.hashlife is None or self.hashlife.rule != self.grid.rule:
+            self.hashlife = HashlifeEngine(max_nodes, self.grid.rule)
+        self.hashlife.max_nodes = max_nodes
+        state = self.grid.get_state_array()
+        node, offset = self.hashlife.from_array(state)
+        node = self.hashlife.advance(node, generations)
+        self.grid.set_state_array(self.hashlife.to_array(node, offset, *state.shape))
+
+    def save_checkpoint(self, path: str):
+        """Write the board to a binary checkpoint file (see ``checkpoint``).
+
+        Saves states, ``time_not_changed``, freeze flags, rule, boundary,
+        generation and the running counters. The bitpacked backend writes
+        its bit planes as they are; the other backends write byte planes of
+        ``get_cell_arrays`` (the chunked backend only its window).
+        """
+        grid = self.grid
+        grid.get_stats()  # das Objekt-Grid zählt hier neu
+        header = {"backend": backend_name(grid), "width": grid.width, "height": grid.height,
+                  "boundary": getattr(grid, "boundary", "dead"), "rule": str(grid.rule),
+                  "generation": getattr(grid, "generation", 0), "stats": list(grid.stats),
+                  "state_hash": getattr(grid, "state_hash", None)}
+        if isinstance(grid, BitGrid):
+            header.update(layout="bits", track_ages=grid.track_ages)
+            planes = grid.get_bit_planes()
+        else:
+            header["layout"] = "cells"
+            planes = dict(zip(("state", "time_not_changed", "freezed"), grid.get_cell_arrays()))
+        checkpoint.write(path, header, planes)
+
+    def load_checkpoint(self, path: str, backend: str = None, verify: bool = True):
+        """Replace the grid with one loaded from a ``save_checkpoint`` file.
+
+        ``backend`` defaults to the one that saved the file. Loading a
+        bitpacked checkpoint into the bitpacked backend adopts the
+        memory-mapped planes without copying, so with ``verify=False`` (no
+        checksums, which read the whole file) a 10k x 10k board loads in
+        milliseconds. Every other combination copies the planes into the
+        new grid. The board size comes from the file; the cycle history
+        starts over.
+        """
+        header, planes = checkpoint.read(path, verify)
+        backend = backend or header["backend"]
+        options = {"track_ages": header.get("track_ages", False)} if backend == "bitpacked" else {}
+        grid = make_grid(backend, header["width"], header["height"], self.cell_size,
+                         header["boundary"] if backend != "chunked" else "dead", header["rule"], **options)
+        if header["layout"] == "bits" and isinstance(grid, BitGrid):
+            grid.set_bit_planes(planes, header["stats"], header["state_hash"])
+        else:
+            grid.set_cell_arrays(*checkpoint_arrays(header, planes))
+        if hasattr(grid, "generation"):
+            grid.generation = header["generation"]
+        self.grid, self.width, self.height = grid, header["width"], header["height"]
+        self.hashlife = None
+        self.cycles = CycleDetector()
+
+    # Änderungen über das Spiel statt über game.grid: der Grid wird erst beim Ausführen nachgeschlagen,
+    # so treffen Befehle aus der Warteschlange auch den Grid, den load_checkpoint vorher eingesetzt hat
+    def change_cell_state(self, x: int, y: int):
+        """Toggle the cell (x, y) of the current grid."""
+        self.grid.change_cell_state(x, y)
+
+    def reset_field(self):
+        """Clear the current grid."""
+        self.grid.reset_field()
+
+    def set_rule(self, rule):
+        """Switch the current grid to ``rule`` (a Rule or a rule string)."""
+        self.grid.set_rule(rule)
+
+    def place_pattern(self, bitmap: np.ndarray, x: int, y: int, rule=None):
+        """Stamp a pattern bitmap (indexed [x, y]) centred on the cell (x, y), switching to ``rule`` first if given."""
+        if rule is not None:
+            self.grid.set_rule(rule)
+        self.grid.stamp(bitmap, x - bitmap.shape[0] // 2, y - bitmap.shape[1] // 2)
+
+    def apply_spell(self, key: int, pos_x: int = None, pos_y: int = None, radius: float = 10, brush: str = "disc"):
+        """0 = lightning, 1 = earthquake, 2 = freeze, 3 = unfreeze; ``radius``/``brush`` for 0 and 2."""
+        if key == 0:
+            self.grid.apply_lightning(pos_x, pos_y, radius, brush)
+        elif key == 1:
+            self.grid.apply_earthquake()
+        elif key == 2:
+            self.grid.apply_freeze(pos_x, pos_y, radius, brush)
+        elif key == 3:
+            self.grid.apply_unfreeze()
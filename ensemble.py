@@ -0,0 +1,304 @@
+"""Run many seeded random boards in parallel and collect statistics.
+
+Usage:
+    python ensemble.py [--runs N] [--seed S] [--width W] [--height H] [--density D]
+                       [--max-generations N] [--backend bitpacked|numpy|tiled]
+                       [--boundary dead|torus|mirror|klein] [--rule B3/S23]
+                       [--workers N] [--batch N] [--csv FILE]
+
+Board i uses the seed S + i: its cells are alive with probability D, drawn
+from ``numpy.random.default_rng(seed)``, so every run can be repeated alone
+(``--runs 1 --seed <seed>``). Each board is stepped until the rolling board
+hash repeats (it stabilised or died out) or ``--max-generations`` is
+reached. One summary row per board is written to the CSV file as soon as
+its batch is done, so the rows come in completion order (sort by seed to
+compare two runs).
+"""
+import argparse
+import csv
+import functools
+import os
+import statistics
+import time
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+import rle as rle_codec
+from engine import BOUNDARIES, GameOfLife
+from pattern_index import crop, detect_period, step_unbounded
+from rules import parse_rule
+
+BACKENDS = ["bitpacked", "numpy", "tiled"]  # Backends mit Board-Hash (für die Zyklus-Erkennung)
+CENSUS_MAX_PERIOD = 16  # unbekannte Objekte: so lange wird nach ihrer Periode gesucht
+# Häufige Objekte in der Asche von Zufallsfeldern (alle Phasen und Lagen werden erkannt)
+COMMON_OBJECTS = {
+    "block": "2o$2o!",
+    "blinker": "3o!",
+    "beehive": "b2o$o2bo$b2o!",
+    "loaf": "b2o$o2bo$bobo$2bo!",
+    "boat": "2o$obo$bo!",
+    "ship": "2o$obo$b2o!",
+    "tub": "bo$obo$bo!",
+    "pond": "b2o$o2bo$o2bo$b2o!",
+    "long_boat": "2o$obo$bobo$2bo!",
+    "barge": "bo$obo$bobo$2bo!",
+    "toad": "b3o$3o!",
+    "beacon": "2o$2o$2b2o$2b2o!",
+    "glider": "bo$2bo$3o!",
+}
+FIELDS = ["seed", "width", "height", "density", "rule", "stabilised", "lifetime", "period", "generations",
+          "final_population", "peak_population", "objects", "census", "seconds"]
+
+
+def random_board(width: int, height: int, density: float, seed: int) -> np.ndarray:
+    """Board indexed [x, y] whose cells are alive with probability ``density`` (same seed, same board)."""
+    return (np.random.default_rng(seed).random((width, height)) < density).astype(np.uint8)
+
+
+def canonical(bitmap: np.ndarray) -> Tuple[Tuple[int, int], bytes]:
+    """Key of a bitmap that is the same for all of its rotations and reflections."""
+    forms = []
+    for flipped in (bitmap, bitmap[::-1]):
+        for rotation in range(4):
+            form = np.rot90(flipped, rotation)
+            forms.append((form.shape, form.tobytes()))
+    return min(forms)
+
+
+@functools.lru_cache(maxsize=None)
+def known_objects(rule: str) -> Dict[Tuple[Tuple[int, int], bytes], str]:
+    """Canonical key of every phase of the ``COMMON_OBJECTS`` that are periodic under ``rule`` -> name."""
+    parsed = parse_rule(rule)
+    table = {}
+    for name, code in COMMON_OBJECTS.items():
+        bitmap = crop(rle_codec.decode(code)[1])[0]
+        period = detect_period(bitmap, parsed, CENSUS_MAX_PERIOD)
+        if period is None:  # unter dieser Regel kein stabiles Objekt
+            continue
+        for _ in range(period):
+            table.setdefault(canonical(bitmap), name)
+            bitmap = step_unbounded(bitmap, parsed)
+    return table
+
+
+def split_objects(state: np.ndarray) -> List[np.ndarray]:
+    """Bitmaps of the groups of non-dead cells that touch (8-neighbourhood), each cut to its bounding box.
+
+    Groups are found by spreading the largest cell index through each
+    group, one cell per pass, which is cheap for the small objects left on
+    a settled board. Objects that touch count as one.
+    """
+    occupied = state != 0
+    labels = np.where(occupied, np.arange(1, state.size + 1).reshape(state.shape), 0)
+    while True:
+        padded = np.pad(labels, 1)
+        spread = labels.copy()
+        for dx in range(3):
+            for dy in range(3):
+                np.maximum(spread, padded[dx:dx + state.shape[0], dy:dy + state.shape[1]], out=spread)
+        spread[~occupied] = 0
+        if np.array_equal(spread, labels):
+            break
+        labels = spread
+    xs, ys = np.nonzero(labels)
+    order = np.argsort(labels[xs, ys], kind="stable")
+    xs, ys = xs[order], ys[order]
+    bounds = np.flatnonzero(np.diff(labels[xs, ys])) + 1
+    objects = []
+    for group_xs, group_ys in zip(np.split(xs, bounds), np.split(ys, bounds)):
+        if not len(group_xs):
+            continue
+        x0, y0 = group_xs.min(), group_ys.min()
+        bitmap = np.zeros((group_xs.max() - x0 + 1, group_ys.max() - y0 + 1), dtype=np.uint8)
+        bitmap[group_xs - x0, group_ys - y0] = state[group_xs, group_ys]
+        objects.append(bitmap)
+    return objects
+
+
+def census(state: np.ndarray, rule: str = "B3/S23") -> Counter:
+    """Count the objects on a board by name.
+
+    Known objects (``COMMON_OBJECTS``) get their name in any phase and
+    orientation. Other objects are named by period and population, e.g.
+    ``p1_9`` for an unlisted still life with 9 cells, and ``other`` if
+    they do not repeat within ``CENSUS_MAX_PERIOD`` generations.
+    """
+    known = known_objects(rule)
+    counts = Counter()
+    for bitmap in split_objects(state):
+        name = known.get(canonical(bitmap))
+        if name is None:
+            period = detect_period(bitmap, parse_rule(rule), CENSUS_MAX_PERIOD)
+            name = f"p{period}_{int(np.count_nonzero(bitmap == 1))}" if period else "other"
+        counts[name] += 1
+    return counts
+
+
+def run_soup(seed: int, width: int = 128, height: int = 128, density: float = 0.3,
+             max_generations: int = 5000, backend: str = "bitpacked", boundary: str = "dead",
+             rule: str = "B3/S23") -> dict:
+    """Step one random board until it stabilises (or for ``max_generations``) and summarise it.
+
+    ``lifetime`` is the generation in which the final cycle starts (for
+    example the last generation with changes on a board that became still)
+    and ``period`` its length; both are None if the board did not settle
+    within ``max_generations``. ``census`` counts the objects left on the
+    final board.
+    """
+    start = time.perf_counter()
+    game = GameOfLife(width, height, 1, backend=backend, boundary=boundary, rule=rule)
+    game.grid.set_state_array(random_board(width, height, density, seed))
+    peak = game.grid.get_stats()[0]
+    stabilised = False
+    for _ in range(max_generations):
+        stabilised = game.next_generation()
+        peak = max(peak, game.grid.get_stats()[0])
+        if stabilised:
+            break
+    rule = str(game.grid.rule)
+    objects = census(game.grid.get_state_array(), rule)
+    return {
+        "seed": seed,
+        "width": width,
+        "height": height,
+        "density": density,
+        "rule": rule,
+        "stabilised": stabilised,
+        "lifetime": game.cycles.cycle_start if stabilised else None,
+        "period": game.cycles.period if stabilised else None,
+        "generations": game.grid.generation,
+        "final_population": game.grid.get_stats()[0],
+        "peak_population": peak,
+        "objects": sum(objects.values()),
+        "census": " ".join(f"{name}:{count}" for name, count in objects.most_common()),
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def run_batch(seeds: List[int], options: dict) -> List[dict]:
+    """``run_soup`` for several seeds in one task (fewer round trips to the pool)."""
+    return [run_soup(seed, **options) for seed in seeds]
+
+
+def run_ensemble(seeds: Iterable[int], csv_path: str = None, workers: int = None, batch: int = 8,
+                 progress=None, **options) -> dict:
+    """Run ``run_soup`` for every seed on a process pool and return aggregated statistics.
+
+    ``options`` are passed on to ``run_soup``. At most two batches per
+    worker are queued at a time, so thousands of seeds do not pile up as
+    pending tasks. Rows are appended to ``csv_path`` (with a header line)
+    and flushed as their batch completes; ``progress(done, elapsed)`` is
+    called after every batch. ``workers=1`` runs in this process.
+    """
+    seeds = list(seeds)
+    batches = [seeds[i:i + batch] for i in range(0, len(seeds), batch)]
+    workers = workers or os.cpu_count() or 1
+    file = open(csv_path, "w", newline="") if csv_path else None
+    writer = csv.DictWriter(file, fieldnames=FIELDS) if file else None
+    if writer:
+        writer.writeheader()
+    results = []
+    start = time.perf_counter()
+
+    def collect(rows):
+        results.extend(rows)
+        if writer:
+            writer.writerows(rows)
+            file.flush()  # Zeilen sofort sichtbar, auch wenn der Lauf abgebrochen wird
+        if progress:
+            progress(len(results), time.perf_counter() - start)
+
+    try:
+        if workers == 1:
+            for seeds_of_batch in batches:
+                collect(run_batch(seeds_of_batch, options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                queued, pending = iter(batches), set()
+                while True:
+                    while len(pending) < 2 * workers:
+                        seeds_of_batch = next(queued, None)
+                        if seeds_of_batch is None:
+                            break
+                        pending.add(pool.submit(run_batch, seeds_of_batch, options))
+                    if not pending:
+                        break
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+    finally:
+        if file:
+            file.close()
+    return summarize(results, time.perf_counter() - start)
+
+
+def summarize(results: List[dict], elapsed: float) -> dict:
+    """Aggregated statistics of ``run_soup`` summaries (``elapsed`` = wall time in seconds)."""
+    lifetimes = [row["lifetime"] for row in results if row["stabilised"]]
+    totals = Counter()
+    for row in results:
+        for item in row["census"].split():
+            name, count = item.rsplit(":", 1)
+            totals[name] += int(count)
+    return {
+        "runs": len(results),
+        "stabilised": len(lifetimes),
+        "extinct": sum(1 for row in results if row["stabilised"] and row["final_population"] == 0),
+        "mean_lifetime": statistics.mean(lifetimes) if lifetimes else None,
+        "median_lifetime": statistics.median(lifetimes) if lifetimes else None,
+        "max_lifetime": max(lifetimes) if lifetimes else None,
+        "mean_final_population": statistics.mean(row["final_population"] for row in results) if results else None,
+        "mean_peak_population": statistics.mean(row["peak_population"] for row in results) if results else None,
+        "census": dict(totals.most_common()),
+        "seconds": elapsed,
+        "boards_per_minute": len(results) / elapsed * 60 if elapsed else float("inf"),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run many seeded random boards and collect statistics.")
+    parser.add_argument("--runs", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first board, board i uses seed + i")
+    parser.add_argument("--width", type=int, default=128)
+    parser.add_argument("--height", type=int, default=128)
+    parser.add_argument("--density", type=float, default=0.3, help="probability that a cell starts alive")
+    parser.add_argument("--max-generations", type=int, default=5000)
+    parser.add_argument("--backend", choices=BACKENDS, default="bitpacked")
+    parser.add_argument("--boundary", choices=list(BOUNDARIES), default="dead")
+    parser.add_argument("--rule", default="B3/S23", help='B/S rule, e.g. "B36/S23"')
+    parser.add_argument("--workers", type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument("--batch", type=int, default=8, help="boards per task sent to a worker")
+    parser.add_argument("--csv", default="ensemble.csv", help="file for one summary row per board")
+    args = parser.parse_args()
+    if not 0 <= args.density <= 1:
+        parser.error("--density must be between 0 and 1")
+
+    step = max(args.runs // 10, 1)
+
+    def progress(done, elapsed):
+        if done % step < args.batch or done == args.runs:  # etwa alle 10 %
+            print(f"{done}/{args.runs} boards, {done / elapsed * 60:.0f} boards/min", flush=True)
+
+    report = run_ensemble(range(args.seed, args.seed + args.runs), args.csv, args.workers, args.batch, progress,
+                          width=args.width, height=args.height, density=args.density,
+                          max_generations=args.max_generations, backend=args.backend, boundary=args.boundary,
+                          rule=args.rule)
+    print(f"{report['runs']} boards ({args.width}x{args.height}, density {args.density}) in {report['seconds']:.1f} s: "
+          f"{report['boards_per_minute']:.0f} boards/min")
+    print(f"Stabilised: {report['stabilised']} (extinct {report['extinct']}), "
+          f"{report['runs'] - report['stabilised']} still active after {args.max_generations} generations")
+    if report["mean_lifetime"] is not None:
+        print(f"Lifetime: mean {report['mean_lifetime']:.0f}, median {report['median_lifetime']:.0f}, "
+              f"max {report['max_lifetime']}")
+    if report["runs"]:
+        print(f"Population: mean final {report['mean_final_population']:.1f}, "
+              f"mean peak {report['mean_peak_population']:.1f}")
+    print("Census: " + " ".join(f"{name}:{count}" for name, count in list(report["census"].items())[:12]))
+    print(f"Rows written to {args.csv}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from rules import LIFE, Rule
+
+
+# Knoten im Quadtree (wird nur über HashlifeEngine.join erzeugt, dadurch kanonisch)
+class Node:
+    __slots__ = ("nw", "ne", "sw", "se", "level", "population")
+
+    def __init__(self, nw: 'Node', ne: 'Node', sw: 'Node', se: 'Node', level: int, population: int) -> None:
+        # nw: x klein / y klein, ne: x groß / y klein, sw: x klein / y groß, se: x groß / y groß
+        self.nw = nw
+        self.ne = ne
+        self.sw = sw
+        self.se = se
+        self.level = level  # Knoten deckt 2^level x 2^level Zellen ab
+        self.population = population
+
+
+class HashlifeEngine:
+    """Memoized quadtree (Hashlife) engine for two-state rules on an unbounded plane.
+
+    Every node is canonical, so equal sub-patterns share one node and their
+    futures are computed once. ``advance`` jumps any number of generations,
+    with power-of-two steps done in a single recursive call.
+
+    Limitations: there are no freezed cells and no ``time_not_changed`` ages
+    in this mode, and the plane has no edge, so patterns keep running past
+    the border of the board they came from. The node cache is kept under
+    ``max_nodes``: when it grows larger between two steps, all memoized
+    results are dropped and only the nodes reachable from the current
+    pattern are kept (everything else is freed by the garbage collector).
+    ``rule`` can be any two-state rule without B0 (the empty plane has to
+    stay empty).
+    """
+
+    def __init__(self, max_nodes: int = 2_000_000, rule: Rule = LIFE) -> None:
+        if rule.states > 2 or 0 in rule.birth:
+            raise ValueError(f"Hashlife needs a two-state rule without B0, got {rule}")
+        self.max_nodes = max_nodes
+        self.rule = rule
+        self._next = rule.table.tolist()  # als Listen, schneller als NumPy-Indizierung pro Zelle
+        self.gc_runs = 0
+        self._off = Node(None, None, None, None, 0, 0)
+        self._on = Node(None, None, None, None, 0, 1)
+        self._nodes: Dict[Tuple[Node, Node, Node, Node], Node] = {}
+        self._results: Dict[Tuple[Node, int], Node] = {}
+        self._empty: List[Node] = [self._off]
+
+    @property
+    def cache_size(self) -> int:
+        """Number of canonical nodes plus memoized results."""
+        return len(self._nodes) + len(self._results)
+
+    def join(self, nw: Node, ne: Node, sw: Node, se: Node) -> Node:
+        """Return the canonical node with the given four quadrants."""
+        key = (nw, ne, sw, se)
+        node = self._nodes.get(key)
+        if node is None:
+            node = Node(nw, ne, sw, se, nw.level + 1,
+                        nw.population + ne.population + sw.population + se.population)
+            self._nodes[key] = node
+        return node
+
+    def empty(self, level: int) -> Node:
+        """Return the empty node of the given level."""
+        while len(self._empty) <= level:
+            smaller = self._empty[-1]
+            self._empty.append(self.join(smaller, smaller, smaller, smaller))
+        return self._empty[level]
+
+    def expand(self, node: Node) -> Node:
+        """Return a node one level bigger with ``node`` in its centre."""
+        border = self.empty(node.level - 1)
+        return self.join(self.join(border, border, border, node.nw),
+                         self.join(border, border, node.ne, border),
+                         self.join(border, node.sw, border, border),
+                         self.join(node.se, border, border, border))
+
+    def centre(self, node: Node) -> Node:
+        """Return the centre quarter of a node (one level smaller)."""
+        return self.join(node.nw.se, node.ne.sw, node.sw.ne, node.se.nw)
+
+    def _is_padded(self, node: Node) -> bool:
+        """True if all cells lie in the inner 1/16 of the node."""
+        return (node.level >= 3
+                and node.nw.population == node.nw.se.se.population
+                and node.ne.population == node.ne.sw.sw.population
+                and node.sw.population == node.sw.ne.ne.population
+                and node.se.population == node.se.nw.nw.population)
+
+    def _life_4x4(self, node: Node) -> Node:
+        """Advance the centre 2x2 of a 4x4 node by one generation."""
+        cells = [[0] * 4 for _ in range(4)]
+        for qx, qy, quadrant in ((0, 0, node.nw), (2, 0, node.ne), (0, 2, node.sw), (2, 2, node.se)):
+            for dx, dy, leaf in ((0, 0, quadrant.nw), (1, 0, quadrant.ne), (0, 1, quadrant.sw), (1, 1, quadrant.se)):
+                cells[qx + dx][qy + dy] = leaf.population
+
+        result = []
+        for x, y in ((1, 1), (2, 1), (1, 2), (2, 2)):
+            alive_neighbors = sum(cells[x + dx][y + dy] for dx in (-1, 0, 1) for dy in (-1, 0, 1)) - cells[x][y]
+            result.append(self._on if self._next[cells[x][y]][alive_neighbors] else self._off)
+        return self.join(*result)
+
+    def successor(self, node: Node, j: int) -> Node:
+        """Return the centre half of ``node`` advanced by 2^j generations (j <= level - 2)."""
+        if node.population == 0:
+            return node.nw
+        key = (node, j)
+        result = self._results.get(key)
+        if result is not None:
+            return result
+
+        if node.level == 2:
+            result = self._life_4x4(node)
+        else:
+            nw, ne, sw, se = node.nw, node.ne, node.sw, node.se
+            # 9 überlappende Teilknoten eine Ebene kleiner
+            n00, n02, n20, n22 = nw, ne, sw, se
+            n01 = self.join(nw.ne, ne.nw, nw.se, ne.sw)
+            n10 = self.join(nw.sw, nw.se, sw.nw, sw.ne)
+            n11 = self.join(nw.se, ne.sw, sw.ne, se.nw)
+            n12 = self.join(ne.sw, ne.se, se.nw, se.ne)
+            n21 = self.join(sw.ne, se.nw, sw.se, se.sw)
+            nine = (n00, n01, n02, n10, n11, n12, n20, n21, n22)
+
+            if j == node.level - 2:
+                # volle Schrittweite: zweimal um 2^(j-1) weiterrechnen
+                c00, c01, c02, c10, c11, c12, c20, c21, c22 = (self.successor(n, j - 1) for n in nine)
+                step = j - 1
+            else:
+                c00, c01, c02, c10, c11, c12, c20, c21, c22 = (self.centre(n) for n in nine)
+                step = j
+            result = self.join(self.successor(self.join(c00, c01, c10, c11), step),
+                               self.successor(self.join(c01, c02, c11, c12), step),
+                               self.successor(self.join(c10, c11, c20, c21), step),
+                               self.successor(self.join(c11, c12, c21, c22), step))
+
+        self._results[key] = result
+        return result
+
+    def advance(self, node: Node, generations: int) -> Node:
+        """Advance a pattern by any number of generations.
+
+        The returned node keeps the same centre as ``node`` (it may be bigger).
+        """
+        j = 0
+        while generations:
+            if generations & 1:
+                # so lange vergrößern, bis das Muster sicher im Ergebnis bleibt
+                while node.level < j + 3 or not self._is_padded(node):
+                    node = self.expand(node)
+                node = self.successor(node, j)
+                if self.cache_size > self.max_nodes:
+                    self.collect(node)
+            generations >>= 1
+            j += 1
+        return node
+
+    def collect(self, root: Node):
+        """Drop memoized results and every node not reachable from ``root``."""
+        self._results = {}
+        old_nodes, self._nodes = self._nodes, {}
+        self._empty = [self._off]
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            if node.level == 0:
+                continue
+            key = (node.nw, node.ne, node.sw, node.se)
+            if key in self._nodes:
+                continue
+            self._nodes[key] = node
+            stack.extend(key)
+        del old_nodes
+        self.gc_runs += 1
+
+    def from_array(self, state: np.ndarray) -> Tuple[Node, int]:
+        """Build a node from an array indexed ``[x, y]``.
+
+        Returns the node and the offset that maps plane coordinates to array
+        coordinates (array index = plane coordinate + offset).
+        """
+        level = 1
+        while (1 << level) < max(state.shape):
+            level += 1
+        size = 1 << level
+        square = np.zeros((size, size), dtype=np.uint8)
+        square[:state.shape[0], :state.shape[1]] = state == 1
+        return self._build(square, level), size // 2
+
+    def _build(self, square: np.ndarray, level: int) -> Node:
+        if level == 0:
+            return self._on if square[0, 0] else self._off
+        if not square.any():
+            return self.empty(level)
+        half = 1 << (level - 1)
+        return self.join(self._build(square[:half, :half], level - 1),
+                         self._build(square[half:, :half], level - 1),
+                         self._build(square[:half, half:], level - 1),
+                         self._build(square[half:, half:], level - 1))
+
+    def to_array(self, node: Node, offset: int, width: int, height: int) -> np.ndarray:
+        """Copy the cells of ``node`` into a ``width`` x ``height`` array (cropping the rest)."""
+        state = np.zeros((width, height), dtype=np.uint8)
+        # Knoten deckt die Ebene von -2^(level-1) bis 2^(level-1) ab
+        origin = offset - (1 << (node.level - 1))
+        self._paint(node, state, origin, origin)
+        return state
+
+    def _paint(self, node: Node, state: np.ndarray, x: int, y: int):
+        size = 1 << node.level
+        if node.population == 0 or x >= state.shape[0] or y >= state.shape[1] or x + size <= 0 or y + size <= 0:
+            return
+        if node.level == 0:
+            state[x, y] = 1
+            return
+        half = size // 2
+        self._paint(node.nw, state, x, y)
+        self._paint(node.ne, state, x + half, y)
+        self._paint(node.sw, state, x, y + half)
+        self._paint(node.se, state, x + half, y + half)
@@ -0,0 +1,177 @@
+"""Headless batch simulation without pygame.
+
+Usage:
+    python headless.py PATTERN [--width W] [--height H] [--generations N]
+                       [--boundary dead|torus|mirror|klein|infinite]
+                       [--backend tiled] [--rule B3/S23] [--seed S] [--json]
+                       [--stats-csv FILE] [--stop-on-cycle] [--record DIR]
+
+PATTERN is an RLE file, a name from pattern_library.patterns or "random".
+The rule defaults to B3/S23 and is replaced by the ``rule =`` field of the
+RLE header, if the pattern has one.
+"""
+import argparse
+import json
+import os
+import random
+import time
+
+import numpy as np
+
+from engine import BOUNDARIES as EDGE_BOUNDARIES
+from engine import GRID_BACKENDS, GameOfLife
+from hashlife import HashlifeEngine
+from pattern_library import patterns
+from recorder import Recorder
+
+BOUNDARIES = list(EDGE_BOUNDARIES) + ["infinite"]
+
+
+def load_pattern(pattern: str) -> str:
+    """Return the RLE string for a file path or a bundled pattern name."""
+    if os.path.isfile(pattern):
+        with open(pattern) as file:
+            return file.read()
+    if pattern in patterns:
+        return patterns[pattern]
+    raise ValueError(f"unknown pattern {pattern!r} (no such file or bundled pattern)")
+
+
+def run(pattern: str, width: int = 200, height: int = 200, generations: int = 1000,
+        boundary: str = "dead", backend: str = "tiled", seed: int = None, stats_csv: str = None,
+        rule: str = "B3/S23", stop_on_cycle: bool = False, record: str = None) -> dict:
+    """Run one simulation as fast as possible and return a report.
+
+    The report contains the final population, generations/s and the time
+    spent in each phase (seconds). With ``stats_csv`` the per-generation
+    history (population, births, deaths) is written to that file.
+    ``boundary="infinite"`` uses Hashlife, except for the ``chunked``
+    backend, which steps its sparse plane generation by generation.
+
+    ``period``/``cycle_start`` give the cycle found by the rolling board hash
+    (``extinct`` if the board died out), or None if none was found or the
+    run used Hashlife or the object backend. With ``stop_on_cycle`` the run
+    ends as soon as a cycle is found; ``generations`` is then the number of
+    generations actually simulated.
+
+    With ``record`` every generation (and the start board) is recorded to
+    that directory; ``Recorder.open(record).frames()`` replays it. The
+    report then gives the number of ``frames`` and the ``recorded_bytes``.
+    """
+    if boundary not in BOUNDARIES:
+        raise ValueError(f"unknown boundary {boundary!r}, expected one of {BOUNDARIES}")
+    sparse = backend == "chunked"  # unendliche Ebene Schritt für Schritt statt mit Hashlife
+    if sparse and boundary != "infinite":
+        raise ValueError("the chunked backend always runs on the infinite plane, use --boundary infinite")
+    if stats_csv and ((boundary == "infinite" and not sparse) or backend == "object"):
+        raise ValueError("--stats-csv needs a numpy backend and does not work with Hashlife")
+    if record and boundary == "infinite" and not sparse:
+        raise ValueError("--record does not work with Hashlife")
+    timings = {}
+
+    start = time.perf_counter()
+    game = GameOfLife(width, height, 1, backend=backend, boundary=boundary if boundary != "infinite" else "dead",
+                      rule=rule)
+    if pattern == "random":
+        random.seed(seed)
+        np.random.seed(seed)
+        game.initialize_automatically()
+    else:
+        game.grid.apply_rle_pattern(load_pattern(pattern))
+    if record and os.path.isdir(record):
+        Recorder.open(record).clear()  # alte Aufnahme ersetzen statt anhängen
+    recorder = Recorder(directory=record) if record else None
+    if recorder is not None:
+        recorder.record(game.grid.get_state_array(), 0)
+    timings["setup"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if boundary == "infinite" and not sparse:
+        # unbegrenzte Ebene: Hashlife springt direkt zur Zielgeneration
+        engine = HashlifeEngine(rule=game.grid.rule)
+        node, _ = engine.from_array(game.grid.get_state_array())
+        node = engine.advance(node, generations)
+        population = node.population
+    else:
+        for step in range(generations):
+            finished = game.next_generation()
+            if recorder is not None:
+                recorder.record(game.grid.get_state_array(), step + 1)
+            if finished and stop_on_cycle:
+                generations = step + 1
+                break
+    timings["simulate"] = time.perf_counter() - start
+
+    if recorder is not None:
+        start = time.perf_counter()
+        recorder.flush()
+        recorder.save()
+        timings["record"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    if boundary != "infinite" or sparse:
+        game.grid.get_stats()  # das Objekt-Grid zählt erst hier, die anderen führen laufende Zähler
+        population = game.grid.population if sparse else game.grid.stats[0]
+        if stats_csv:
+            game.grid.history.to_csv(stats_csv)
+    timings["stats"] = time.perf_counter() - start
+
+    report = {
+        "pattern": pattern,
+        "width": width,
+        "height": height,
+        "boundary": boundary,
+        "backend": backend,
+        "rule": str(game.grid.rule),
+        "generations": generations,
+        "population": population,
+        "period": game.cycles.period,
+        "cycle_start": game.cycles.cycle_start,
+        "extinct": game.cycles.extinct,
+        "generations_per_second": generations / timings["simulate"] if timings["simulate"] else float("inf"),
+        "timings": timings,
+    }
+    if recorder is not None:
+        report["frames"] = len(recorder)
+        report["recorded_bytes"] = recorder.memory_bytes + recorder.disk_bytes
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the Game of Life without a display.")
+    parser.add_argument("pattern", help='RLE file, bundled pattern name or "random"')
+    parser.add_argument("--width", type=int, default=200)
+    parser.add_argument("--height", type=int, default=200)
+    parser.add_argument("--generations", type=int, default=1000)
+    parser.add_argument("--boundary", choices=BOUNDARIES, default="dead")
+    parser.add_argument("--backend", choices=sorted(GRID_BACKENDS), default="tiled")
+    parser.add_argument("--rule", default="B3/S23", help='B/S rule, e.g. "B36/S23", "23/3" or "B2/S/C3"')
+    parser.add_argument("--seed", type=int, default=None, help="seed for the random pattern")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    parser.add_argument("--stats-csv", help="write population, births and deaths per generation to a CSV file")
+    parser.add_argument("--stop-on-cycle", action="store_true", help="stop once the board repeats or dies out")
+    parser.add_argument("--record", metavar="DIR", help="record every generation to DIR for replay")
+    args = parser.parse_args()
+
+    report = run(args.pattern, args.width, args.height, args.generations,
+                 args.boundary, args.backend, args.seed, args.stats_csv, args.rule, args.stop_on_cycle, args.record)
+    if args.json:
+        print(json.dumps(report))
+        return
+
+    print(f"{report['generations']} generations of {report['pattern']} "
+          f"({report['width']}x{report['height']}, {report['rule']}, {report['boundary']}, {report['backend']})")
+    print(f"Population: {report['population']}")
+    if report["extinct"]:
+        print(f"Extinct at generation {report['cycle_start']}")
+    elif report["period"] is not None:
+        print(f"Cycle: period {report['period']} from generation {report['cycle_start']}")
+    print(f"Generations/s: {report['generations_per_second']:.1f}")
+    if "frames" in report:
+        print(f"Recorded: {report['frames']} frames, {report['recorded_bytes'] / 1024:.1f} KiB")
+    for phase, seconds in report["timings"].items():
+        print(f"  {phase:<9} {seconds * 1000:10.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
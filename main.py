@@ -1,338 +1,30 @@
-import math
-import random
-from enum import Enum
-from typing import List, Tuple
+import os
+import time
+from functools import partial
 
 import pygame
 
+import renderer
+from brushes import BRUSHES
+from palette import PALETTES
+from profiler import FrameProfiler
+from recorder import Recorder
+from simulation import Simulation
+from ui_cache import CachedLayer, TextCache
+from rules import RULES
 import slider
-from pattern_library import patterns
-from supabasePatterns import getPatterns
+from engine import GameOfLife
+from pattern_index import PatternIndex
+from pattern_store import PatternStore
+from viewport import Viewport
 
 pygame.init()
 myfont = pygame.font.SysFont("monospace", 20)
+text_cache = TextCache(myfont) # gerenderte Labels, die sich ändern können (Zähler, Werte)
 
-RLE_PATTERNS = getPatterns()
-
-# Enum for cell states
-class CellState(Enum):
-    ALIVE = 1
-    DEAD = 0
-
-# Class for each cell in the grid
-class Cell:
-    def __init__(self, x: int, y: int, state: CellState = CellState.DEAD, freezed: bool = False) -> None:
-        self.x = x
-        self.y = y
-        self.state = state
-        self.next_state = state  # Speichert nächsten Stand nachdem Regeln angewendet wurden
-        self.time_not_changed = 0
-        self.freezed = freezed
-
-    def determine_next_state(self, neighbors: List['Cell']):
-        """Determine the cell's next state based on Game of Life rules"""
-        alive_neighbors = sum(1 for neighbor in neighbors if neighbor.state == CellState.ALIVE)
-
-        if self.state == CellState.ALIVE:
-            self.next_state = CellState.ALIVE if alive_neighbors in [2, 3] else CellState.DEAD
-        else:
-            self.next_state = CellState.ALIVE if alive_neighbors == 3 else CellState.DEAD
-
-        '''Count, that a cell did not change'''
-        if self.state == self.next_state:
-            if not self.freezed:
-                self.time_not_changed += 1
-        else:
-            self.time_not_changed = 0
-
-    def update_state(self):
-        """Update cell's state to its next state"""
-        self.state = self.next_state
-
-
-# Class for the grid of cells
-class Grid:
-    def __init__(self, width: int, height: int, cell_size: int) -> None:
-        self.width = width
-        self.height = height
-        self.cell_size = cell_size
-        self.cells = [[Cell(x, y) for y in range(height)] for x in range(width)]
-        self.stats = [0, 0, 0, 0]  # Alive, Dead, New Alive, New Dead
-
-
-    def apply_rle_pattern(self, rle: str):
-        """Wendet ein RLE-Pattern auf das Grid an."""
-        rle_grid = Grid.parse_rle(rle, width=None, height=None)
-
-        # Größe des RLE-Musters bestimmen
-        pattern_width = len(rle_grid[0])
-        pattern_height = len(rle_grid)
-        #print(pattern_width, pattern_height)
-
-        # Berechnung der Offsets für die Zentrierung
-        offset_x = (self.width - pattern_width) // 2
-        offset_y = (self.height - pattern_height) // 2
-        
-        # Zustände auf das Grid anwenden
-        for x, row in enumerate(rle_grid):
-            for y, value in enumerate(row):
-                if 0 <= x + offset_x < self.width and 0 <= y + offset_y < self.height:
-                    self.cells[x + offset_x][y + offset_y].state = (
-                        CellState.ALIVE if value == 1 else CellState.DEAD
-                    )
-                    self.cells[x + offset_x][y + offset_y].time_not_changed = 0
-
-    @staticmethod
-    def parse_rle(rle, width=None, height=None):
-        """Parst ein RLE-Pattern in ein 2D-Grid."""
-        lines = rle.splitlines()
-        header = [line for line in lines if line.startswith('#')]
-        pattern = [line for line in lines if not line.startswith('#')]
-        pattern = ''.join(pattern).replace('\n', '')
-
-        # RLE dekodieren
-        rows = []
-        current_row = []
-        count = ''
-        for char in pattern:
-            if char.isdigit():
-                count += char  # Baue Ziffern zusammen
-            elif char in 'bo':
-                current_row.extend([1 if char == 'o' else 0] * (int(count) if count else 1))
-                count = ''
-            elif char == '$':
-                rows.append(current_row)
-                current_row = []
-        rows.append(current_row)  # Letzte Zeile hinzufügen
-
-        # Normalisieren: Sicherstellen, dass alle Zeilen gleich lang sind
-        max_length = max(len(row) for row in rows)
-        grid = [row + [0] * (max_length - len(row)) for row in rows]
-
-        # Optional: Größe anpassen
-        if width or height:
-            target_width = width if width else len(grid[0])
-            target_height = height if height else len(grid)
-            padded_grid = [[0] * target_width for _ in range(target_height)]
-
-            for i in range(min(target_height, len(grid))):
-                for j in range(min(target_width, len(grid[i]))):
-                    padded_grid[i][j] = grid[i][j]
-            grid = padded_grid
-
-        return grid
-
-    def initialize_random(self):
-        """Randomly initialize the grid with alive and dead cells."""
-        for row in self.cells:
-            for cell in row:
-                cell.state = CellState.ALIVE if random.random() > 0.7 else CellState.DEAD # mehr DEAD Zellen (größere Wahrscheinlichkeit)
-                cell.time_not_changed = 0
-    
-    def change_cell_state(self, x, y):
-        cell = self.cells[x][y]
-        if cell.state == CellState.ALIVE:
-            cell.state = CellState.DEAD
-        else:
-            cell.state = CellState.ALIVE
-    
-    def initialize_manually(self):
-        for row in self.cells:
-            for cell in row:
-                cell.state = CellState.DEAD
-
-    def reset_field(self):
-        for row in self.cells:
-            for cell in row:
-                cell.next_state = CellState.DEAD
-                cell.time_not_changed = 0
-                cell.update_state()
-
-    def get_neighbors(self, cell: Cell) -> List[Cell]:
-        """Return a list of neighboring cells for a given cell."""
-        neighbors = []
-        for dx, dy in [(-1, -1), (-1, 0), (-1, 1), (0, -1), (0, 1), (1, -1), (1, 0), (1, 1)]:
-            nx, ny = cell.x + dx, cell.y + dy
-            try:
-                if 0 <= nx < self.width and 0 <= ny < self.height:
-                    neighbors.append(self.cells[nx][ny])
-            except IndexError as e:
-                pass
-
-        return neighbors
-
-
-    def update(self):
-        """Apply Game of Life rules to each cell in the grid."""
-        # Determine next state for each cell
-        for row in self.cells:
-            for cell in row:
-                neighbors = self.get_neighbors(cell)
-                cell.determine_next_state(neighbors)
-        
-        # Update state to the next state
-        for row in self.cells:
-            for cell in row:
-                if not cell.freezed:
-                    cell.update_state()
-
- 
-
-    def apply_lightning(self, pos_x: int, pos_y: int):
-        for i, row in enumerate(self.cells):
-            if math.sqrt(pow(i - pos_x, 2)) <= 10:
-                for j, cell in enumerate(row):
-                    if math.sqrt(pow(i - pos_x, 2) + pow(j - pos_y, 2)) <= 10: 
-                        cell.next_state = CellState.ALIVE if cell.state == CellState.DEAD else CellState.DEAD
-                        cell.time_not_changed = 0
-                        cell.update_state()
-    
-    def apply_freeze(self, pos_x: int, pos_y: int):
-        for i, row in enumerate(self.cells):
-            if math.sqrt(pow(i - pos_x, 2)) <= 10:
-                for j, cell in enumerate(row):
-                    if math.sqrt(pow(i - pos_x, 2) + pow(j - pos_y, 2)) <= 10:
-                        cell.freezed = True
-
-    def apply_unfreeze(self):
-        for i, row in enumerate(self.cells):
-            for j, cell in enumerate(row):
-                cell.freezed = False
-    
-    def apply_earthquake(self):
-        for row in self.cells:
-            for cell in row:
-                cell.next_state = CellState.ALIVE if cell.state == CellState.DEAD else CellState.DEAD
-                cell.time_not_changed = 0
-                cell.update_state()
-
-    def get_stats(self):
-        self.stats = [0, 0, 0, 0]
-        for row in self.cells:
-            for cell in row:
-                if cell.state == CellState.ALIVE:
-                    self.stats[0] += 1
-                    if cell.time_not_changed == 0:
-                        self.stats[2] += 1
-                else:
-                    self.stats[1] += 1
-                    if cell.time_not_changed == 0:
-                        self.stats[3] += 1
-
-    def draw(self, screen):
-        """Draw the grid of cells to the screen."""
-        self.adjust_grid()
-        self.stats = [0, 0, 0, 0]
-        for row in self.cells:
-            for cell in row:
-                #1 color
-                #color = (0, 255, 0) if cell.state == CellState.ALIVE else (0, 0, 0)
-                #changing colors and calculating stats
-                if cell.state == CellState.ALIVE: # Farbveränderung der lebendigen Zellen
-                    if not cell.freezed:
-                        r = max(255 - 2*cell.time_not_changed, 0) # kann nie unter 0 sein
-                        g = min(cell.time_not_changed, 255) # kann nie über 255 sein
-                        b = max(255 - 0.5*cell.time_not_changed, 0)
-                        color = (r, g, b)
-                    elif cell.freezed:
-                        r = int(max(255 - 2*cell.time_not_changed, 0)*0.8)
-                        g = int(min(cell.time_not_changed, 255)*0.9)
-                        b = int(max(255 - 0.5*cell.time_not_changed, 0) + (255 - max(255 - 0.5*cell.time_not_changed, 0))*0.2) # time_not changed ändert sich nicht, daher auch keine Änderung der Farben bei Freeze
-                        color = (r, g, b)
-                    self.stats[0] += 1
-                    if cell.time_not_changed == 0:
-                        self.stats[2] += 1
-                else: # Farbverlauf der nicht lebendigen Zellen --> wird schwarz
-                    if not cell.freezed:
-                        r, g, b = max(255 - cell.time_not_changed, 0), max(255 - cell.time_not_changed, 0), max(255 - cell.time_not_changed, 0)
-                        color = (r, g, b)
-                    elif cell.freezed:
-                        r = int(max(255 - cell.time_not_changed, 0)*0.8)
-                        g = int(max(255 - cell.time_not_changed, 0)*0.9)
-                        b = int(max(255 - cell.time_not_changed, 0) + (255 - max(255 - cell.time_not_changed, 0))*0.2)
-                        color = (r, g, b)
-                    self.stats[1] += 1
-                    if cell.time_not_changed == 0:
-                        self.stats[3] += 1
-                pygame.draw.rect(screen, color, pygame.Rect(
-                    cell.x * self.cell_size, cell.y * self.cell_size, self.cell_size, self.cell_size))
-    
-    def adjust_grid(self):
-        old_num = len(self.cells)
-        new_num = int(self.width)
-
-        difference = new_num - old_num
-
-        if difference < 0: # reinzoomen
-            diff_top = difference // 2
-            diff_bottom = difference - diff_top
-
-            diff_left = diff_top
-            diff_right = diff_bottom
-
-            new_cells = [[Cell(x, y) for y in range(new_num)] for x in range(new_num)]
-
-            for row_index, row in enumerate(new_cells): #
-                for col_index, cell in enumerate(row):
-                    if (diff_top-1 < row_index) and (row_index < new_num-diff_bottom-1) and (diff_left - 1 < col_index) and (col_index < new_num - diff_right-1):
-                        # Zelle aus self.cells holen
-                        old_cell = self.cells[row_index-diff_top][col_index-diff_left]
-                        new_cells[row_index][col_index].state, new_cells[row_index][col_index].next_state, new_cells[row_index][col_index].freezed, new_cells[row_index][col_index].time_not_changed = old_cell.state, old_cell.next_state, old_cell.freezed, old_cell.time_not_changed
-
-            self.cells = []
-            self.cells.extend(new_cells)
-
-        elif difference > 0: # rauszoomen
-            diff_top = difference // 2
-            diff_bottom = difference - diff_top
-
-            diff_left = diff_top
-            diff_right = diff_bottom
-
-            new_cells = [[Cell(x, y) for y in range(new_num)] for x in range(new_num)]
-
-            for row_index, row in enumerate(self.cells): #
-                for col_index, cell in enumerate(row):
-                    if (diff_top-1 < row_index) and (row_index < new_num-diff_bottom-1) and (diff_left - 1 < col_index) and (col_index < new_num - diff_right-1):
-                        # Zelle aus self.cells holen
-                        old_cell = self.cells[row_index-diff_top][col_index-diff_left]
-                        new_cells[row_index][col_index].state, new_cells[row_index][col_index].next_state, new_cells[row_index][col_index].freezed, new_cells[row_index][col_index].time_not_changed = old_cell.state, old_cell.next_state, old_cell.freezed, old_cell.time_not_changed
-
-            self.cells = []
-            self.cells.extend(new_cells)
-
-
-# Main Game of Life class to control the game flow
-class GameOfLife:
-    def __init__(self, width: int, height: int, cell_size: int):
-        self.width = width
-        self.height = height
-        self.cell_size = cell_size
-        self.grid = Grid(width, height, cell_size)
-
-    def initialize(self):
-        """Initialize the grid with a random setup of alive and dead cells."""
-        #self.grid.initialize_random()
-        self.grid.initialize_manually()
-    
-    def initialize_automatically(self):
-        """Initialize the grid with a random setup of alive and dead cells."""
-        self.grid.initialize_random()
-
-    def next_generation(self):
-        """Advance the grid to the next generation."""
-        self.grid.update()
-
-    def apply_spell(self, key: int, pos_x: int = None, pos_y: int = None):
-        if key == 0:
-            self.grid.apply_lightning(pos_x, pos_y)
-        elif key == 1:
-            self.grid.apply_earthquake()
-        elif key == 2:
-            self.grid.apply_freeze(pos_x, pos_y)
-        elif key == 3:
-            self.grid.apply_unfreeze()
-
+pattern_store = PatternStore() # Muster sofort aus dem lokalen Cache laden
+pattern_store.refresh_async() # und im Hintergrund von Supabase aktualisieren
+pattern_index = PatternIndex() # dekodierte Muster (Bitmaps), neu aufgebaut nur bei neuer Version des Stores
 
 # Images
 play_image = pygame.image.load('play.png') 
@@ -356,55 +48,167 @@ green_button.blit(reset_image, (0, 0))
 
 stat_button = pygame.Surface((75, 50)) 
 stat_button.fill((50, 50, 50))
+stat_button.blit(myfont.render("Stats", 1, (255, 255, 255)), (5, 15)) # Beschriftung einmal einbrennen
 
 stat_surface = pygame.Surface((400, 200)) 
 stat_surface.fill((100, 100, 100))
 
 legende_button_color = (50, 50, 50) 
 legende_button_rect = pygame.Rect(800, 0, 100, 50) 
-legende_button_caption = myfont.render("Legende", 1, (255, 255, 255))
+legende_button = pygame.Surface(legende_button_rect.size)
+legende_button.fill(legende_button_color)
+legende_button.blit(myfont.render("Legende", 1, (255, 255, 255)), (5, 15))
 
 legende_surface_color = (100, 100, 100) 
-legende_surface_rect = pygame.Rect(500, 0, 400, 560) 
+legende_surface_rect = pygame.Rect(500, 0, 400, 640) 
+
+profile_surface_color = (30, 30, 30) # Hintergrund des Profiling-Overlays
+profile_surface_offset = (10, 210) # Overlay oben links, unter dem Stats-Fenster
+PROFILE_FRAMES = 300 # so viele Frames nimmt ein cProfile-Mitschnitt (Key F4) auf
+DISPLAY_FPS = 60 # Bildwiederholrate, unabhängig von der Geschwindigkeit der Simulation
+CHECKPOINT_PATH = "checkpoint.golc" # Spielstand (Zustand, Alter, Freeze) für Speichern (F5) und Laden (F9)
+
+
+def speed_to_rate(speed):
+    """Geschwindigkeit vom Slider (1..100) in Generationen pro Sekunde (1..1000, logarithmisch)."""
+    return 10 ** ((speed - 1) / 33)
+
+
+def build_legend(surface, key):
+    """Legende einmal zusammensetzen (neu nur, wenn sich Regel, Radius oder Pinsel ändern)."""
+    rule, spell_radius, brush_name = key
+    captions = ['Erhöhe V: Key Up', 'Vermindere V: Key Down', 'Muster an der Maus: Key laut Liste',
+                'Muster drehen: Key T', 'Muster spiegeln: Key M', 'Leeren: Key C', 'Lightning: Key L',
+                'Freeze: Key F', 'Earthquake: Key E', 'Unfreeze: Key U', 'Farben: Key P', 'Verschieben: Rechte Maus',
+                'Zoom: Mausrad', f'Regel {rule}: Key R', 'Profiling: Key F3', f'cProfile {PROFILE_FRAMES} Frames: Key F4',
+                f'Zauber-Radius {spell_radius}: Key -/+', f'Pinsel {brush_name}: Key Tab',
+                'Zurückspulen (Pause): Key Links/Rechts', 'Speichern/Laden: Key F5/F9']
+    for i, caption in enumerate(captions): # antialias = 1 --> glattere Kanten
+        surface.blit(myfont.render(caption, 1, (255, 255, 255)), (10, 20 + 30 * i))
+
+
+def build_pattern_list(surface, key):
+    """Liste der Muster mit ihren Tasten einmal zusammensetzen (neu nur bei neuen Mustern oder anderer Lage)."""
+    bindings, rotation, flip = key
+    surface.blit(myfont.render(f"Lage: {rotation * 90}°{' gespiegelt' if flip else ''}", 1, (255, 255, 255)), (0, 0))
+    for i, (char, label) in enumerate(bindings):
+        surface.blit(myfont.render(f"{char}: {label}", 1, (255, 255, 255)), (0, 30 * (i + 1)))
 
 # Setup der GUI
 class GUI:
     def __init__(self): 
-        FPS = 60 # Variable, die die Geschwindigkeit speichert (gemessen in FPS)
+        speed = 60 # Variable, die die Geschwindigkeit speichert (Slider-Wert, siehe speed_to_rate)
         cell_size = 9 # speichert die Größe der quadratischen Zelle
-        grid_width, grid_height = 100, 100  # bestimmt Anzahl der Zeilen und Spalten im Feld
+        grid_width, grid_height = 100, 100  # bestimmt Anzahl der sichtbaren Zeilen und Spalten im Feld
+        world_size = 900 // 5 # Größe der Welt in Zellen (passt beim kleinsten Zoom genau auf das Feld)
         
         red_button_offset = (grid_width * cell_size/2-110, grid_height * cell_size+10) # offset vom play Button, grid_width * cell_size / 2 = Hälft der Ges Breite, dann -150; grid_height * cell_size = 1200, dann + 10
         blue_button_offset = (grid_width * cell_size/2+25, grid_height * cell_size+10) # offset vom random Button
         green_button_offset = (grid_width * cell_size/2+150, grid_height * cell_size+10) # offset vom reset Button
         label_count_offset = (grid_width * cell_size-120, grid_height * cell_size+10) # offset für count Label unten rechts
         label_fps_offset = (grid_width * cell_size-120, grid_height * cell_size+30) # offset für FPS Label unten rechts
+        label_step_offset = (grid_width * cell_size-150, grid_height * cell_size+50) # offset für Step-Zeit Label unten rechts
+        label_render_offset = (grid_width * cell_size-150, grid_height * cell_size+70) # offset für Render-Zeit Label unten rechts
         stat_label_1_offset = (70, 50) # offset Stat Label 1 oben links
         stat_label_2_offset = (70, 80) # offset Stat Label 2 oben links
+        stat_label_3_offset = (70, 110) # offset Stat Label 3 (Zyklus) oben links
+        stat_label_4_offset = (70, 140) # offset Stat Label 4 (gemessene Generationen/s) oben links
+        stat_label_5_offset = (70, 170) # offset Stat Label 5 (Checkpoint) oben links
         zoom_Slider_pos = (260, 935) # Position des Zoom Sliders
         velocity_Slider_pos = (80, 935) # Position des Geschwindigkeitssliders
+        timeline_Slider_pos = (70, 985) # Position der Zeitleiste (aufgenommene Generationen)
+        label_generation_offset = (timeline_Slider_pos[0]+215, timeline_Slider_pos[1]-10) # offset für Generation Label rechts neben der Zeitleiste
         
         screen = pygame.display.set_mode((900,1000)) # Screen wird initialisiert
         pygame.display.set_caption("Conway's Game of Life") # Titel für den Screen
         
         clock = pygame.time.Clock() # Initialisierung der clock
+        grid_renderer = renderer.GridRenderer() # zeichnet nur geänderte Zellen neu
+        profiler = FrameProfiler() # Zeit pro Phase eines Frames (Overlay mit F3), aus: fast kein Aufwand
+
+        # Statische Teile der Oberfläche werden einmal zusammengesetzt und mit einem blit gezeichnet
+        bottom_bar_top = grid_height * cell_size # die Leiste beginnt unter dem Feld (Offsets sind Bildschirmkoordinaten)
+        def build_bottom_bar(surface, _):
+            top = bottom_bar_top
+            surface.blit(red_button, (red_button_offset[0], red_button_offset[1] - top))
+            surface.blit(blue_button, (blue_button_offset[0], blue_button_offset[1] - top))
+            surface.blit(green_button, (green_button_offset[0], green_button_offset[1] - top))
+            surface.blit(myfont.render('Random', 1, (255,255,255)), (blue_button_offset[0]+23, blue_button_offset[1]+12 - top))
+            surface.blit(myfont.render('Zoom:', 1, (255,255,255)), (zoom_Slider_pos[0]-65, zoom_Slider_pos[1]-10 - top))
+            surface.blit(myfont.render('V:', 1, (255,255,255)), (velocity_Slider_pos[0]-40, velocity_Slider_pos[1]-10 - top))
+            surface.blit(myfont.render('T:', 1, (255,255,255)), (timeline_Slider_pos[0]-40, timeline_Slider_pos[1]-10 - top))
+        bottom_bar = CachedLayer((900, 1000 - bottom_bar_top), build_bottom_bar, background=(0, 0, 0))
+        legend_layer = CachedLayer(legende_surface_rect.size, build_legend, background=legende_surface_color)
+        pattern_list_layer = CachedLayer((400, 900), build_pattern_list)
+        palette_name = "age" # aktuelles Farbschema (siehe palette.PALETTES)
+        spell_radius = 10 # Radius von Lightning und Freeze (in Zellen)
+        brush_name = "disc" # Form von Lightning und Freeze (siehe brushes.BRUSHES)
+        rule_name = "life" # aktuelle Regel (siehe rules.RULES), Muster mit eigener Regel im RLE-Header setzen sie selbst
+        screen.fill((0, 0, 0)) # Hintergrund (schwarz), wird danach nur noch stellenweise neu gezeichnet
 
         # Sliders 
         zoom_Slider = slider.Slider(zoom_Slider_pos[0], zoom_Slider_pos[1], 75, 5, min_value= 5, max_value=20, startValue=9) # Initialisierung des ZoomSliders
         velocity_Slider = slider.Slider(velocity_Slider_pos[0], velocity_Slider_pos[1], 75, 5, min_value= 1, max_value=100, startValue=60) #Initialisierung des Geschwindigkeitssliders
+        timeline_Slider = slider.Slider(timeline_Slider_pos[0], timeline_Slider_pos[1], 200, 5, min_value=0, max_value=1, startValue=1) # Zeitleiste, Grenzen wachsen mit der Aufnahme
 
-        game = GameOfLife(grid_width, grid_height, cell_size) # Initialisierung des Spiels (durch Objekt der GameOfLife Klasse)
+        game = GameOfLife(world_size, world_size, cell_size, backend="tiled") # Initialisierung des Spiels (durch Objekt der GameOfLife Klasse)
+        viewport = Viewport(world_size, world_size, cell_size) # sichtbarer Ausschnitt der Welt (Zoom und Verschieben)
+        pan_start = None # Mausposition beim Verschieben mit der rechten Maustaste
         game.initialize() # Spielfeld initialisieren durch Aufruf der initialize Funktion der GameOfLife Klasse
+        # Ab hier gehört game dem Simulations-Thread: Änderungen nur noch über simulation.submit
+        recorder = Recorder() # nimmt jede Generation auf (Deltas zu Keyframes), für die Zeitleiste
+        simulation = Simulation(game, speed_to_rate(speed), recorder)
+        simulation.start()
+        scrub_frame = None # angezeigter Frame der Aufnahme beim Zurückspulen, None = aktueller Stand
+        scrub_snapshot = None # Snapshot von scrub_frame (wird nur bei neuem Frame neu gelesen)
+
+        checkpoint_status = "-" # Ergebnis des letzten Speicherns/Ladens (Stats-Fenster)
+
+        # Speichern und Laden laufen im Simulations-Thread; eine fehlende oder kaputte Datei beendet das Spiel nicht
+        def save_checkpoint():
+            nonlocal checkpoint_status
+            try:
+                game.save_checkpoint(CHECKPOINT_PATH)
+                checkpoint_status = f"gespeichert (Gen {game.grid.generation})"
+            except OSError as error:
+                checkpoint_status = f"Fehler: {error}"
 
+        def load_checkpoint():
+            nonlocal checkpoint_status
+            try:
+                game.load_checkpoint(CHECKPOINT_PATH, backend="tiled")
+            except (OSError, ValueError) as error:
+                checkpoint_status = f"Fehler: {error}"
+                return
+            recorder.clear() # die Aufnahme gehört zum alten Feld (evtl. andere Größe)
+            checkpoint_status = f"geladen (Gen {game.grid.generation})"
+
+        def resume_from_scrub():
+            # vor Play und Änderungen: das Spiel auf den angezeigten Frame zurücksetzen, spätere Frames verwerfen
+            nonlocal scrub_frame
+            if scrub_frame is not None:
+                simulation.submit(partial(simulation.rewind, scrub_frame))
+                scrub_frame = None
+
+        def bind_pattern_keys():
+            # Tasten aus dem Index erzeugen: Taste -> Name, und die Beschriftung der Musterliste
+            keys = pattern_index.keys
+            return ({pygame.key.key_code(char): name for char, name in keys.items()},
+                    tuple((char, pattern_index[name].describe()) for char, name in keys.items()))
+
+        pattern_index.update(pattern_store.patterns, pattern_store.version) # nur neu aufbauen, wenn der Cache neuer ist
+        pattern_keys, pattern_bindings = bind_pattern_keys()
         running = True # ob das Programm läuft oder nicht
-        started = False # ob der Ablauf der Zellen gestarted wurde (durch den Play Button)
-        selected_pattern = None # speichert ausgewähltes Muster
+        selected_pattern = None # speichert ausgewähltes Muster (Eintrag im Index)
+        pattern_cell = None # Zelle, auf die das Muster zentriert wird
+        pattern_rotation = 0 # Vierteldrehungen der Muster
+        pattern_flip = False # Muster gespiegelt
         stats_opened = False # gibt an, ob der Nutzer das Stats-Fenster oben in der linken Ecke geöffnet hat
         legende_opened = False # gibt an, ob der Nutzer das Legende-Fenster oben in der rechten Ecke geöffnet hat
-        count = 0 # Anzahl der durchlaufenen Frames
+        render_ms = 0.0 # Dauer des letzten Zeichnens in ms
         while running: #läuft nur solange running auf True ist, das Programm laufen soll
-            screen.fill((0, 0, 0)) # Hintergrund (schwarz)
-
+            if pattern_index.update(pattern_store.patterns, pattern_store.version): # neue Muster aus Supabase
+                pattern_keys, pattern_bindings = bind_pattern_keys()
             # Events
             for event in pygame.event.get(): # iteriert durch alle Events, die derzeit in der Event-Liste sind
                 if event.type == pygame.QUIT:
@@ -416,120 +220,168 @@ class GUI:
                 mouse_pressed = pygame.mouse.get_pressed()[0] # 0 steht für linke Maustaste, gibt True oder False für gedrückt zurück
                 zoom_Slider.update(pos, mouse_pressed) # zoom Slider aktualisieren
                 velocity_Slider.update(pos, mouse_pressed) # Geschwindigkeitsslider aktualisieren
+                timeline_Slider.update(pos, mouse_pressed) # Zeitleiste aktualisieren
                 
                 # Geschwindigkeit und Zoom implementieren/ändern
-                FPS = int(velocity_Slider.value) # FPS Wert vom Slider nehmen
-
-                cell_size = int(zoom_Slider.value) # Größe der Zelle vom Slider nehmen (Slider gibt Größe der Zelle an)
-                game.grid.cell_size = cell_size # die Zellengröße im Grid verändern
-                grid_width, grid_height = 900//cell_size, 900//cell_size # die Anzahl an Spalten und Zeilen neu berechnen
-                game.grid.width, game.grid.height = grid_width, grid_height # Die Anzahl an Spalten und Zeilen den Attributen
-
-                if event.type == pygame.MOUSEBUTTONDOWN: # Wenn Maus geklickt wird
+                speed = int(velocity_Slider.value) # Geschwindigkeit vom Slider nehmen
+
+                if event.type == pygame.MOUSEWHEEL: # Mausrad zoomt um die Mausposition
+                    zoom_Slider.change_value(min(max(int(zoom_Slider.value) + event.y, zoom_Slider.min_value), zoom_Slider.max_value))
+                    viewport.zoom(int(zoom_Slider.value), pos)
+                viewport.zoom(int(zoom_Slider.value)) # Zoom vom Slider: nur der Ausschnitt ändert sich, die Welt bleibt erhalten
+                cell_size = viewport.cell_size # Größe der Zelle vom Slider nehmen (Slider gibt Größe der Zelle an)
+                grid_width, grid_height = viewport.columns, viewport.rows # Anzahl der sichtbaren Spalten und Zeilen
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 3: # rechte Maustaste: Ausschnitt verschieben
+                    pan_start = pos
+                if event.type == pygame.MOUSEBUTTONUP and event.button == 3:
+                    pan_start = None
+                if event.type == pygame.MOUSEMOTION and pan_start is not None:
+                    dx, dy = (pan_start[0] - pos[0]) // cell_size, (pan_start[1] - pos[1]) // cell_size # um ganze Zellen verschieben
+                    if dx or dy:
+                        viewport.pan(dx, dy)
+                        pan_start = (pan_start[0] - dx * cell_size, pan_start[1] - dy * cell_size)
+
+                if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1: # Wenn Maus geklickt wird
                     if red_button.get_rect(topleft=red_button_offset).collidepoint(pos): # Play button 
-                        started = not started # bestimmt, ob gestartet wird
-                    if not started and 0<=pos[0]<=(grid_width * cell_size) and 0<=pos[1]<=(grid_height * cell_size): # schaut, ob auf ein Kästchen geklickt wird
-                        pos_cell = [pos[0]//cell_size, pos[1]//cell_size] # Zelle herausfinden
-                        cell = game.grid.cells[pos_cell[0]][pos_cell[1]] # Zelle aus Grid holen
-                        if cell.state == CellState.ALIVE: cell.state = CellState.DEAD # Zellenstatus verändern
-                        else: cell.state = CellState.ALIVE
-                    if not started and blue_button.get_rect(topleft=blue_button_offset).collidepoint(pos): # schauen, ob random button gedrück wird
-                        game.initialize_automatically() # zufälliges grid initialisieren
-                        count = 0 # count zurückgesetzt
+                        resume_from_scrub() # vom angezeigten Frame aus weiterspielen
+                        simulation.running = not simulation.running # bestimmt, ob gestartet wird
+                    pos_cell = viewport.to_cell(pos) # Zelle in der Welt unter der Maus (None außerhalb des Felds)
+                    if not simulation.running and pos_cell is not None: # schaut, ob auf ein Kästchen geklickt wird
+                        resume_from_scrub()
+                        simulation.submit(partial(game.change_cell_state, pos_cell[0], pos_cell[1])) # Zellenstatus verändern
+                    if not simulation.running and blue_button.get_rect(topleft=blue_button_offset).collidepoint(pos): # schauen, ob random button gedrück wird
+                        resume_from_scrub()
+                        simulation.submit(game.initialize_automatically) # zufälliges grid initialisieren
+                        simulation.submit(simulation.reset_steps) # count zurückgesetzt
                     if green_button.get_rect(topleft=green_button_offset).collidepoint(pos): # schauen, ob reset gedrück wird
-                        game.grid.reset_field() # Feld zurücksetzen
-                        count = 0 # count zurücksetzen
-                        started = False # Generationsfortsetzung/Ablauf stoppen
+                        simulation.running = False # Generationsfortsetzung/Ablauf stoppen
+                        scrub_frame = None # das Feld wird ohnehin geleert
+                        simulation.submit(game.reset_field) # Feld zurücksetzen
+                        simulation.submit(simulation.reset_steps) # count zurücksetzen
                 if event.type == pygame.KEYDOWN: # Wenn eine Taste gedrückt wird
+                    pos_world = viewport.to_world(pos) # Position in der Welt (in Zellen), None außerhalb des Felds
+                    if event.key in (pygame.K_l, pygame.K_f, pygame.K_e, pygame.K_u, pygame.K_r): # Zauber und Regel ändern das Spiel
+                        resume_from_scrub()
                     if event.key == pygame.K_l: # l wird gedrückt, Lightning Zauber aktiviert
-                        if 0<=pos[0]<=(grid_width * cell_size) and 0<=pos[1]<=(grid_height * cell_size): # schaut, ob Maus im gegebenen Fenser liegt
-                            game.apply_spell(0, pos[0]/cell_size, pos[1]/cell_size) # gibt berechnet Spalte und Zeile zum Zauber
+                        if pos_world is not None: # schaut, ob Maus im gegebenen Fenser liegt
+                            simulation.submit(partial(game.apply_spell, 0, *pos_world, spell_radius, brush_name)) # gibt berechnet Spalte und Zeile zum Zauber
                     if event.key == pygame.K_f: # f wird gedrückt (freeze)
-                        if 0<=pos[0]<=(grid_width * cell_size) and 0<=pos[1]<=(grid_height * cell_size):
-                            game.apply_spell(2, pos[0]/cell_size, pos[1]/cell_size)
+                        if pos_world is not None:
+                            simulation.submit(partial(game.apply_spell, 2, *pos_world, spell_radius, brush_name))
                     elif event.key == pygame.K_e: # wenn e gedrückt wird (earthquake)
-                        game.apply_spell(1)
+                        simulation.submit(partial(game.apply_spell, 1))
                     elif event.key == pygame.K_c: # wenn c gedrückt wird 
-                        game.grid.reset_field() # Feld zurücksetzen
-                        count = 0
-                        started = False
+                        simulation.running = False
+                        scrub_frame = None
+                        simulation.submit(game.reset_field) # Feld zurücksetzen
+                        simulation.submit(simulation.reset_steps)
                     elif event.key == pygame.K_u: # wenn u gedrückt wird, unfreeze
-                        game.apply_spell(3) # unfreeze Spell über apply_spell in Game Of Life aufgerufen
+                        simulation.submit(partial(game.apply_spell, 3)) # unfreeze Spell über apply_spell in Game Of Life aufgerufen
+                    elif event.key == pygame.K_p: # wenn p gedrückt wird, nächstes Farbschema
+                        palette_names = list(PALETTES)
+                        palette_name = palette_names[(palette_names.index(palette_name) + 1) % len(palette_names)]
+                        grid_renderer.palette = PALETTES[palette_name]
+                    elif event.key == pygame.K_r: # wenn r gedrückt wird, nächste Regel (siehe rules.RULES)
+                        rule_names = list(RULES)
+                        rule_name = rule_names[(rule_names.index(rule_name) + 1) % len(rule_names)] if rule_name in rule_names else rule_names[0]
+                        simulation.submit(partial(game.set_rule, rule_name))
+                    elif event.key == pygame.K_MINUS: # kleinerer Zauber-Radius
+                        spell_radius = max(spell_radius - 2, 2)
+                    elif event.key in (pygame.K_PLUS, pygame.K_EQUALS, pygame.K_KP_PLUS): # größerer Zauber-Radius
+                        spell_radius = min(spell_radius + 2, 40)
+                    elif event.key == pygame.K_TAB: # nächste Pinselform
+                        brush_names = list(BRUSHES)
+                        brush_name = brush_names[(brush_names.index(brush_name) + 1) % len(brush_names)]
+                    elif event.key == pygame.K_F3: # Profiling-Overlay an/aus
+                        profiler.toggle()
+                        if not profiler.enabled:
+                            grid_renderer.invalidate() # Overlay vom Grid übermalen lassen
+                    elif event.key == pygame.K_F4: # cProfile-Mitschnitt der nächsten Frames in eine Datei
+                        profiler.start_capture(PROFILE_FRAMES, time.strftime("profile-%Y%m%d-%H%M%S.prof"))
+                    elif event.key == pygame.K_F5: # Spielstand speichern (aktueller Stand, nicht der zurückgespulte)
+                        simulation.submit(save_checkpoint)
+                    elif event.key == pygame.K_F9 and os.path.exists(CHECKPOINT_PATH): # Spielstand laden
+                        simulation.running = False
+                        scrub_frame = None
+                        simulation.submit(load_checkpoint)
+                    elif event.key in (pygame.K_LEFT, pygame.K_RIGHT) and not simulation.running and recorder.last is not None: # in der Pause eine Generation zurück/vor
+                        step = -1 if event.key == pygame.K_LEFT else 1
+                        scrub_frame = min(max((recorder.last if scrub_frame is None else scrub_frame) + step, recorder.first), recorder.last)
                     elif event.key == pygame.K_UP: # Pfeiltaste nach oben gedrückt
-                        if FPS < 95: # Begrenzung
-                            FPS += 5 # FPS um 5 erhöht
-                            velocity_Slider.change_value(FPS) # Wert auf dem Slider ändern
+                        if speed < 95: # Begrenzung
+                            speed += 5 # Geschwindigkeit um 5 erhöht
+                            velocity_Slider.change_value(speed) # Wert auf dem Slider ändern
                     elif event.key == pygame.K_DOWN: # Wenn Pfeiltaste nach unten gedrückt wird
-                        if FPS > 5: # Begrenzung
-                            FPS -= 5 # FPS verringern
-                            velocity_Slider.change_value(FPS) # Slider ändern
-                    elif event.key == pygame.K_1: # Wenn Zahl gedrückt wird (hier: 1)
-                        selected_pattern = RLE_PATTERNS["glider"] # Vorgefertigtes Pattern in Variable speichern
-                    elif event.key == pygame.K_2:
-                        selected_pattern = RLE_PATTERNS["blinker"]
-                    elif event.key == pygame.K_3:
-                        selected_pattern = RLE_PATTERNS["toad"]
-                    elif event.key == pygame.K_4:
-                        selected_pattern = RLE_PATTERNS["rats"]
-                    elif event.key == pygame.K_5:
-                        selected_pattern = RLE_PATTERNS["acorn"]
-                    elif event.key == pygame.K_6:
-                        selected_pattern = RLE_PATTERNS["gosper_glider_gun"]
-                    elif event.key == pygame.K_7:
-                        selected_pattern = RLE_PATTERNS["queen_bee_shuttle"]
-                    elif event.key == pygame.K_8:
-                        selected_pattern = RLE_PATTERNS["pulsar"]
-                    elif event.key == pygame.K_9:
-                        selected_pattern = RLE_PATTERNS["diehard"]
-                    elif event.key == pygame.K_a:
-                        selected_pattern = RLE_PATTERNS["r_pentomino"]
-                    elif event.key == pygame.K_b:
-                        selected_pattern = RLE_PATTERNS["ants"]
-
-            
-            if started:
-                game.next_generation() # Wenn Ablauf gestartet wurde, nächste Generation starten
-                count += 1 # nächsten Frame addieren
-
+                        if speed > 5: # Begrenzung
+                            speed -= 5 # Geschwindigkeit verringern
+                            velocity_Slider.change_value(speed) # Slider ändern
+                    elif event.key == pygame.K_t: # Muster um 90° drehen
+                        pattern_rotation = (pattern_rotation + 1) % 4
+                    elif event.key == pygame.K_m: # Muster spiegeln
+                        pattern_flip = not pattern_flip
+                    elif event.key in pattern_keys: # Taste laut Musterliste
+                        selected_pattern = pattern_index[pattern_keys[event.key]]
+                        # an der Maus einsetzen, außerhalb des Felds in der Mitte der Welt
+                        pattern_cell = viewport.to_cell(pos) or (viewport.world_width // 2, viewport.world_height // 2)
+            profiler.lap("events")
+
+            # Die Generationen berechnet der Simulations-Thread (mit Ziel-Rate, hält bei Zyklus selbst an)
+            simulation.rate = speed_to_rate(speed)
             if selected_pattern:
-                game.grid.apply_rle_pattern(selected_pattern) # wenn das ausgewählte Muster existiert, das RLE Pattern anwenden
+                resume_from_scrub()
+                # vorab dekodierte Bitmap (gedreht/gespiegelt aus dem Cache) einstempeln, kein RLE-Parsen
+                simulation.submit(partial(game.place_pattern, selected_pattern.oriented(pattern_rotation, pattern_flip),
+                                          *pattern_cell, selected_pattern.rule))
                 selected_pattern = None # pattern zurücksetzen
-
-            game.grid.draw(screen)  # Grid auf den Screen packen
+            snapshot = simulation.latest() # neuester Stand, Zwischengenerationen werden übersprungen
+            if (snapshot.width, snapshot.height) != (viewport.world_width, viewport.world_height): # anders großes Feld geladen
+                viewport = Viewport(snapshot.width, snapshot.height, viewport.cell_size)
+
+            # Zeitleiste: in der Pause einen aufgenommenen Frame statt des aktuellen Stands anzeigen
+            first_frame, last_frame = recorder.first, recorder.last
+            if last_frame is not None:
+                timeline_Slider.set_range(first_frame, last_frame)
+                if timeline_Slider.is_dragging and not simulation.running:
+                    scrub_frame = int(round(timeline_Slider.value))
+                if scrub_frame is not None:
+                    scrub_frame = min(max(scrub_frame, first_frame), last_frame) # ältere Frames können verworfen sein
+                    if scrub_frame == last_frame:
+                        scrub_frame = None # letzter Frame = aktueller Stand (mit Alter und Freeze)
+                if not timeline_Slider.is_dragging:
+                    timeline_Slider.change_value(last_frame if scrub_frame is None else scrub_frame)
+            if scrub_frame is None:
+                scrub_snapshot = None
+            elif scrub_snapshot is None or scrub_snapshot.frame != scrub_frame:
+                scrub_snapshot = snapshot.with_state(recorder.seek(scrub_frame), recorder.generation(scrub_frame))
+                scrub_snapshot.frame = scrub_frame
+            if scrub_snapshot is not None:
+                snapshot = scrub_snapshot
+            profiler.lap("step")
+
+            render_start = time.perf_counter()
+            dirty_rects = grid_renderer.draw(screen, snapshot, viewport)  # geänderte sichtbare Teile des Grids auf den Screen packen
+            profiler.lap("draw")
+
+            # Bereiche neben und unter dem Grid (Buttons, Slider, Labels) werden jedes Frame neu gezeichnet
+            board_rect = pygame.Rect((0, 0), viewport.board_size)
+            chrome_rects = [pygame.Rect(board_rect.right, 0, screen.get_width() - board_rect.right, screen.get_height()),
+                            pygame.Rect(0, board_rect.bottom, screen.get_width(), screen.get_height() - board_rect.bottom)]
+            for rect in chrome_rects:
+                screen.fill((0, 0, 0), rect)
+            dirty_rects += chrome_rects
+            screen.blit(bottom_bar.get(), (0, bottom_bar_top)) # Buttons und Slider-Beschriftungen in einem Stück
             zoom_Slider.draw(screen) # zoom slider auf den Screen
             velocity_Slider.draw(screen) # Geschwindigkeitsslider auf den Screen
+            timeline_Slider.draw(screen) # Zeitleiste auf den Screen
 
-            stat_label_1 = myfont.render(f'Cells alive: {game.grid.stats[0]}', 1, (255,255,0)) # stat labels Initialisierung
-            stat_label_2 = myfont.render(f'Cells dead: {game.grid.stats[1]}', 1, (255,255,0)) 
-            stat_button_caption = myfont.render(f'Stats', 1, (255,255,255)) # Stat button caption
-
-            legende_button_caption = myfont.render(f'Legende', 1, (255,255,255)) #Legende button caption
-
-            random_button_caption = myfont.render(f'Random', 1, (255,255,255)) # random button caption
-            zoom_slider_caption = myfont.render(f'Zoom:', 1, (255,255,255)) # zoom slider captino
-            velocity_Slider_caption = myfont.render(f'V:',1, (255,255,255)) # Geschwindigkeitsslider caption
-            velocity_Slider_value = myfont.render(f'{FPS}', 1, (255,255,255)) # Geschwinidigkeitsslider Wert Label
-            zoom_Slider_value = myfont.render(f'{cell_size}',1, (255,255,255)) # Geschwindigkeitsslider Wert Label
-
-            # Legende Attribute (alles Labels mit Position und antialias = 1 --> glattere Kanten)
-            increase_fps_caption = myfont.render(f'Erhöhe V: Key Up', 1, (255, 255, 255))
-            decrease_fps_caption = myfont.render(f'Vermindere V: Key Down', 1, (255, 255, 255))
-            glider_pattern_caption = myfont.render(f'Glider: Key 1', 1, (255, 255, 255))
-            blinker_pattern_caption = myfont.render(f'Blinker: Key 2', 1, (255, 255, 255))
-            toad_pattern_caption = myfont.render(f'Toad: Key 3', 1, (255, 255, 255))
-            rats_pattern_caption = myfont.render(f'Rats: Key 4', 1, (255, 255, 255))
-            acorn_pattern_caption = myfont.render(f'Acorn: Key 5', 1, (255, 255, 255))
-            gosper_glider_gun_caption = myfont.render(f'Gosper Glider Gun: Key 6', 1, (255, 255, 255))
-            queen_bee_shuttle_caption = myfont.render(f'Queen Bee Shuttle: Key 7', 1, (255, 255, 255))
-            pulsar_pattern_caption = myfont.render(f'Pulsar: Key 8', 1, (255, 255, 255))
-            diehard_pattern_caption = myfont.render(f'Diehard: Key 9', 1, (255, 255, 255))
-            pentomino_pattern_caption = myfont.render(f'Pentomino: Key a', 1, (255, 255, 255))
-            ants_pattern_caption = myfont.render(f'Ants: Key b', 1, (255, 255, 255))
-            reset_field_caption = myfont.render(f'Leeren: Key C', 1, (255, 255, 255))
-            apply_spell_0_caption = myfont.render(f'Lightning: Key L', 1, (255, 255, 255))
-            apply_spell_2_caption = myfont.render(f'Freeze: Key F', 1, (255, 255, 255))
-            apply_spell_1_caption = myfont.render(f'Earthquake: Key E', 1, (255, 255, 255))
-            apply_spell_3_caption = myfont.render(f'Unfreeze: Key U', 1, (255, 255, 255)) 
+            stat_label_1 = text_cache.render(f'Cells alive: {snapshot.stats[0]}', 1, (255,255,0)) # stat labels Initialisierung
+            stat_label_2 = text_cache.render(f'Cells dead: {snapshot.stats[1]}', 1, (255,255,0)) 
+            stat_label_3 = text_cache.render(f'Zyklus: {snapshot.cycle}', 1, (255,255,0))
+            stat_label_4 = text_cache.render(f'Gen/s: {simulation.generations_per_second:.0f}', 1, (255,255,0))
+            stat_label_5 = text_cache.render(f'Checkpoint: {checkpoint_status}', 1, (255,255,0))
+            velocity_Slider_value = text_cache.render(f'{simulation.rate:.0f}/s', 1, (255,255,255)) # Geschwinidigkeitsslider Wert Label (Ziel in Generationen/s)
+            zoom_Slider_value = text_cache.render(f'{cell_size}',1, (255,255,255)) # Geschwindigkeitsslider Wert Label
 
             # Wenn die Maus über den Stat Button geht
             if (stat_button.get_rect().collidepoint(pos) and stats_opened == False) or (stat_surface.get_rect().collidepoint(pos) and stats_opened == True):
@@ -538,64 +390,66 @@ class GUI:
                 screen.blit(stat_surface, (0, 0))
                 screen.blit(stat_label_1, stat_label_1_offset)
                 screen.blit(stat_label_2, stat_label_2_offset)
+                screen.blit(stat_label_3, stat_label_3_offset)
+                screen.blit(stat_label_4, stat_label_4_offset)
+                screen.blit(stat_label_5, stat_label_5_offset)
+                grid_renderer.invalidate(stat_surface.get_rect()) # im nächsten Frame das Grid darunter neu zeichnen
+                dirty_rects.append(stat_surface.get_rect())
             else: stats_opened = False
 
             if legende_button_rect.collidepoint(pos) and not legende_opened or legende_surface_rect.collidepoint(pos) and legende_opened == True:
                 legende_opened = True
-                pygame.draw.rect(screen, legende_surface_color, legende_surface_rect) # Das Rechteck der expandierten Legende auf den Screen bringen
-                # Legenden Labels auf den Screen bringen, solange die Legende expandiert ist
-                screen.blit(increase_fps_caption, (510, 20))
-                screen.blit(decrease_fps_caption, (510, 50))
-                screen.blit(glider_pattern_caption, (510, 80))
-                screen.blit(blinker_pattern_caption, (510, 110))
-                screen.blit(toad_pattern_caption, (510, 140))
-                screen.blit(rats_pattern_caption, (510, 170))
-                screen.blit(acorn_pattern_caption, (510, 200))
-                screen.blit(gosper_glider_gun_caption, (510, 230))
-                screen.blit(queen_bee_shuttle_caption, (510, 260))
-                screen.blit(pulsar_pattern_caption, (510, 290))
-                screen.blit(diehard_pattern_caption, (510, 320))
-                screen.blit(pentomino_pattern_caption, (510, 350))
-                screen.blit(ants_pattern_caption, (510, 380))
-                screen.blit(reset_field_caption, (510, 410))
-                screen.blit(apply_spell_0_caption, (510, 440))
-                screen.blit(apply_spell_2_caption, (510, 470))
-                screen.blit(apply_spell_1_caption, (510, 500))
-                screen.blit(apply_spell_3_caption, (510, 530))
+                # Die expandierte Legende (Rechteck und alle Labels) auf den Screen bringen, neu gebaut nur bei neuer Regel
+                screen.blit(legend_layer.get((str(snapshot.rule), spell_radius, brush_name)), legende_surface_rect)
+                grid_renderer.invalidate(legende_surface_rect)
+                dirty_rects.append(legende_surface_rect)
             else:
                 legende_opened = False
 
 
+            if grid_width * cell_size < screen.get_width(): # Musterliste nur, wenn rechts neben dem Feld Platz ist
+                screen.blit(pattern_list_layer.get((pattern_bindings, pattern_rotation, pattern_flip)), (grid_width * cell_size + 10, 10))
             
-            for i, (name, rle) in enumerate(RLE_PATTERNS.items()):
-                label = myfont.render(f"{i+1}: {name}", 1, (255, 255, 255))
-                screen.blit(label, (grid_width * cell_size + 10, 30 * i + 10))
-            
-            # Die variablen-unabhängigen Elemente auf den Screen bringen (Buttons, Captions, sliders, legende etc.)
-            screen.blit(red_button, red_button_offset) 
-            screen.blit(blue_button, blue_button_offset) 
-            screen.blit(green_button, green_button_offset)
-            screen.blit(stat_button, (0, 0))
-            screen.blit(stat_button_caption, (5,15))
-            screen.blit(random_button_caption, (blue_button_offset[0]+23, blue_button_offset[1]+12))
-            screen.blit(zoom_slider_caption, (zoom_Slider_pos[0]-65, zoom_Slider_pos[1]-10))
-            screen.blit(velocity_Slider_caption, (velocity_Slider_pos[0]-40, velocity_Slider_pos[1]-10))
+            # Die variablen Elemente auf den Screen bringen (Slider-Werte), Buttons mit fester Beschriftung
             screen.blit(velocity_Slider_value, (velocity_Slider_pos[0]+(velocity_Slider.width/2), velocity_Slider_pos[1]+20))
             screen.blit(zoom_Slider_value, (zoom_Slider_pos[0]+ (zoom_Slider.width/2), zoom_Slider_pos[1]+20))
-            pygame.draw.rect(screen, legende_button_color, legende_button_rect)
-            screen.blit(legende_button_caption, (805, 15))
+            screen.blit(stat_button, (0, 0))
+            screen.blit(legende_button, legende_button_rect)
+            dirty_rects += [stat_button.get_rect(), legende_button_rect] # liegen über dem Grid
 
 
-            label_count = myfont.render(f'Count: {count}', 1, (255,255,0)) # Label unten rechts (count)
+            label_count = text_cache.render(f'Count: {snapshot.steps}', 1, (255,255,0)) # Label unten rechts (count)
             screen.blit(label_count, label_count_offset) # Count Label auf den Screen bringen
 
-            label_fps = myfont.render(f'FPS: {FPS}', 1, (255,255,0)) # FPS Label unten rechts
+            label_fps = text_cache.render(f'FPS: {clock.get_fps():.0f}', 1, (255,255,0)) # FPS Label unten rechts (gemessen)
             screen.blit(label_fps, label_fps_offset) # FPS Label auf den Screen bringen
 
-            pygame.display.update() # den Screen aktualisieren, sodass alle Änderungen angezeigt werden
+            label_step = text_cache.render(f'Step {snapshot.step_ms:.1f}ms', 1, (255,255,0)) # Zeit für die letzte Generation
+            screen.blit(label_step, label_step_offset)
+            label_render = text_cache.render(f'Draw {render_ms:.1f}ms', 1, (255,255,0)) # Zeit für das letzte Zeichnen
+            screen.blit(label_render, label_render_offset)
+            label_generation = text_cache.render(f'Gen {snapshot.generation}', 1, (255,255,255) if scrub_frame is None else (255,255,0)) # angezeigte Generation (gelb beim Zurückspulen)
+            screen.blit(label_generation, label_generation_offset)
+
+            if profiler.enabled: # Overlay mit p50/p99 jeder Phase
+                profile_lines = profiler.lines()
+                profile_rect = pygame.Rect(profile_surface_offset, (330, 25 * len(profile_lines) + 10))
+                pygame.draw.rect(screen, profile_surface_color, profile_rect)
+                for i, line in enumerate(profile_lines):
+                    screen.blit(text_cache.render(line, 1, (0, 255, 0)), (profile_rect.x + 10, profile_rect.y + 5 + 25 * i))
+                grid_renderer.invalidate(profile_rect)
+                dirty_rects.append(profile_rect)
+            profiler.lap("ui")
+
+            pygame.display.update(dirty_rects) # nur die geänderten Bereiche des Screens aktualisieren
+            render_ms = (time.perf_counter() - render_start) * 1000
+            profiler.lap("display")
             
-            clock.tick(FPS) # Pro Sekunde laufen FPS Frames ab
+            clock.tick(DISPLAY_FPS) # Pro Sekunde laufen DISPLAY_FPS Frames ab, egal wie schnell die Simulation ist
+            profiler.lap("tick") # Warten auf den nächsten Frame
+            profiler.end_frame()
 
+        simulation.stop()
         pygame.quit() # Programm stoppen, wenn es durch den Nutzer beendet wurde
 
 def main():
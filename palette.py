@@ -0,0 +1,64 @@
+from typing import Callable, Dict, Tuple
+
+import numpy as np
+
+MAX_AGE = 510  # ab diesem time_not_changed ändern sich die Standardfarben nicht mehr
+
+
+def age_color(alive: bool, freezed: bool, time_not_changed: int) -> Tuple[int, int, int]:
+    """Default colour of a cell depending on its state and how long it did not change."""
+    if alive: # Farbveränderung der lebendigen Zellen
+        if not freezed:
+            r = max(255 - 2*time_not_changed, 0) # kann nie unter 0 sein
+            g = min(time_not_changed, 255) # kann nie über 255 sein
+            b = max(255 - 0.5*time_not_changed, 0)
+        else:
+            r = max(255 - 2*time_not_changed, 0)*0.8
+            g = min(time_not_changed, 255)*0.9
+            b = max(255 - 0.5*time_not_changed, 0) + (255 - max(255 - 0.5*time_not_changed, 0))*0.2 # time_not changed ändert sich nicht, daher auch keine Änderung der Farben bei Freeze
+    else: # Farbverlauf der nicht lebendigen Zellen --> wird schwarz
+        if not freezed:
+            r = g = b = max(255 - time_not_changed, 0)
+        else:
+            r = max(255 - time_not_changed, 0)*0.8
+            g = max(255 - time_not_changed, 0)*0.9
+            b = max(255 - time_not_changed, 0) + (255 - max(255 - time_not_changed, 0))*0.2
+    return int(r), int(g), int(b) # Nachkommastellen abschneiden, wie pygame es beim Zeichnen macht
+
+
+def classic_color(alive: bool, freezed: bool, time_not_changed: int) -> Tuple[int, int, int]:
+    """Two colours only: green alive cells on black."""
+    return (0, 255, 0) if alive else (0, 0, 0)
+
+
+# Vorberechnete Farbtabelle
+class Palette:
+    """Colour lookup table indexed by (state, freezed, clamped time_not_changed).
+
+    ``apply`` turns whole state/freeze/age arrays into an RGB array with one
+    gather, so the colour formula is never evaluated per cell per frame.
+    """
+
+    def __init__(self, colors: np.ndarray) -> None:
+        self.colors = np.asarray(colors, dtype=np.uint8)  # Form (2, 2, max_age + 1, 3)
+        self.max_age = self.colors.shape[2] - 1
+        self._flat = self.colors.reshape(-1, 3)
+
+    @classmethod
+    def from_function(cls, color: Callable[[bool, bool, int], Tuple[int, int, int]], max_age: int = MAX_AGE) -> 'Palette':
+        """Build the table by evaluating ``color`` once for every entry."""
+        colors = np.array([[[color(bool(alive), bool(freezed), age) for age in range(max_age + 1)]
+                            for freezed in (0, 1)] for alive in (0, 1)], dtype=np.uint8)
+        return cls(colors)
+
+    def apply(self, state: np.ndarray, freezed: np.ndarray, time_not_changed: np.ndarray) -> np.ndarray:
+        """RGB colours for arrays of states, freeze flags and ages (states other than 1 are drawn as dead)."""
+        index = ((state == 1).astype(np.intp) * 2 + freezed) * (self.max_age + 1) + np.minimum(time_not_changed, self.max_age)
+        return self._flat[index]
+
+
+PALETTES: Dict[str, Palette] = {
+    "age": Palette.from_function(age_color),
+    "classic": Palette.from_function(classic_color, max_age=0),
+}
+DEFAULT_PALETTE = PALETTES["age"]
@@ -0,0 +1,201 @@
+import hashlib
+import json
+import os
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+import rle as rle_codec
+from pattern_store import CACHE_PATH
+from rules import LIFE, count_alive_neighbors, parse_rule
+
+INDEX_PATH = os.path.join(os.path.dirname(CACHE_PATH), "patterns_index.npz")
+MAX_PERIOD = 64  # so viele Generationen wird nach einer Wiederholung gesucht
+# Tasten für Muster, in dieser Reihenfolge vergeben (ohne die Tasten der Zauber, Regeln, Farben usw.)
+PATTERN_KEYS = "123456789abdghijknoqsvwxyz0"
+
+
+def pattern_digest(code: str) -> str:
+    """Content hash of an RLE string (the index reuses entries with the same hash)."""
+    return hashlib.sha1(code.encode()).hexdigest()
+
+
+def crop(bitmap: np.ndarray) -> Tuple[np.ndarray, Tuple[int, int, int, int]]:
+    """Bitmap cut to its non-dead cells and the bounding box (x0, y0, x1, y1) in the original."""
+    xs, ys = np.nonzero(bitmap)
+    if not len(xs):
+        return bitmap[:0, :0], (0, 0, 0, 0)
+    x0, x1, y0, y1 = int(xs.min()), int(xs.max()) + 1, int(ys.min()), int(ys.max()) + 1
+    return bitmap[x0:x1, y0:y1], (x0, y0, x1, y1)
+
+
+def step_unbounded(bitmap: np.ndarray, rule=LIFE) -> np.ndarray:
+    """Next generation of a bitmap on the unbounded plane, cropped to its live cells."""
+    grown = np.pad(bitmap, 1)  # um eine Zelle pro Seite wachsen lassen
+    neighbors = count_alive_neighbors(np.pad(rule.alive_cells(grown), 1))
+    return crop(rule.next_state(grown, neighbors))[0]
+
+
+def detect_period(bitmap: np.ndarray, rule=LIFE, max_generations: int = MAX_PERIOD) -> Optional[int]:
+    """Period of an oscillator or spaceship: generations until it has its initial shape again.
+
+    Steps the cropped bitmap on the unbounded plane and compares shapes up
+    to translation, so a glider has period 4 and a still life period 1.
+    Returns None if the shape does not come back within
+    ``max_generations`` (guns, methuselahs, patterns that die out).
+    """
+    start, _ = crop(bitmap)
+    state = start
+    for generation in range(1, max_generations + 1):
+        state = step_unbounded(state, rule)
+        if not state.size:
+            return None
+        if state.shape == start.shape and np.array_equal(state, start):
+            return generation
+    return None
+
+
+# Ein vorab dekodiertes Muster: Bitmap, Größe, Population, Regel, Periode
+class PatternEntry:
+    """A decoded pattern, ready to stamp.
+
+    ``bitmap`` holds the cell states indexed [x, y] like the grids (the
+    first RLE index is x, as in ``apply_rle_pattern``), cut to the
+    bounding box ``bbox`` (x0, y0, x1, y1) of the decoded RLE.
+    ``oriented`` returns rotated/reflected copies, each computed once.
+    """
+
+    __slots__ = ("name", "digest", "bitmap", "bbox", "population", "rule", "period", "_oriented")
+
+    def __init__(self, name: str, digest: str, bitmap: np.ndarray, bbox: Tuple[int, int, int, int],
+                 population: int, rule: Optional[str], period: Optional[int]) -> None:
+        self.name = name
+        self.digest = digest
+        self.bitmap = bitmap
+        self.bitmap.setflags(write=False)  # wird zwischen GUI und Simulations-Thread geteilt
+        self.bbox = bbox
+        self.population = population
+        self.rule = rule  # aus dem RLE-Header, None = die aktuelle Regel bleibt
+        self.period = period  # None: keine Wiederholung innerhalb von MAX_PERIOD Generationen
+        self._oriented = {(0, False): self.bitmap}
+
+    @classmethod
+    def from_rle(cls, name: str, code: str, max_period: int = MAX_PERIOD) -> "PatternEntry":
+        header, decoded = rle_codec.decode(code)
+        rule = header.get("rule") or None
+        bitmap, bbox = crop(decoded)
+        period = detect_period(bitmap, parse_rule(rule) if rule else LIFE, max_period) if max_period else None
+        return cls(name, pattern_digest(code), np.ascontiguousarray(bitmap, dtype=np.uint8), bbox,
+                   int(np.count_nonzero(bitmap == 1)), rule, period)
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        return self.bitmap.shape
+
+    def oriented(self, rotation: int = 0, flip: bool = False) -> np.ndarray:
+        """Bitmap turned by ``rotation`` quarter turns, mirrored in x first if ``flip`` (read-only, cached)."""
+        key = (rotation % 4, bool(flip))
+        if key not in self._oriented:
+            bitmap = self.bitmap[::-1] if flip else self.bitmap
+            oriented = np.ascontiguousarray(np.rot90(bitmap, key[0]))
+            oriented.setflags(write=False)
+            self._oriented[key] = oriented
+        return self._oriented[key]
+
+    def describe(self) -> str:
+        """Short label for lists, e.g. "glider 3x3 p4"."""
+        width, height = self.size
+        period = f" p{self.period}" if self.period else ""
+        return f"{self.name} {width}x{height}{period}"
+
+
+# Index aller Muster des PatternStores, einmal pro Version aufgebaut und neben dem Cache gespeichert
+class PatternIndex:
+    """Pre-parsed patterns, keyed by name and by content hash.
+
+    ``update(patterns, version)`` rebuilds the index for a new
+    ``PatternStore.version``; entries whose RLE did not change (same
+    content hash, even under another name) are reused, only new patterns
+    are decoded. The index is saved to ``path`` and read back on start, so
+    an unchanged store costs no RLE parsing at all. ``keys`` maps the
+    ``PATTERN_KEYS`` characters to pattern names in store order.
+    """
+
+    def __init__(self, path: str = INDEX_PATH, max_period: int = MAX_PERIOD) -> None:
+        self.path = path
+        self.max_period = max_period
+        self.version = None
+        self.entries: Dict[str, PatternEntry] = {}
+        self.last_error = None
+        self._read()
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[PatternEntry]:
+        return iter(self.entries.values())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __getitem__(self, name: str) -> PatternEntry:
+        return self.entries[name]
+
+    @property
+    def keys(self) -> Dict[str, str]:
+        """Key character -> pattern name, for the first ``len(PATTERN_KEYS)`` patterns."""
+        return dict(zip(PATTERN_KEYS, self.entries))
+
+    def update(self, patterns: Dict[str, str], version: str) -> bool:
+        """Bring the index to ``version`` of the pattern dict; returns True if it changed."""
+        if version == self.version:
+            return False
+        by_digest = {entry.digest: entry for entry in self.entries.values()}
+        entries = {}
+        for name, code in patterns.items():
+            entry = by_digest.get(pattern_digest(code))
+            if entry is None:
+                try:
+                    entry = PatternEntry.from_rle(name, code, self.max_period)
+                except ValueError as error:  # kaputtes Muster in der Tabelle: weglassen statt abstürzen
+                    self.last_error = error
+                    continue
+            elif entry.name != name:
+                entry = PatternEntry(name, entry.digest, entry.bitmap, entry.bbox, entry.population, entry.rule,
+                                     entry.period)
+            entries[name] = entry
+        self.entries, self.version = entries, version
+        try:
+            self._write()
+        except OSError as error:
+            self.last_error = error
+        return True
+
+    def _read(self):
+        try:
+            with np.load(self.path) as data:
+                meta = json.loads(str(data["meta"]))
+                bitmaps = data["bitmaps"]
+        except (OSError, ValueError, KeyError):
+            return
+        entries, offset = {}, 0
+        for item in meta["entries"]:
+            width, height = item["size"]
+            bitmap = bitmaps[offset:offset + width * height].reshape(width, height).copy()
+            offset += width * height
+            entries[item["name"]] = PatternEntry(item["name"], item["digest"], bitmap, tuple(item["bbox"]),
+                                                 item["population"], item["rule"], item["period"])
+        self.entries, self.version = entries, meta["version"]
+
+    def _write(self):
+        meta = {"version": self.version, "entries": [
+            {"name": entry.name, "digest": entry.digest, "size": list(entry.size), "bbox": list(entry.bbox),
+             "population": entry.population, "rule": entry.rule, "period": entry.period}
+            for entry in self.entries.values()]}
+        bitmaps: List[np.ndarray] = [entry.bitmap.reshape(-1) for entry in self.entries.values()]
+        # erst in eine temporäre Datei schreiben, damit der Index nie halb geschrieben ist
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as file:
+            np.savez(file, meta=np.array(json.dumps(meta)),
+                     bitmaps=np.concatenate(bitmaps) if bitmaps else np.zeros(0, dtype=np.uint8))
+        os.replace(tmp_path, self.path)
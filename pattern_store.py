@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import Callable, Dict
+
+from pattern_library import patterns as bundled_patterns
+
+CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "patterns_cache.json")
+
+
+def remote_fetch() -> Dict[str, str]:
+    """Fetch all patterns from Supabase (imported lazily, so offline starts don't fail)."""
+    from supabasePatterns import getPatterns
+    return getPatterns()
+
+
+def remote_add(pattern: dict):
+    from supabasePatterns import addPattern
+    addPattern(pattern)
+
+
+def remote_delete(name: str):
+    from supabasePatterns import deletePattern
+    deletePattern(name)
+
+
+def patterns_version(patterns: Dict[str, str]) -> str:
+    """Content hash of a pattern dict, changes whenever a name or code changes."""
+    return hashlib.sha1(json.dumps(patterns, sort_keys=True).encode()).hexdigest()
+
+
+# Lokaler Pattern-Speicher: sofort aus dem Cache, Aktualisierung im Hintergrund
+class PatternStore:
+    """Serves patterns from an on-disk JSON cache and refreshes them in the background.
+
+    ``patterns`` is available immediately: the bundled ``pattern_library``
+    patterns merged with the last cached copy of the remote table. ``refresh``
+    (or ``refresh_async`` in a thread) pulls the remote table, swaps in the
+    new dict and rewrites the cache. ``fetch``/``add``/``delete`` default to
+    the Supabase functions and can be replaced by a stub client for testing.
+    """
+
+    def __init__(self, cache_path: str = CACHE_PATH, fetch: Callable[[], Dict[str, str]] = remote_fetch,
+                 add: Callable[[dict], None] = remote_add, delete: Callable[[str], None] = remote_delete) -> None:
+        self.cache_path = cache_path
+        self.fetch = fetch
+        self.add = add
+        self.delete = delete
+        self.updated_at = None  # Zeitpunkt des letzten erfolgreichen Abrufs (aus dem Cache)
+        self.last_error = None
+        self._lock = threading.Lock()
+        self._thread = None
+        self._remote = self._read_cache()
+        self.patterns = self._merge(self._remote)
+        self.version = patterns_version(self.patterns)
+
+    def _read_cache(self) -> Dict[str, str]:
+        try:
+            with open(self.cache_path) as file:
+                cache = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        self.updated_at = cache.get("updated_at")
+        return cache.get("patterns", {})
+
+    def _write_cache(self, remote: Dict[str, str]):
+        # erst in eine temporäre Datei schreiben, damit der Cache nie halb geschrieben ist
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w") as file:
+            json.dump({"updated_at": self.updated_at, "version": patterns_version(remote), "patterns": remote}, file)
+        os.replace(tmp_path, self.cache_path)
+
+    @staticmethod
+    def _merge(remote: Dict[str, str]) -> Dict[str, str]:
+        merged = dict(bundled_patterns)
+        merged.update(remote)
+        return merged
+
+    def _publish(self, remote: Dict[str, str]):
+        """Swaps in a new pattern dict (readers never see a half-updated dict)."""
+        self._remote = remote
+        self.patterns = self._merge(remote)
+        self.version = patterns_version(self.patterns)
+
+    def refresh(self) -> bool:
+        """Fetch the remote patterns; returns True if they changed."""
+        try:
+            remote = dict(self.fetch())
+        except Exception as error:  # offline, Supabase nicht installiert, ...
+            self.last_error = error
+            return False
+        with self._lock:
+            self.last_error = None
+            self.updated_at = time.time()
+            changed = patterns_version(remote) != patterns_version(self._remote)
+            if changed:
+                self._publish(remote)
+            try:
+                self._write_cache(remote)
+            except OSError as error:
+                self.last_error = error
+        return changed
+
+    def refresh_async(self) -> threading.Thread:
+        """Start ``refresh`` in a daemon thread (at most one at a time)."""
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.refresh, daemon=True)
+            self._thread.start()
+        return self._thread
+
+    def add_pattern(self, name: str, code: str):
+        """Add a pattern remotely and to the cache."""
+        if self.add is not None:
+            self.add({"Name": name, "Code": code})
+        with self._lock:
+            remote = dict(self._remote)
+            remote[name] = code
+            self._publish(remote)
+            self._write_cache(remote)
+
+    def delete_pattern(self, name: str):
+        """Delete a pattern remotely and from the cache."""
+        if self.delete is not None:
+            self.delete(name)
+        with self._lock:
+            remote = dict(self._remote)
+            remote.pop(name, None)
+            self._publish(remote)
+            self._write_cache(remote)
+
+    def invalidate(self):
+        """Forget the cached remote patterns (bundled patterns stay) and refetch."""
+        with self._lock:
+            self.updated_at = None
+            self._publish({})
+            try:
+                os.remove(self.cache_path)
+            except OSError:
+                pass
+        return self.refresh_async()
@@ -0,0 +1,116 @@
+import cProfile
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+
+# Zeitmessung pro Phase eines Frames (Events, Schritt, Zeichnen, ...) für das Overlay
+class FrameProfiler:
+    """Named per-frame phase timers with rolling p50/p99, plus an optional cProfile capture.
+
+    Call ``lap(name)`` at the end of each phase of the loop: the time since
+    the previous lap (or since the start of the frame) is added to ``name``.
+    ``end_frame()`` closes the frame. The last ``window`` frames are kept per
+    phase (in ms) together with the total frame time. While ``enabled`` is
+    False, ``lap`` returns after one attribute check and nothing is recorded,
+    so the instrumentation costs next to nothing.
+
+    ``start_capture(frames, path)`` runs cProfile over the next ``frames``
+    frames (independently of ``enabled``) and writes the stats to ``path``
+    (readable with ``pstats`` or snakeviz).
+    """
+
+    def __init__(self, window: int = 240) -> None:
+        self.window = window
+        self.enabled = False
+        self._samples: Dict[str, np.ndarray] = {}  # Phase -> Ringpuffer (ms)
+        self._frame: Dict[str, float] = {}  # Sekunden je Phase im laufenden Frame
+        self._frames = 0
+        self._frame_start = None
+        self._mark = None  # Ende der letzten Phase
+        self._lines = None
+        self._lines_frame = 0
+        self._capture: Optional[cProfile.Profile] = None
+        self._capture_left = 0
+        self.capture_path = None
+
+    def lap(self, name: str):
+        """Add the time since the previous lap (or the start of the frame) to the phase ``name``."""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._mark is not None:
+            self._frame[name] = self._frame.get(name, 0.0) + now - self._mark
+        self._mark = now
+
+    def toggle(self):
+        self.enabled = not self.enabled
+        self.reset()
+
+    def reset(self):
+        self._samples.clear()
+        self._frame.clear()
+        self._frames = 0
+        self._frame_start = None
+        self._mark = None
+        self._lines = None
+
+    def end_frame(self):
+        """Close the current frame: store its phase times and advance a running capture."""
+        if self._capture is not None:
+            self._capture_left -= 1
+            if self._capture_left <= 0:
+                self._capture.disable()
+                self._capture.dump_stats(self.capture_path)
+                self._capture = None
+        if not self.enabled:
+            return
+
+        now = time.perf_counter()
+        self.lap("other")  # Rest seit der letzten Phase
+        if self._frame_start is not None:  # der erste Frame nach dem Einschalten ist unvollständig
+            self._frame["frame"] = now - self._frame_start
+            index = self._frames % self.window
+            for name in list(self._samples) + [name for name in self._frame if name not in self._samples]:
+                samples = self._samples.get(name)
+                if samples is None:
+                    samples = self._samples[name] = np.zeros(self.window)
+                samples[index] = self._frame.get(name, 0.0) * 1000
+            self._frames += 1
+        self._frame.clear()
+        self._frame_start = self._mark = now
+
+    def percentiles(self) -> Dict[str, Tuple[float, float]]:
+        """p50 and p99 in ms of every phase over the recorded frames."""
+        count = min(self._frames, self.window)
+        if not count:
+            return {}
+        p50, p99 = np.percentile(np.stack(list(self._samples.values()))[:, :count], [50, 99], axis=1).tolist()
+        return dict(zip(self._samples, zip(p50, p99)))
+
+    def lines(self, every: int = 15) -> List[str]:
+        """Text lines for an overlay: one per phase, the whole frame last.
+
+        The percentiles are only recomputed every ``every`` frames.
+        """
+        if self._lines is None or self._frames - self._lines_frame >= every or self._frames < self._lines_frame:
+            stats = self.percentiles()
+            names = sorted(stats, key=lambda name: name == "frame")
+            self._lines = ["Phase        p50    p99 ms"] + [f"{name:<10}{stats[name][0]:7.2f}{stats[name][1]:7.2f}"
+                                                         for name in names]
+            self._lines_frame = self._frames
+        return self._lines
+
+    @property
+    def capturing(self) -> bool:
+        return self._capture is not None
+
+    def start_capture(self, frames: int, path: str):
+        """Profile the next ``frames`` frames with cProfile and write the stats to ``path``."""
+        if self._capture is not None:
+            return
+        self.capture_path = path
+        self._capture_left = frames
+        self._capture = cProfile.Profile()
+        self._capture.enable()
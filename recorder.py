@@ -0,0 +1,322 @@
+import os
+import queue
+import threading
+import zlib
+from bisect import bisect_right
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+_LEVEL = 1  # zlib: schnell, die Deltas sind meist fast nur Nullen
+
+# Keyframe oder Delta: komprimiert (bytes) oder noch unkomprimiert, solange der Kompressor-Thread nicht dran war
+Blob = Union[bytes, np.ndarray]
+
+
+def compress(blob: Blob) -> bytes:
+    return zlib.compress(blob.tobytes(), _LEVEL) if isinstance(blob, np.ndarray) else blob
+
+
+def expand(blob: Blob) -> np.ndarray:
+    """Raw uint8 content of a keyframe or delta."""
+    if isinstance(blob, np.ndarray):
+        return blob
+    return np.frombuffer(zlib.decompress(blob), dtype=np.uint8)
+
+
+# Keyframe und die folgenden Deltas (geänderte Zellen) einer Aufnahme
+class Segment:
+    __slots__ = ("first", "shape", "packed", "keyframe", "generations", "deltas", "nbytes")
+
+    def __init__(self, first: int, shape: Tuple[int, int], packed: bool, keyframe: Blob, generations: List[int],
+                 deltas: List[Blob]) -> None:
+        self.first = first  # Nummer des Keyframes in der Aufnahme
+        self.shape = shape
+        self.packed = packed  # nur Zustände 0/1: ein Bit pro Zelle, sonst ein Byte
+        self.keyframe = keyframe  # kodierter Frame (siehe encode_frame)
+        self.generations = generations  # Generation jedes Frames
+        self.deltas = deltas  # XOR zum Vorgänger für die Frames first + 1, ...; b"" = unverändert
+        self.nbytes = len(keyframe) + sum(map(len, deltas))
+
+    @property
+    def last(self) -> int:
+        return self.first + len(self.generations) - 1
+
+    def frame_at(self, frame: int) -> np.ndarray:
+        """Encoded frame: the keyframe XOR the deltas up to ``frame``."""
+        encoded = expand(self.keyframe).copy()
+        for delta in self.deltas[:frame - self.first]:
+            apply_delta(encoded, delta)
+        return encoded
+
+    def decode(self, encoded: np.ndarray) -> np.ndarray:
+        """Board (uint8, indexed [x, y]) of an encoded frame."""
+        size = self.shape[0] * self.shape[1]
+        state = np.unpackbits(encoded, count=size) if self.packed else encoded.copy()
+        return state.reshape(self.shape)
+
+    def save(self, path: str):
+        blobs = [np.frombuffer(compress(delta), dtype=np.uint8) for delta in self.deltas]
+        offsets = np.cumsum([0] + [len(blob) for blob in blobs])
+        with open(path, "wb") as file:
+            np.savez(file, first=self.first, shape=np.array(self.shape), packed=self.packed,
+                     keyframe=np.frombuffer(compress(self.keyframe), np.uint8),
+                     generations=np.array(self.generations, dtype=np.int64), offsets=offsets,
+                     blobs=np.concatenate(blobs) if blobs else np.zeros(0, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, path: str) -> "Segment":
+        with np.load(path) as data:
+            blobs, offsets = data["blobs"].tobytes(), data["offsets"]
+            deltas = [blobs[offsets[i]:offsets[i + 1]] for i in range(len(offsets) - 1)]
+            return cls(int(data["first"]), tuple(int(n) for n in data["shape"]), bool(data["packed"]),
+                       data["keyframe"].tobytes(), data["generations"].tolist(), deltas)
+
+
+def encode_frame(state: np.ndarray, packed: bool) -> np.ndarray:
+    """Flat uint8 encoding of a board: packed to one bit per cell for 0/1 boards."""
+    flat = np.ascontiguousarray(state, dtype=np.uint8).reshape(-1)
+    return np.packbits(flat) if packed else flat.copy()
+
+
+def encode_delta(previous: np.ndarray, encoded: np.ndarray) -> Blob:
+    """XOR of two encoded frames, i.e. the flipped cells (b"" if nothing changed)."""
+    delta = previous ^ encoded
+    return delta if delta.any() else b""
+
+
+def apply_delta(encoded: np.ndarray, delta: Blob):
+    """Apply an ``encode_delta`` result to an encoded frame in place."""
+    if len(delta):
+        encoded ^= expand(delta)
+
+
+# Aufnahme aller Generationen als Keyframes und Deltas, zum Zurückspulen und Abspielen
+class Recorder:
+    """Records the board of every generation as a delta against periodic keyframes.
+
+    Boards with only the states 0/1 are packed to one bit per cell first.
+    ``record(state, generation)`` stores the XOR with the previous frame,
+    i.e. the flipped cells; every ``keyframe_interval`` frames, and whenever
+    the board size or packing changes, a full keyframe starts a new
+    segment. ``seek(frame)`` therefore needs one keyframe and at most
+    ``keyframe_interval - 1`` deltas. Frames are numbered from 0 in
+    recording order; ``generation(frame)`` gives the grid generation.
+
+    The caller only pays for packing and one XOR: keyframes and deltas are
+    zlib-compressed by a background thread (zlib releases the GIL), mostly
+    zeros, so a quiet board costs a few bytes per generation. ``flush()``
+    waits for it. Segments stay in memory up to ``memory_budget`` bytes.
+    Older ones are written to ``directory`` (one file per segment) if
+    given, and dropped otherwise; on disk the oldest files are removed
+    beyond ``disk_budget`` bytes, so ``first`` moves forward.
+    ``Recorder.open`` reads such a directory back for replay. All methods
+    may be called from different threads.
+    """
+
+    def __init__(self, keyframe_interval: int = 32, memory_budget: int = 64 * 2 ** 20, directory: str = None,
+                 disk_budget: int = 512 * 2 ** 20) -> None:
+        if keyframe_interval < 1:
+            raise ValueError("keyframe_interval must be at least 1")
+        self.keyframe_interval = keyframe_interval
+        self.memory_budget = memory_budget
+        self.directory = directory
+        self.disk_budget = disk_budget
+        self._segments: List[Segment] = []  # im Speicher, aufsteigend
+        self._files: List[Tuple[int, int, str, int]] = []  # (first, last, Pfad, Bytes) auf der Platte, aufsteigend
+        self._loaded: Optional[Segment] = None  # zuletzt von der Platte gelesenes Segment
+        self._previous: Optional[np.ndarray] = None  # kodierter letzter Frame
+        self._lock = threading.RLock()
+        self._pending = queue.Queue()  # (Segment, Index) für den Kompressor, -1 = Keyframe
+        self._compressor: Optional[threading.Thread] = None
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def open(cls, directory: str) -> "Recorder":
+        """Read-only recorder over the segment files of ``directory`` (see ``save``)."""
+        recorder = cls(directory=directory, disk_budget=2 ** 63)
+        for name in sorted(os.listdir(directory)):
+            if name.startswith("segment-") and name.endswith(".npz"):
+                path = os.path.join(directory, name)
+                segment = Segment.load(path)
+                recorder._files.append((segment.first, segment.last, path, os.path.getsize(path)))
+        return recorder
+
+    def __len__(self) -> int:
+        last = self.last
+        return 0 if last is None else last - self.first + 1
+
+    @property
+    def first(self) -> Optional[int]:
+        with self._lock:
+            if self._files:
+                return self._files[0][0]
+            return self._segments[0].first if self._segments else None
+
+    @property
+    def last(self) -> Optional[int]:
+        with self._lock:
+            if self._segments:
+                return self._segments[-1].last
+            return self._files[-1][1] if self._files else None
+
+    @property
+    def memory_bytes(self) -> int:
+        return sum(segment.nbytes for segment in self._segments)
+
+    @property
+    def disk_bytes(self) -> int:
+        return sum(size for *_, size in self._files)
+
+    def record(self, state: np.ndarray, generation: int):
+        """Append the board ``state`` (indexed [x, y]) as the next frame."""
+        packed = int(state.max(initial=0)) <= 1
+        encoded = encode_frame(state, packed)
+        with self._lock:
+            segment = self._segments[-1] if self._segments else None
+            if (segment is None or segment.shape != state.shape or segment.packed != packed
+                    or len(segment.generations) >= self.keyframe_interval):
+                last = self.last
+                segment = Segment(0 if last is None else last + 1, state.shape, packed, encoded.copy(), [generation], [])
+                self._segments.append(segment)
+                self._compress_later(segment, -1)
+                self._trim_memory()
+            else:
+                delta = encode_delta(self._previous, encoded)
+                segment.deltas.append(delta)
+                segment.generations.append(generation)
+                segment.nbytes += len(delta)
+                if len(delta):
+                    self._compress_later(segment, len(segment.deltas) - 1)
+            self._previous = encoded
+
+    def _compress_later(self, segment: Segment, index: int):
+        if self._compressor is None:
+            self._compressor = threading.Thread(target=self._compress_pending, name="recorder", daemon=True)
+            self._compressor.start()
+        self._pending.put((segment, index))
+
+    def _compress_pending(self):
+        while True:
+            segment, index = self._pending.get()
+            try:
+                with self._lock:
+                    raw = segment.keyframe if index < 0 else segment.deltas[index] if index < len(segment.deltas) else None
+                if isinstance(raw, np.ndarray):
+                    blob = compress(raw)  # ohne Lock, zlib gibt den GIL frei
+                    with self._lock:  # nur ersetzen, wenn das Delta nicht inzwischen verworfen wurde
+                        if index < 0 and segment.keyframe is raw:
+                            segment.keyframe = blob
+                        elif 0 <= index < len(segment.deltas) and segment.deltas[index] is raw:
+                            segment.deltas[index] = blob
+                        else:
+                            continue
+                        segment.nbytes += len(blob) - len(raw)
+            finally:
+                self._pending.task_done()
+
+    def flush(self):
+        """Wait until everything recorded so far is compressed."""
+        if self._compressor is not None:
+            self._pending.join()
+
+    def _path(self, first: int) -> str:
+        return os.path.join(self.directory, f"segment-{first:012d}.npz")
+
+    def _remove_file(self, first: int):
+        if self.directory is not None and os.path.exists(self._path(first)):
+            os.remove(self._path(first))
+
+    def _trim_memory(self):
+        while len(self._segments) > 1 and self.memory_bytes > self.memory_budget:
+            segment = self._segments.pop(0)
+            if self.directory is None:
+                continue
+            path = self._path(segment.first)
+            segment.save(path)
+            self._files.append((segment.first, segment.last, path, os.path.getsize(path)))
+            while len(self._files) > 1 and self.disk_bytes > self.disk_budget:
+                os.remove(self._files.pop(0)[2])
+
+    def save(self):
+        """Write the segments still in memory to ``directory`` as well (for ``Recorder.open``)."""
+        if self.directory is None:
+            raise ValueError("the recorder has no directory")
+        with self._lock:
+            for segment in self._segments:
+                segment.save(self._path(segment.first))
+
+    def _segment(self, frame: int) -> Segment:
+        first, last = self.first, self.last
+        if first is None or not first <= frame <= last:
+            raise IndexError(f"frame {frame} is not recorded (frames {first}..{last})")
+        if self._segments and frame >= self._segments[0].first:
+            return self._segments[bisect_right([segment.first for segment in self._segments], frame) - 1]
+        first, _, path, _ = self._files[bisect_right([entry[0] for entry in self._files], frame) - 1]
+        if self._loaded is None or self._loaded.first != first:
+            self._loaded = Segment.load(path)
+        return self._loaded
+
+    def seek(self, frame: int) -> np.ndarray:
+        """Board of ``frame`` (one keyframe plus at most ``keyframe_interval - 1`` deltas)."""
+        with self._lock:
+            segment = self._segment(frame)
+            return segment.decode(segment.frame_at(frame))
+
+    def generation(self, frame: int) -> int:
+        with self._lock:
+            segment = self._segment(frame)
+            return segment.generations[frame - segment.first]
+
+    def frames(self, start: int = None, stop: int = None) -> Iterator[Tuple[int, int, np.ndarray]]:
+        """Replay: (frame, generation, state) for start <= frame < stop, one delta per step."""
+        start = self.first if start is None else start
+        stop = self.last + 1 if stop is None else stop
+        frame = start
+        while frame < stop:
+            with self._lock:
+                segment = self._segment(frame)
+                encoded = segment.frame_at(frame)
+                deltas = segment.deltas[frame - segment.first:]
+                generations = segment.generations[frame - segment.first:]
+            for i, generation in enumerate(generations):
+                if frame >= stop:
+                    return
+                if i:
+                    apply_delta(encoded, deltas[i - 1])
+                yield frame, generation, segment.decode(encoded)
+                frame += 1
+
+    def truncate(self, frame: int):
+        """Drop every frame after ``frame``; the next ``record`` continues from it."""
+        with self._lock:
+            segment = self._segment(frame)
+            encoded = segment.frame_at(frame)
+            while self._files and self._files[-1][0] > frame:
+                os.remove(self._files.pop()[2])
+            if self._files and self._files[-1][0] == segment.first:  # Segment von der Platte zurück in den Speicher
+                self._files.pop()
+                self._segments = []
+            for dropped in self._segments:
+                if dropped.first >= segment.first:
+                    self._remove_file(dropped.first)  # von save geschrieben
+            self._remove_file(segment.first)
+            self._segments = [kept for kept in self._segments if kept.first < segment.first] + [segment]
+            keep = frame - segment.first
+            del segment.generations[keep + 1:]
+            del segment.deltas[keep:]
+            segment.nbytes = len(segment.keyframe) + sum(map(len, segment.deltas))
+            self._loaded = None
+            self._previous = encoded
+
+    def clear(self):
+        with self._lock:
+            for *_, path, _ in self._files:
+                os.remove(path)
+            for segment in self._segments:
+                self._remove_file(segment.first)
+            self._files.clear()
+            self._segments.clear()
+            self._loaded = None
+            self._previous = None
@@ -0,0 +1,103 @@
+import numpy as np
+import pygame
+
+from engine import Grid
+from palette import DEFAULT_PALETTE, Palette
+from viewport import Viewport
+
+
+def grid_colors(grid, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+    """RGB colour of every cell (or of the region ``xs``/``ys``) as an array indexed [x, y]."""
+    if isinstance(grid, Grid):
+        cells = [row[ys] for row in grid.cells[xs]]
+        state = np.array([[cell.state.value for cell in row] for row in cells], dtype=np.uint8)
+        freezed = np.array([[cell.freezed for cell in row] for row in cells], dtype=bool)
+        ages = np.array([[cell.time_not_changed for cell in row] for row in cells], dtype=np.int64)
+        return palette.apply(state, freezed, ages)
+    return grid.get_colors(palette, xs, ys)
+
+
+def draw_grid(screen, grid, palette: Palette = DEFAULT_PALETTE, viewport: Viewport = None):
+    """Draw the grid of cells (or the part visible in ``viewport``) to the screen."""
+    if viewport is None:
+        grid.adjust_grid()
+        colors, cell_size = grid_colors(grid, palette), grid.cell_size
+    else:
+        colors, cell_size = grid_colors(grid, palette, *viewport.visible), viewport.cell_size
+    grid.get_stats()
+    pixels = np.repeat(np.repeat(colors, cell_size, axis=0), cell_size, axis=1)
+    screen.blit(pygame.surfarray.make_surface(pixels), (0, 0))
+
+
+# Zeichnet nur die Zellen neu, deren Farbe sich seit dem letzten Frame geändert hat
+class GridRenderer:
+    """Incremental renderer for the board.
+
+    Keeps the colour of every cell from the last frame and only repaints the
+    tiles (``tile_size`` x ``tile_size`` cells) that contain a changed cell.
+    Each dirty tile is blitted as a small one-pixel-per-cell surface scaled up
+    to the cell size. ``draw`` returns the dirty screen rects for
+    ``pygame.display.update(rects)``. The screen is expected to keep its
+    content between frames; anything drawn on top of the board has to be
+    passed to ``invalidate`` so it gets painted over next frame.
+    Assigning another ``palette`` takes effect on the next ``draw``. With a
+    ``viewport`` only the visible cells are read and compared; zooming or
+    panning repaints the whole board once.
+    """
+
+    def __init__(self, tile_size: int = 16, palette: Palette = DEFAULT_PALETTE) -> None:
+        self.tile_size = tile_size
+        self.palette = palette
+        self.colors = None  # Farben des letzten Frames
+        self.cell_size = None
+        self.origin = None  # linke obere sichtbare Zelle des letzten Frames
+        self.repainted_tiles = 0
+        self._invalid = []
+
+    def invalidate(self, rect=None):
+        """Force a repaint of the screen rect (or of the whole board)."""
+        if rect is None:
+            self.colors = None
+        else:
+            self._invalid.append(pygame.Rect(rect))
+
+    def draw(self, screen, grid, viewport: Viewport = None) -> list:
+        """Repaint the changed parts of the board and return the dirty rects."""
+        if viewport is None:
+            grid.adjust_grid()
+            colors, cell_size, origin = grid_colors(grid, self.palette), grid.cell_size, (0, 0)
+        else:
+            colors = grid_colors(grid, self.palette, *viewport.visible)
+            cell_size, origin = viewport.cell_size, (viewport.x0, viewport.y0)
+        grid.get_stats()
+
+        if (self.colors is None or self.colors.shape != colors.shape or self.cell_size != cell_size
+                or self.origin != origin):
+            changed = np.ones(colors.shape[:2], dtype=bool)
+        else:
+            changed = (colors != self.colors).any(axis=2)
+        for rect in self._invalid:
+            changed[max(rect.left // cell_size, 0):-(-rect.right // cell_size),
+                    max(rect.top // cell_size, 0):-(-rect.bottom // cell_size)] = True
+        self._invalid = []
+        self.colors = colors
+        self.cell_size = cell_size
+        self.origin = origin
+
+        # geänderte Zellen auf Tiles zusammenfassen
+        size = self.tile_size
+        width, height = changed.shape
+        tiles_x, tiles_y = -(-width // size), -(-height // size)
+        padded = np.zeros((tiles_x * size, tiles_y * size), dtype=bool)
+        padded[:width, :height] = changed
+        dirty_tiles = padded.reshape(tiles_x, size, tiles_y, size).any(axis=(1, 3))
+
+        rects = []
+        for tx, ty in np.argwhere(dirty_tiles):
+            x0, y0 = tx * size, ty * size
+            tile = colors[x0:x0 + size, y0:y0 + size]
+            rect = pygame.Rect(x0 * cell_size, y0 * cell_size, tile.shape[0] * cell_size, tile.shape[1] * cell_size)
+            screen.blit(pygame.transform.scale(pygame.surfarray.make_surface(tile), rect.size), rect)
+            rects.append(rect)
+        self.repainted_tiles = len(rects)
+        return rects
@@ -0,0 +1,293 @@
+"""Streaming RLE decoder and encoder.
+
+Patterns are stored as bitmaps indexed ``[row, column]`` (the same layout as
+``Grid.parse_rle``). Values are cell states: 0 = dead, 1 = alive and, for
+multi-state RLE (``.``, ``A``..``X``), 1..24; the two-character states
+``pA``..``yO`` of Golly's extended format give 25..255.
+"""
+import io
+import re
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+CHUNK_SIZE = 1 << 20  # Zeichen pro Block beim Einlesen
+
+_HEADER = re.compile(r"\s*(\w+)\s*=\s*([^,]+)")
+_WHITESPACE = str.maketrans("", "", " \t\r\n")
+_UNKNOWN = -3
+_PREFIX = -4
+_MAX_STATE = 255
+_TAG_LOOKUP = np.full(256, _UNKNOWN, dtype=np.int64)  # Zeichen -> Zustand, -1 = "$", -2 = "!"
+for _tag, _value in {"b": 0, ".": 0, "o": 1, "$": -1, "!": -2}.items():
+    _TAG_LOOKUP[ord(_tag)] = _value
+for _value in range(1, 25):
+    _TAG_LOOKUP[ord("A") + _value - 1] = _value
+_TAG_LOOKUP[ord("p"):ord("y") + 1] = _PREFIX  # p..y vor A..X: Zustand 24 * (1..10) + 1..24
+_PREFIXES = "pqrstuvwxy"
+_ROW_END = _MAX_STATE + 1  # Endmarke der Zeilen beim Kodieren
+
+
+def _open(source):
+    """Accept an RLE string or a text file object."""
+    return io.StringIO(source) if isinstance(source, str) else source
+
+
+def read_header(stream) -> Tuple[Dict[str, object], str]:
+    """Read comment and header lines.
+
+    Returns the header (``x``, ``y``, ``rule`` and ``name``/``comments`` from
+    ``#`` lines, if present) and the first line of the pattern body.
+    """
+    header = {"comments": []}
+    for line in stream:
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if stripped.startswith("#"):
+            if stripped[:2] == "#N":
+                header["name"] = stripped[2:].strip()
+            else:
+                header["comments"].append(stripped)
+            continue
+        if stripped.startswith("x") and "=" in stripped:
+            for key, value in _HEADER.findall(stripped):
+                value = value.strip()
+                header[key] = int(value) if key in ("x", "y") else value
+            continue
+        return header, line
+    return header, ""
+
+
+def _iter_chunks(stream, first: str):
+    """Yield whitespace-free text blocks that always end on a complete token."""
+    carry = first.translate(_WHITESPACE)
+    while True:
+        block = stream.read(CHUNK_SIZE)
+        text = carry + block.translate(_WHITESPACE)
+        if not block:
+            if text:
+                yield text
+            return
+        # unvollständige Zahl (und ein Präfix p..y ohne seinen Buchstaben) in den nächsten Block übernehmen
+        end = len(text)
+        while end and (text[end - 1].isdigit() or text[end - 1] in _PREFIXES):
+            end -= 1
+        carry = text[end:]
+        if end:
+            yield text[:end]
+
+
+def _tokenize(text: str) -> Tuple[np.ndarray, np.ndarray]:
+    """Split a whitespace-free block into run counts and tag values (vectorized).
+
+    Raises ValueError for non-ASCII characters, for a prefix ``p``..``y``
+    that is not followed by ``A``..``X`` and for states above 255.
+    """
+    try:
+        encoded = text.encode("ascii")
+    except UnicodeEncodeError as error:
+        raise ValueError(f"RLE body contains a non-ASCII character {text[error.start]!r}") from None
+    chars = np.frombuffer(encoded, dtype=np.uint8)
+    is_digit = (chars >= 48) & (chars <= 57)
+    positions = np.flatnonzero(~is_digit)
+    tags = _TAG_LOOKUP[chars[positions]]
+
+    # Zahl vor jedem Tag Ziffer für Ziffer von hinten aufbauen
+    counts = np.zeros(len(positions), dtype=np.int64)
+    has_digits = np.zeros(len(positions), dtype=bool)
+    valid = np.ones(len(positions), dtype=bool)
+    factor = 1
+    for back in range(1, 20):
+        previous = positions - back
+        valid &= previous >= 0
+        valid[valid] &= is_digit[previous[valid]]
+        if not valid.any():
+            break
+        counts[valid] += (chars[previous[valid]].astype(np.int64) - 48) * factor
+        has_digits |= valid
+        factor *= 10
+    counts[~has_digits] = 1
+
+    # zweistellige Zustände: der Buchstabe bekommt Präfix-Wert und Anzahl, das Präfix fällt weg
+    prefixes = np.flatnonzero(tags == _PREFIX)
+    if len(prefixes):
+        letters = prefixes + 1
+        paired = letters < len(positions)
+        paired[paired] &= positions[letters[paired]] == positions[prefixes[paired]] + 1
+        letter_chars = chars[positions[letters[paired]]]
+        paired[paired] &= (letter_chars >= ord("A")) & (letter_chars <= ord("X"))
+        if not paired.all():
+            raise ValueError(f"RLE prefix {chr(chars[positions[prefixes[~paired][0]]])!r} must be followed by A..X")
+        tags[letters] += 24 * (chars[positions[prefixes]].astype(np.int64) - ord("p") + 1)
+        if tags[letters].max() > _MAX_STATE:
+            raise ValueError(f"RLE state {int(tags[letters].max())} is out of range (at most {_MAX_STATE})")
+        counts[letters] = counts[prefixes]
+
+    known = (tags != _UNKNOWN) & (tags != _PREFIX)
+    return counts[known], tags[known]
+
+
+def iter_runs(source):
+    """Stream the RLE body as numpy arrays of runs.
+
+    Yields ``(header, None)`` once, then ``(rows, columns, lengths, values)``
+    per block for every non-dead run. Finally yields ``("end", height, width)``.
+    """
+    stream = _open(source)
+    header, first = read_header(stream)
+    yield header, None
+
+    row, column, width = 0, 0, 0
+    finished = False
+    for text in _iter_chunks(stream, first):
+        counts, tags = _tokenize(text)
+        if not len(tags):
+            continue
+
+        stop = np.flatnonzero(tags == -2)
+        if len(stop):
+            counts, tags = counts[:stop[0]], tags[:stop[0]]
+            finished = True
+
+        newline = tags == -1
+        row_steps = np.where(newline, counts, 0)
+        rows = row + np.cumsum(row_steps) - row_steps
+        column_steps = np.where(newline, 0, counts)
+        ends = np.cumsum(column_steps)
+        # Spalte zählt ab dem letzten "$" wieder von vorne
+        last_newline = np.maximum.accumulate(np.where(newline, np.arange(len(tags)), -1))
+        base = np.where(last_newline >= 0, ends[np.maximum(last_newline, 0)], -column)
+        starts = ends - column_steps - base
+
+        if len(tags):
+            width = max(width, int((starts + column_steps).max()))
+            row = int(rows[-1] + row_steps[-1])
+            column = int(starts[-1] + column_steps[-1]) if not newline[-1] else 0
+
+        alive = tags > 0
+        yield rows[alive], starts[alive], counts[alive], tags[alive]
+        if finished:
+            break
+    yield "end", row + 1, width
+
+
+def _fill(bitmap: np.ndarray, rows, starts, lengths, values):
+    """Write runs into ``bitmap`` (clipped to its bounds)."""
+    height, width = bitmap.shape
+    ends = np.minimum(starts + lengths, width)
+    starts = np.maximum(starts, 0)
+    keep = (rows >= 0) & (rows < height) & (ends > starts)
+    rows, starts, ends, values = rows[keep], starts[keep], ends[keep], values[keep]
+    lengths = ends - starts
+    total = int(lengths.sum())
+    if not total:
+        return
+    # flache Indizes aller Zellen der Läufe, ohne Python-Schleife pro Zelle
+    first = np.repeat(rows * width + starts, lengths)
+    inner = np.arange(total) - np.repeat(np.cumsum(lengths) - lengths, lengths)
+    bitmap.reshape(-1)[first + inner] = np.repeat(values, lengths)
+
+
+def decode(source) -> Tuple[Dict[str, object], np.ndarray]:
+    """Decode an RLE string or file into ``(header, bitmap)``.
+
+    If the header declares ``x``/``y`` the bitmap is allocated up front and
+    runs are written into it block by block; otherwise the runs are kept until
+    the size is known.
+    """
+    runs = iter_runs(source)
+    header, _ = next(runs)
+    bitmap = None
+    if "x" in header and "y" in header:
+        bitmap = np.zeros((header["y"], header["x"]), dtype=np.uint8)
+
+    pending: List[tuple] = []
+    for item in runs:
+        if isinstance(item[0], str):  # ("end", height, width)
+            _, height, width = item
+            break
+        if bitmap is not None:
+            _fill(bitmap, *item)
+        else:
+            pending.append(item)
+
+    if bitmap is None:
+        bitmap = np.zeros((height, max(width, 1)), dtype=np.uint8)
+        for item in pending:
+            _fill(bitmap, *item)
+    return header, bitmap
+
+
+def encode(bitmap: np.ndarray, rule: str = "B3/S23", name: str = None, line_width: int = 70) -> str:
+    """Encode a bitmap indexed ``[row, column]`` as RLE (with header)."""
+    bitmap = np.asarray(bitmap)
+    if bitmap.size and (bitmap.min() < 0 or bitmap.max() > _MAX_STATE):
+        raise ValueError(f"cell states must be between 0 and {_MAX_STATE}")
+    bitmap = bitmap.astype(np.uint8)
+    height, width = bitmap.shape
+    multi_state = bitmap.size and bitmap.max() > 1
+    if multi_state:
+        letters = [chr(ord("A") + i) for i in range(24)]
+        symbols = ["."] + [prefix + letter for prefix in [""] + list(_PREFIXES) for letter in letters][:_MAX_STATE]
+    else:
+        symbols = ["b", "o"]
+    symbols += [""] * (_ROW_END - len(symbols)) + ["$"]
+
+    # Jede Zeile bekommt eine Endmarke (_ROW_END, kein Zustand), dann werden alle Läufe auf einmal bestimmt
+    marked = np.empty((height, width + 1), dtype=np.uint16)
+    marked[:, :width] = bitmap
+    marked[:, width] = _ROW_END
+    flat = marked.reshape(-1)
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))[:flat.size]  # 0 Zeilen: keine Läufe
+    lengths = np.diff(np.concatenate((starts, [flat.size])))
+    values = flat[starts]
+
+    # tote Läufe am Zeilenende weglassen, Zeilenenden am Schluss ebenfalls
+    keep = ~((values == 0) & (np.concatenate((values[1:], [_ROW_END])) == _ROW_END))
+    values, lengths = values[keep], lengths[keep]
+    row_end = values == _ROW_END
+    filled = np.flatnonzero(~row_end)
+    if len(filled):
+        values, lengths = values[:filled[-1] + 1], lengths[:filled[-1] + 1]
+        row_end = row_end[:filled[-1] + 1]
+    else:
+        values, lengths, row_end = values[:0], lengths[:0], row_end[:0]
+
+    # aufeinanderfolgende Zeilenenden zu "n$" zusammenfassen
+    if len(values):
+        group_start = row_end & ~np.concatenate(([False], row_end[:-1]))
+        group_id = np.cumsum(group_start)
+        group_sizes = np.bincount(group_id[row_end], minlength=group_id[-1] + 1)
+        keep = ~row_end | group_start
+        lengths = np.where(row_end, group_sizes[group_id], lengths)[keep]
+        values = values[keep]
+
+    tokens = [symbols[value] if length == 1 else f"{length}{symbols[value]}"
+              for length, value in zip(lengths.tolist(), values.tolist())]
+    tokens.append("!")
+
+    lines = []
+    if name:
+        lines.append(f"#N {name}")
+    lines.append(f"x = {width}, y = {height}, rule = {rule}")
+    line = []
+    line_length = 0
+    for token in tokens:
+        if line_length + len(token) > line_width:
+            lines.append("".join(line))
+            line, line_length = [], 0
+        line.append(token)
+        line_length += len(token)
+    lines.append("".join(line))
+    return "\n".join(lines) + "\n"
+
+
+def encode_grid(grid, x0: int = 0, y0: int = 0, x1: int = None, y1: int = None, rule: str = None) -> str:
+    """Encode a grid (or the sub-rectangle [x0, x1) x [y0, y1)) as RLE.
+
+    Uses the same orientation as ``apply_rle_pattern``: RLE rows run along x.
+    The header gets the grid's rule unless ``rule`` is given.
+    """
+    state = grid.get_state_array()
+    return encode(state[x0:x1, y0:y1], rule=rule or str(getattr(grid, "rule", "B3/S23")))
@@ -0,0 +1,131 @@
+import re
+from typing import Dict, Iterable, Union
+
+import numpy as np
+
+# B/S-Schreibweise ("B3/S23", "B3S23", Generations "B2/S/C3" oder "B2/S/3")
+_BS_NOTATION = re.compile(r"^B(\d*)/?S(\d*)(?:/[CG]?(\d+))?$", re.IGNORECASE)
+# klassische S/B-Schreibweise ("23/3", Generations "345/2/4")
+_SB_NOTATION = re.compile(r"^(\d*)/(\d*)(?:/(\d+))?$")
+
+
+# Regel eines Life-ähnlichen Automaten, vorberechnet als Übergangstabelle
+class Rule:
+    """Life-like or Generations rule, compiled into a transition table.
+
+    ``table[state, n]`` is the next state of a cell in ``state`` with ``n``
+    live neighbours. Only state 1 counts as alive. With ``states`` > 2
+    (Generations) a live cell that does not survive starts dying and goes
+    through the states 2 .. states - 1 before it is dead (0) again.
+
+    Two-state rules are stepped with a few vectorized comparisons derived from
+    the table, so any B/S rule costs the same per cell as B3/S23. Generations
+    rules gather from the table.
+    """
+
+    def __init__(self, birth: Iterable[int], survival: Iterable[int], states: int = 2) -> None:
+        self.birth = frozenset(birth)
+        self.survival = frozenset(survival)
+        self.states = states
+        self.death_state = 2 if states > 2 else 0  # Zustand einer lebendigen Zelle, die nicht überlebt
+        if not self.birth | self.survival <= set(range(9)):
+            raise ValueError("neighbour counts must be between 0 and 8")
+        if not 2 <= states <= 256:
+            raise ValueError("a rule needs between 2 and 256 states")
+
+        self.table = np.zeros((states, 9), dtype=np.uint8)
+        for n in range(9):
+            self.table[0, n] = 1 if n in self.birth else 0
+            self.table[1, n] = 1 if n in self.survival else self.death_state
+        for state in range(2, states):
+            self.table[state, :] = (state + 1) % states  # sterbende Zellen zählen weiter bis 0
+        self._flat = self.table.reshape(-1)
+        # Jeder Zustand wird nur aus genau einem anderen erreicht: previous[s] ist der Zustand vor dem Wechsel nach s
+        self.previous = (np.arange(states) - 1) % states
+
+        # Bedingungen für den schnellen Zwei-Zustands-Schritt
+        self._always = sorted(self.birth & self.survival)
+        self._birth_only = sorted(self.birth - self.survival)
+        self._survival_only = sorted(self.survival - self.birth)
+
+    @property
+    def notation(self) -> str:
+        birth = "".join(map(str, sorted(self.birth)))
+        survival = "".join(map(str, sorted(self.survival)))
+        return f"B{birth}/S{survival}" + (f"/C{self.states}" if self.states > 2 else "")
+
+    def __repr__(self) -> str:
+        return f"Rule({self.notation!r})"
+
+    def __str__(self) -> str:
+        return self.notation
+
+    def __eq__(self, other) -> bool:
+        return (isinstance(other, Rule) and self.birth == other.birth and self.survival == other.survival
+                and self.states == other.states)
+
+    def __hash__(self) -> int:
+        return hash((self.birth, self.survival, self.states))
+
+    def alive_cells(self, state: np.ndarray) -> np.ndarray:
+        """0/1 array of the live cells (state 1), for counting neighbours."""
+        if self.states == 2:
+            return state
+        return (state == 1).view(np.uint8)
+
+    def next_state(self, state: np.ndarray, alive_neighbors: np.ndarray) -> np.ndarray:
+        """Next state of every cell (uint8, same shape)."""
+        if self.states > 2:
+            return self._flat.take(state.astype(np.intp) * 9 + alive_neighbors)
+
+        result = None
+        for counts, condition in ((self._always, None), (self._birth_only, False), (self._survival_only, True)):
+            if not counts:
+                continue
+            mask = alive_neighbors == counts[0]
+            for n in counts[1:]:
+                mask |= alive_neighbors == n
+            if condition is not None:
+                alive = state == 1
+                mask &= alive if condition else ~alive
+            result = mask if result is None else result | mask
+        if result is None:
+            return np.zeros(state.shape, dtype=np.uint8)
+        return result.view(np.uint8)
+
+
+def count_alive_neighbors(padded: np.ndarray) -> np.ndarray:
+    """Live neighbours of the interior of a padded 0/1 array (over the last two axes)."""
+    return (padded[..., :-2, :-2] + padded[..., :-2, 1:-1] + padded[..., :-2, 2:]
+            + padded[..., 1:-1, :-2] + padded[..., 1:-1, 2:]
+            + padded[..., 2:, :-2] + padded[..., 2:, 1:-1] + padded[..., 2:, 2:])
+
+
+RULES: Dict[str, str] = {
+    "life": "B3/S23",
+    "highlife": "B36/S23",
+    "daynight": "B3678/S34678",
+    "seeds": "B2/S",
+    "replicator": "B1357/S1357",
+    "brians_brain": "B2/S/C3",
+    "star_wars": "B2/S345/C4",
+}
+
+
+def parse_rule(rule: Union[str, Rule]) -> Rule:
+    """Parse B/S notation, S/B notation, Generations notation or a name from ``RULES``."""
+    if isinstance(rule, Rule):
+        return rule
+    text = RULES.get(rule.strip().lower(), rule).strip().replace(" ", "")
+    match = _BS_NOTATION.match(text)
+    if match:
+        birth, survival, states = match.groups()
+    else:
+        match = _SB_NOTATION.match(text)
+        if not match:
+            raise ValueError(f"unknown rule {rule!r}, expected e.g. 'B3/S23', '23/3' or 'B2/S/C3'")
+        survival, birth, states = match.groups()
+    return Rule(map(int, birth), map(int, survival), int(states) if states else 2)
+
+
+LIFE = parse_rule("B3/S23")
@@ -0,0 +1,222 @@
+import copy
+import queue
+import threading
+import time
+from typing import Callable, Optional
+
+import numpy as np
+
+from engine import GameOfLife
+from palette import DEFAULT_PALETTE, MAX_AGE, Palette
+from recorder import Recorder
+
+
+# Unveränderliche Kopie des Spielfelds einer Generation, die der Renderer wie ein Grid zeichnet
+class Snapshot:
+    """Read-only copy of the board at one moment, drawable like a grid.
+
+    Holds state, ages and freeze flags (read-only arrays indexed [x, y])
+    together with the stats, the rule and the cycle info of that moment.
+    ``GridRenderer.draw`` accepts a snapshot in place of a grid.
+    """
+
+    def __init__(self, game: GameOfLife, steps: int = 0, step_ms: float = 0.0) -> None:
+        grid = game.grid
+        self.state, self.time_not_changed, self.freezed = grid.get_cell_arrays()
+        for array in (self.state, self.time_not_changed, self.freezed):
+            array.setflags(write=False)
+        self.width, self.height = self.state.shape
+        self.cell_size = grid.cell_size
+        grid.get_stats()  # das Objekt-Grid zählt hier neu, die anderen führen laufende Zähler
+        self.stats = tuple(grid.stats)
+        self.rule = grid.rule
+        self.cycle = game.cycles.describe()
+        self.steps = steps  # Generationen seit dem letzten reset_steps der Simulation
+        self.step_ms = step_ms
+        self.generation = getattr(grid, "generation", steps)  # das Objekt-Grid zählt keine Generationen
+
+    def with_state(self, state: np.ndarray, generation: int) -> "Snapshot":
+        """Copy showing a recorded board: no ages (drawn as settled), nothing freezed, stats recounted."""
+        snapshot = copy.copy(self)
+        snapshot.state = state
+        snapshot.time_not_changed = np.full(state.shape, MAX_AGE, dtype=np.int64)
+        snapshot.freezed = np.zeros(state.shape, dtype=bool)
+        for array in (snapshot.state, snapshot.time_not_changed, snapshot.freezed):
+            array.setflags(write=False)
+        alive = int(np.count_nonzero(state == 1))
+        snapshot.stats = (alive, state.size - alive, 0, 0)
+        snapshot.generation = generation
+        return snapshot
+
+    def get_stats(self):
+        return self.stats
+
+    def get_colors(self, palette: Palette = DEFAULT_PALETTE, xs: slice = slice(None), ys: slice = slice(None)) -> np.ndarray:
+        return palette.apply(self.state[xs, ys], self.freezed[xs, ys], self.time_not_changed[xs, ys])
+
+    def adjust_grid(self):
+        """Nothing to do: a snapshot never changes."""
+
+
+# Erzeuger/Verbraucher: die Simulation läuft in einem eigenen Thread, die GUI zeichnet nur den neuesten Stand
+class Simulation:
+    """Runs a GameOfLife in a background thread, decoupled from the frame rate.
+
+    While ``running`` is True the thread steps the game at ``rate``
+    generations/s (None or 0: as fast as it can) and publishes a
+    ``Snapshot``. The GUI takes the newest one with ``latest()`` at its own
+    frame rate and never sees the generations in between. A new snapshot is
+    only copied once the previous one was taken, so at 1000 generations/s
+    and 60 FPS the board is copied about 60 times per second. Snapshots are
+    never written after publishing, so drawing one needs no lock.
+
+    The game must not be touched by other threads while the simulation
+    runs: edits (cell clicks, spells, patterns, rule changes) go through
+    ``submit`` and are applied in order between two generations. When a
+    step completes a cycle or empties the board, ``running`` goes back to
+    False (auto-pause). An exception raised by a step or a command stops
+    the thread and is raised again by the next ``latest()``.
+
+    With a ``recorder`` every generation is recorded by the thread (edits
+    end up in the delta of the next generation); ``rewind`` goes back to a
+    recorded frame.
+    """
+
+    def __init__(self, game: GameOfLife, rate: Optional[float] = 60.0, recorder: Recorder = None) -> None:
+        self.game = game
+        self.rate = rate
+        self.recorder = recorder
+        self.steps = 0
+        self.step_ms = 0.0
+        self.generations_per_second = 0.0  # gemessen, nicht das Ziel
+        self._running = False
+        self._commands = queue.SimpleQueue()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._snapshot = Snapshot(game)
+        self._taken = False
+        self._error: Optional[BaseException] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @running.setter
+    def running(self, running: bool):
+        self._running = running
+        self._wake.set()
+
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="simulation", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 2.0):
+        """Stop the thread after the current generation; queued commands are dropped."""
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._wake.set()
+        self._thread.join(timeout)
+        self._thread = None
+
+    def submit(self, command: Callable[[], object]):
+        """Queue ``command()`` to run in the simulation thread before the next generation."""
+        self._commands.put(command)
+        self._wake.set()
+
+    def rewind(self, frame: int):
+        """Restore the board of a recorded ``frame`` and drop the later frames; submit it like an edit.
+
+        Only the states are recorded: afterwards all cells are new, and
+        dying cells of Generations rules come back as alive.
+        """
+        grid = self.game.grid
+        grid.set_state_array(self.recorder.seek(frame))
+        if hasattr(grid, "generation"):
+            grid.generation = self.recorder.generation(frame)
+        self.recorder.truncate(frame)
+
+    def _record(self):
+        grid = self.game.grid
+        self.recorder.record(grid.get_state_array(), getattr(grid, "generation", self.steps))
+
+    def reset_steps(self):
+        """Restart the step counter; submit it to count from the next generation."""
+        self.steps = 0
+
+    def latest(self) -> Snapshot:
+        """The newest published snapshot."""
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            self._taken = True
+            return self._snapshot
+
+    def _publish(self):
+        snapshot = Snapshot(self.game, self.steps, self.step_ms)
+        with self._lock:
+            self._snapshot = snapshot
+            self._taken = False
+
+    def _apply_commands(self) -> bool:
+        applied = False
+        while True:
+            try:
+                command = self._commands.get_nowait()
+            except queue.Empty:
+                return applied
+            command()
+            applied = True
+
+    def _run(self):
+        try:
+            self._loop()
+        except BaseException as error:  # in der GUI erneut auslösen, statt still stehen zu bleiben
+            self._error = error
+            self._running = False
+
+    def _loop(self):
+        next_step = time.perf_counter()
+        window_start, window_steps = next_step, 0  # für generations_per_second
+        while not self._stop.is_set():
+            edited = self._apply_commands()
+            if not self._running:
+                if edited:
+                    self._publish()
+                self.generations_per_second = 0.0
+                self._wake.wait()
+                self._wake.clear()
+                next_step = window_start = time.perf_counter()
+                window_steps = 0
+                continue
+
+            now = time.perf_counter()
+            if self.rate and now < next_step:  # auf den nächsten Schritt warten, Befehle wecken vorzeitig
+                self._wake.wait(next_step - now)
+                self._wake.clear()
+                continue
+
+            if self.recorder is not None and self.recorder.last is None:
+                self._record()  # Ausgangszustand als erster Frame
+            finished = self.game.next_generation()
+            self.step_ms = (time.perf_counter() - now) * 1000
+            self.steps += 1
+            if self.recorder is not None:
+                self._record()
+            window_steps += 1
+            if finished:
+                self._running = False  # Zyklus oder ausgestorben: automatisch anhalten
+            if self.rate:
+                next_step = max(next_step, now) + 1 / self.rate  # kein Nachholen nach einer Verzögerung
+            if finished or edited or self._taken:
+                self._publish()
+
+            elapsed = time.perf_counter() - window_start
+            if elapsed >= 0.5:
+                self.generations_per_second = window_steps / elapsed
+                window_start, window_steps = time.perf_counter(), 0
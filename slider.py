@@ -49,3 +49,9 @@ class Slider:
         self.value = new_value # ändert Wert
         self.circle_x = self.x + ((self.value-self.min_value)/(self.max_value-self.min_value)) * self.width # Berechnet Position des Kreises auf dem Slider, sodass er verschoben wird
         # Die Funktion ist wichtig, da die Geschwindigkeit auch mit den Pfeiltasten gesteuert werden kann, sodass Update hierfür nicht aufgerufen wird, da die Mouse Position nicht zwingend auf dem Slider liegt
+
+    def set_range(self, min_value, max_value):
+        # Grenzen ändern (z.B. Zeitleiste, die mit jeder Generation wächst), der Wert bleibt innerhalb
+        self.min_value = min_value
+        self.max_value = max(max_value, min_value + 1) # sonst Division durch 0
+        self.change_value(min(max(self.value, self.min_value), self.max_value))
@@ -0,0 +1,45 @@
+import csv
+
+import numpy as np
+
+
+# Ringpuffer mit einer Zeile pro Generation
+class StatsHistory:
+    """Bounded per-generation time series of population, births and deaths.
+
+    Holds the last ``capacity`` generations in a fixed numpy ring buffer, so
+    recording costs O(1) and memory stays constant on long runs.
+    """
+
+    FIELDS = ("generation", "population", "births", "deaths")
+
+    def __init__(self, capacity: int = 10_000) -> None:
+        self.capacity = capacity
+        self._data = np.zeros((capacity, len(self.FIELDS)), dtype=np.int64)
+        self._next = 0  # nächster Schreibindex
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record(self, generation: int, population: int, births: int, deaths: int):
+        self._data[self._next] = (generation, population, births, deaths)
+        self._next = (self._next + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def rows(self) -> np.ndarray:
+        """All recorded rows, oldest first (columns as in FIELDS)."""
+        if self._size < self.capacity:
+            return self._data[:self._size].copy()
+        return np.concatenate((self._data[self._next:], self._data[:self._next]))
+
+    def clear(self):
+        self._next = 0
+        self._size = 0
+
+    def to_csv(self, path: str):
+        """Write the recorded rows (with a header line) to a CSV file."""
+        with open(path, "w", newline="") as file:
+            writer = csv.writer(file)
+            writer.writerow(self.FIELDS)
+            writer.writerows(self.rows().tolist())
@@ -0,0 +1,90 @@
+"""Edge modes: a glider on the torus, Klein bottle and mirror edge against their torus covers."""
+import numpy as np
+import pytest
+
+from engine import make_grid
+
+BACKENDS = ["object", "numpy", "tiled", "parallel", "bitpacked"]
+GLIDER = np.array([[0, 1, 0], [0, 0, 1], [1, 1, 1]], dtype=np.uint8)
+
+
+def grid_for(backend, width, height, boundary, state):
+    grid = make_grid(backend, width, height, 1, boundary=boundary, **({"workers": 2} if backend == "parallel" else {}))
+    grid.set_state_array(state)
+    return grid
+
+
+def run(grid, generations):
+    try:
+        for _ in range(generations):
+            grid.update()
+        return grid.get_state_array()
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+def soup(width, height, seed=3):
+    return (np.random.default_rng(seed).random((width, height)) < 0.35).astype(np.uint8)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+@pytest.mark.parametrize("size", [(6, 6), (10, 10), (13, 13), (70, 70)])
+def test_glider_returns_on_the_torus(backend, size):
+    width, height = size
+    start = np.zeros(size, dtype=np.uint8)
+    start[1:4, 1:4] = GLIDER
+    grid = grid_for(backend, width, height, "torus", start)
+    try:
+        # ein Gleiter wandert alle 4 Generationen eine Zelle diagonal: erst nach 4·N steht er wieder am Start
+        for generation in range(1, 4 * width + 1):
+            grid.update()
+            if generation % 4 == 0 and generation < 4 * width:
+                assert not np.array_equal(grid.get_state_array(), start), f"back too early ({generation})"
+        assert np.array_equal(grid.get_state_array(), start)
+    finally:
+        if hasattr(grid, "close"):
+            grid.close()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_glider_on_a_rectangular_torus(backend):
+    start = np.zeros((12, 8), dtype=np.uint8)
+    start[0:3, 0:3] = GLIDER
+    assert np.array_equal(run(grid_for(backend, 12, 8, "torus", start), 4 * 24), start)  # kgV(12, 8) = 24
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_klein_bottle_is_half_of_a_mirrored_torus(backend):
+    # über den Rand in y kommt man in x gespiegelt wieder herein: wie die obere Hälfte eines
+    # doppelt so hohen Torus, dessen untere Hälfte das Spiegelbild der oberen ist
+    width, height = 11, 9
+    state = soup(width, height)
+    cover = np.concatenate((state, state[::-1]), axis=1)
+    expected = run(grid_for("numpy", width, 2 * height, "torus", cover), 40)
+    assert np.array_equal(expected[:, height:], expected[::-1, :height])  # die Symmetrie bleibt erhalten
+    assert np.array_equal(run(grid_for(backend, width, height, "klein", state), 40), expected[:, :height])
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_mirror_edge_is_a_quarter_of_a_reflected_torus(backend):
+    # die Halo-Zellen wiederholen die Randzellen: wie ein Viertel eines doppelt so großen Torus
+    # mit gespiegelten Kopien des Felds
+    width, height = 10, 7
+    state = soup(width, height, seed=5)
+    half = np.concatenate((state, state[::-1]), axis=0)
+    cover = np.concatenate((half, half[:, ::-1]), axis=1)
+    expected = run(grid_for("numpy", 2 * width, 2 * height, "torus", cover), 40)
+    assert np.array_equal(run(grid_for(backend, width, height, "mirror", state), 40), expected[:width, :height])
+
+
+def test_glider_crossing_the_klein_edge_comes_back_mirrored():
+    width, height = 12, 10
+    start = np.zeros((width, height), dtype=np.uint8)
+    start[2:5, 4:7] = GLIDER
+    # nach 4·H Generationen ist der Gleiter einmal in y herum und H Zellen in x gewandert;
+    # auf der Kleinschen Flasche kommt er dabei in x gespiegelt an (und läuft nun in die andere x-Richtung)
+    klein = run(grid_for("numpy", width, height, "klein", start), 4 * height)
+    assert np.array_equal(klein, np.roll(start[::-1], -height, axis=0))
+    torus = run(grid_for("numpy", width, height, "torus", start), 4 * height)
+    assert np.array_equal(torus, np.roll(start, height, axis=(0, 1)))
@@ -0,0 +1,149 @@
+"""Binary checkpoints: round trips between all backends and detection of damaged files."""
+import struct
+
+import numpy as np
+import pytest
+
+import checkpoint
+from engine import GameOfLife, make_grid
+
+WIDTH, HEIGHT = 24, 20
+BACKENDS = {
+    "object": {},
+    "numpy": {},
+    "tiled": {},
+    "parallel": {},
+    "chunked": {},
+    "bitpacked": {},
+    "bitpacked+ages": {"track_ages": True},
+}
+
+
+def make_game(name: str) -> GameOfLife:
+    """A game of the backend ``name`` holding the same cells: random states, ages and freeze flags."""
+    game = GameOfLife(WIDTH, HEIGHT, 1, backend="numpy")
+    game.grid = make_grid(name.split("+")[0], WIDTH, HEIGHT, 1, **BACKENDS[name])
+    rng = np.random.default_rng(7)
+    state = (rng.random((WIDTH, HEIGHT)) < 0.4).astype(np.uint8)
+    ages = rng.integers(0, 300, (WIDTH, HEIGHT))
+    ages[rng.random((WIDTH, HEIGHT)) < 0.2] = 0
+    freezed = rng.random((WIDTH, HEIGHT)) < 0.1
+    game.grid.set_cell_arrays(state, ages, freezed)
+    for _ in range(3):  # laufende Zähler und Generation wie nach einem echten Spiel
+        game.next_generation()
+    return game
+
+
+def close(game):
+    if hasattr(game.grid, "close"):
+        game.grid.close()
+
+
+@pytest.fixture(scope="module")
+def saved(tmp_path_factory):
+    """Checkpoint path and cells (as the saving grid reports them) for every backend."""
+    directory = tmp_path_factory.mktemp("checkpoints")
+    files = {}
+    for name in BACKENDS:
+        game = make_game(name)
+        path = str(directory / f"{name}.golc")
+        game.save_checkpoint(path)
+        game.grid.get_stats()
+        files[name] = path, game.grid.get_cell_arrays(), list(game.grid.stats), getattr(game.grid, "generation", 0)
+        close(game)
+    return files
+
+
+@pytest.mark.parametrize("target", BACKENDS)
+@pytest.mark.parametrize("source", BACKENDS)
+def test_round_trip_between_backends(saved, source, target):
+    path, (state, ages, freezed), stats, generation = saved[source]
+    if target.startswith("bitpacked") and source != "bitpacked+ages":
+        # das Bit-Grid übernimmt track_ages aus der Datei; ohne merkt es sich nur "neu" (Alter 0) oder "alt" (1)
+        ages = np.minimum(ages, 1)
+    game = GameOfLife(1, 1, 1, backend="numpy")
+    game.load_checkpoint(path, backend=target.split("+")[0])
+    try:
+        loaded_state, loaded_ages, loaded_freezed = game.grid.get_cell_arrays()
+        assert (game.width, game.height) == (WIDTH, HEIGHT)
+        assert np.array_equal(loaded_state, state)
+        assert np.array_equal(loaded_ages, ages)
+        assert np.array_equal(loaded_freezed, freezed)
+        game.grid.get_stats()
+        assert list(game.grid.stats) == stats  # "neu" heißt Alter 0, das bleibt auch beim Bit-Grid erhalten
+        assert getattr(game.grid, "generation", generation) == generation
+    finally:
+        close(game)
+
+
+def test_bitpacked_ages_are_reduced_to_fresh_flags(saved):
+    # ohne track_ages speichert das Bit-Grid nur die Ebene "fresh": Alter 0 bleibt 0, alles andere wird 1
+    path, (state, ages, freezed), _, _ = saved["numpy"]
+    assert ages.max() > 1
+    game = GameOfLife(1, 1, 1, backend="numpy")
+    game.load_checkpoint(path, backend="bitpacked")
+    assert np.array_equal(game.grid.get_cell_arrays()[1], (ages > 0).astype(np.int64))
+    bits = str(saved["numpy"][0]) + ".bits.golc"
+    game.save_checkpoint(bits)
+    assert "time_not_changed" not in checkpoint.read_header(bits)["planes"]
+    game.load_checkpoint(bits, backend="numpy")
+    assert np.array_equal(game.grid.get_cell_arrays()[1], (ages > 0).astype(np.int64))
+
+
+def test_bitpacked_with_track_ages_keeps_ages(saved):
+    path, (_, ages, _), _, _ = saved["bitpacked+ages"]
+    assert ages.max() > 1
+    assert "time_not_changed" in checkpoint.read_header(path)["planes"]
+    game = GameOfLife(1, 1, 1, backend="numpy")
+    game.load_checkpoint(path)
+    assert game.grid.track_ages
+    assert np.array_equal(game.grid.get_cell_arrays()[1], ages)
+
+
+@pytest.fixture
+def damaged(saved, tmp_path):
+    """Copy of a checkpoint as a bytearray and a function to write it back and load it."""
+    data = bytearray(open(saved["numpy"][0], "rb").read())
+    path = str(tmp_path / "damaged.golc")
+
+    def load(content, verify=True):
+        with open(path, "wb") as file:
+            file.write(bytes(content))
+        GameOfLife(1, 1, 1, backend="numpy").load_checkpoint(path, verify=verify)
+
+    return data, load
+
+
+def test_flipped_payload_byte_is_a_checksum_mismatch(damaged):
+    data, load = damaged
+    data[-1] ^= 0xFF  # die Datei endet mit der letzten Ebene
+    with pytest.raises(ValueError, match="checksum mismatch in plane"):
+        load(data)
+
+
+def test_flipped_header_byte_is_a_checksum_mismatch(damaged):
+    data, load = damaged
+    data[30] ^= 0x01  # im JSON-Header
+    with pytest.raises(ValueError, match="corrupt checkpoint header"):
+        load(data)
+
+
+@pytest.mark.parametrize("length", [0, 10, 40, -1])
+def test_truncated_file(damaged, length):
+    data, load = damaged
+    with pytest.raises(ValueError, match="too short|checksum mismatch|truncated"):
+        load(data[:length], verify=False)
+
+
+def test_wrong_magic(damaged):
+    data, load = damaged
+    data[:8] = b"NOTACKPT"
+    with pytest.raises(ValueError, match="wrong magic"):
+        load(data)
+
+
+def test_unsupported_version(damaged):
+    data, load = damaged
+    data[8:12] = struct.pack("<I", checkpoint.VERSION + 1)
+    with pytest.raises(ValueError, match="unsupported checkpoint version"):
+        load(data)
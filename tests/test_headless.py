@@ -0,0 +1,32 @@
+"""Smoke test of the headless runner with every grid backend."""
+import json
+import sys
+
+import pytest
+
+import headless
+from engine import GRID_BACKENDS
+
+
+def boundary_for(backend):
+    return "infinite" if backend == "chunked" else "dead"  # die Chunk-Ebene hat keinen Rand
+
+
+@pytest.mark.parametrize("backend", sorted(GRID_BACKENDS))
+def test_random_board_on_the_command_line(backend, monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["headless.py", "random", "--width", "32", "--height", "32",
+                                      "--generations", "10", "--seed", "1", "--backend", backend,
+                                      "--boundary", boundary_for(backend), "--json"])
+    headless.main()
+    report = json.loads(capsys.readouterr().out)
+    assert report["backend"] == backend
+    assert report["generations"] == 10
+    assert 0 <= report["population"] <= 32 * 32
+
+
+@pytest.mark.parametrize("backend", sorted(GRID_BACKENDS))
+def test_backends_agree_on_a_pattern(backend):
+    # die Gleiter der Kanone erreichen in 60 Generationen den Rand nicht, also zählt auch die Chunk-Ebene gleich
+    expected = headless.run("gosper_glider_gun", 80, 80, 60, "dead", "numpy")["population"]
+    report = headless.run("gosper_glider_gun", 80, 80, 60, boundary_for(backend), backend)
+    assert report["population"] == expected
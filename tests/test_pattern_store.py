@@ -0,0 +1,138 @@
+"""PatternStore with a stub client and a temporary cache file (no Supabase needed)."""
+import json
+
+import pytest
+
+from pattern_library import patterns as bundled_patterns
+from pattern_store import PatternStore, patterns_version
+
+
+class StubClient:
+    """Stands in for Supabase: ``table`` is the remote table, ``offline`` makes every call fail."""
+
+    def __init__(self, table=None):
+        self.table = dict(table or {})
+        self.offline = False
+        self.fetches = 0
+
+    def fetch(self):
+        self.fetches += 1
+        if self.offline:
+            raise ConnectionError("no network")
+        return dict(self.table)
+
+    def add(self, pattern):
+        self.table[pattern["Name"]] = pattern["Code"]
+
+    def delete(self, name):
+        self.table.pop(name, None)
+
+
+def make_store(cache_path, client):
+    return PatternStore(str(cache_path), fetch=client.fetch, add=client.add, delete=client.delete)
+
+
+def write_cache(cache_path, remote, updated_at=1.0):
+    cache_path.write_text(json.dumps({"updated_at": updated_at, "version": patterns_version(remote),
+                                      "patterns": remote}))
+
+
+def read_cache(cache_path):
+    return json.loads(cache_path.read_text())["patterns"]
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    return tmp_path / "patterns_cache.json"
+
+
+def test_cold_start_is_served_from_the_cache(cache_path):
+    write_cache(cache_path, {"cached": "3o!"}, updated_at=42.0)
+    client = StubClient({"remote": "o!"})
+    store = make_store(cache_path, client)
+    assert client.fetches == 0  # der Start wartet nicht auf das Netz
+    assert store.patterns["cached"] == "3o!"
+    assert "remote" not in store.patterns
+    assert set(bundled_patterns) <= set(store.patterns)
+    assert store.updated_at == 42.0
+
+
+def test_cold_start_without_cache_has_the_bundled_patterns(cache_path):
+    store = make_store(cache_path, StubClient())
+    assert store.patterns == bundled_patterns
+    assert store.updated_at is None
+
+
+def test_background_refresh_updates_patterns_and_cache(cache_path):
+    write_cache(cache_path, {"cached": "3o!"})
+    client = StubClient({"remote": "o!", "glider": "2o!"})
+    store = make_store(cache_path, client)
+    version = store.version
+    store.refresh_async().join(5)
+    assert client.fetches == 1
+    assert store.patterns["remote"] == "o!"
+    assert store.patterns["glider"] == "2o!"  # die Tabelle gewinnt gegen die mitgelieferten Muster
+    assert "cached" not in store.patterns
+    assert store.version != version
+    assert read_cache(cache_path) == client.table
+    # ein neuer Start sieht den aktualisierten Cache sofort
+    assert make_store(cache_path, StubClient()).patterns == store.patterns
+
+
+def test_refresh_reports_changes_only_once(cache_path):
+    store = make_store(cache_path, StubClient({"remote": "o!"}))
+    assert store.refresh() is True
+    version = store.version
+    assert store.refresh() is False
+    assert store.version == version
+
+
+def test_offline_refresh_keeps_the_cached_patterns(cache_path):
+    write_cache(cache_path, {"cached": "3o!"})
+    client = StubClient({"remote": "o!"})
+    client.offline = True
+    store = make_store(cache_path, client)
+    patterns, version = store.patterns, store.version
+    store.refresh_async().join(5)
+    assert client.fetches == 1
+    assert isinstance(store.last_error, ConnectionError)
+    assert store.patterns == patterns and store.version == version
+    assert read_cache(cache_path) == {"cached": "3o!"}  # der Cache bleibt unangetastet
+    client.offline = False
+    assert store.refresh() is True
+    assert store.last_error is None
+    assert store.patterns["remote"] == "o!"
+
+
+def test_invalidate_forces_a_refetch(cache_path):
+    write_cache(cache_path, {"stale": "3o!"})
+    client = StubClient({"fresh": "o!"})
+    store = make_store(cache_path, client)
+    store.invalidate().join(5)
+    assert client.fetches == 1
+    assert "stale" not in store.patterns
+    assert store.patterns["fresh"] == "o!"
+    assert read_cache(cache_path) == {"fresh": "o!"}
+
+
+def test_invalidate_while_offline_falls_back_to_the_bundled_patterns(cache_path):
+    write_cache(cache_path, {"stale": "3o!"})
+    client = StubClient()
+    client.offline = True
+    store = make_store(cache_path, client)
+    store.invalidate().join(5)
+    assert store.patterns == bundled_patterns
+    assert not cache_path.exists()
+
+
+def test_add_and_delete_go_to_the_client_and_the_cache(cache_path):
+    client = StubClient()
+    store = make_store(cache_path, client)
+    store.add_pattern("bar", "3o!")
+    assert client.table == {"bar": "3o!"}
+    assert store.patterns["bar"] == "3o!"
+    assert read_cache(cache_path) == {"bar": "3o!"}
+    store.delete_pattern("bar")
+    assert client.table == {}
+    assert "bar" not in store.patterns
+    assert read_cache(cache_path) == {}
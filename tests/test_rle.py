@@ -0,0 +1,142 @@
+"""RLE codec: round trips, header parsing, streaming blocks and parity with the old parser."""
+import numpy as np
+import pytest
+
+import rle
+from engine import Grid, NumpyGrid
+from pattern_library import patterns
+
+
+def legacy_parse_rle(code):
+    """``Grid.parse_rle`` before the streaming decoder (header-less bodies, states 0/1)."""
+    lines = code.splitlines()
+    pattern = ''.join(line for line in lines if not line.startswith('#')).replace('\n', '')
+    rows, current_row, count = [], [], ''
+    for char in pattern:
+        if char.isdigit():
+            count += char
+        elif char in 'bo':
+            current_row.extend([1 if char == 'o' else 0] * (int(count) if count else 1))
+            count = ''
+        elif char == '$':
+            rows.append(current_row)
+            current_row = []
+    rows.append(current_row)
+    max_length = max(len(row) for row in rows)
+    return [row + [0] * (max_length - len(row)) for row in rows]
+
+
+@pytest.fixture
+def small_blocks(monkeypatch):
+    """Blocks of a few characters, so runs, counts and prefixes are split between blocks."""
+    monkeypatch.setattr(rle, "CHUNK_SIZE", 3)
+
+
+def random_bitmap(shape, states=2, seed=0):
+    return np.random.default_rng(seed).integers(0, states, shape).astype(np.uint8)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (7, 13), (40, 3), (64, 64)])
+@pytest.mark.parametrize("states", [2, 25, 256])
+def test_round_trip_random(shape, states, small_blocks):
+    bitmap = random_bitmap(shape, states, seed=shape[0] * states)
+    header, decoded = rle.decode(rle.encode(bitmap))
+    assert (header["x"], header["y"]) == (shape[1], shape[0])
+    assert np.array_equal(decoded, bitmap)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (5, 8), (0, 0)])
+def test_round_trip_empty(shape):
+    bitmap = np.zeros(shape, dtype=np.uint8)
+    text = rle.encode(bitmap)
+    assert text.endswith("!\n")
+    assert np.array_equal(rle.decode(text)[1], bitmap)
+
+
+def test_round_trip_single_live_cell():
+    assert rle.encode(np.ones((1, 1), dtype=np.uint8)).splitlines()[-1] == "o!"
+    assert np.array_equal(rle.decode(rle.encode(np.ones((1, 1))))[1], [[1]])
+
+
+def test_long_runs_across_blocks(small_blocks):
+    bitmap = np.zeros((3, 1000), dtype=np.uint8)
+    bitmap[0, 1:999] = 1
+    bitmap[2, 500] = 1
+    text = rle.encode(bitmap)
+    assert "998o" in text
+    assert np.array_equal(rle.decode(text)[1], bitmap)
+
+
+def test_stream_matches_single_block(small_blocks):
+    code = patterns["gosper_glider_gun"]
+    streamed = rle.decode(code)[1]
+    rle.CHUNK_SIZE = 1 << 20
+    assert np.array_equal(streamed, rle.decode(code)[1])
+
+
+def test_header_fields():
+    header, bitmap = rle.decode("#N Glider\n#C a comment\nx = 3, y = 4, rule = B36/S23\nbo$2bo$3o!\n")
+    assert header["name"] == "Glider"
+    assert header["comments"] == ["#C a comment"]
+    assert (header["x"], header["y"], header["rule"]) == (3, 4, "B36/S23")
+    assert bitmap.shape == (4, 3)  # Größe aus dem Header, auch wenn das Muster kleiner ist
+    assert np.array_equal(bitmap[:3], [[0, 1, 0], [0, 0, 1], [1, 1, 1]])
+
+
+def test_header_rule_is_applied():
+    grid = NumpyGrid(10, 10, 1)
+    grid.apply_rle_pattern("x = 3, y = 3, rule = B36/S23\nbo$2bo$3o!")
+    assert str(grid.rule) == "B36/S23"
+
+
+def test_header_without_rule_and_runs_past_the_header_size():
+    header, bitmap = rle.decode("x = 2, y = 1\n4o!")
+    assert "rule" not in header
+    assert np.array_equal(bitmap, [[1, 1]])  # Läufe werden auf die Header-Größe gekürzt
+
+
+def test_encode_header_and_line_width():
+    text = rle.encode(np.ones((2, 200), dtype=np.uint8), rule="B3/S23", name="bar", line_width=10)
+    lines = text.splitlines()
+    assert lines[:2] == ["#N bar", "x = 200, y = 2, rule = B3/S23"]
+    assert all(len(line) <= 10 for line in lines[2:])
+
+
+def test_encode_grid_orientation_and_region():
+    grid = NumpyGrid(6, 5, 1, rule="B36/S23")
+    grid.stamp(np.array([[1, 1, 0], [0, 1, 1]], dtype=np.uint8), 2, 1)
+    header, bitmap = rle.decode(rle.encode_grid(grid, 2, 1, 4, 4))
+    assert header["rule"] == "B36/S23"
+    assert np.array_equal(bitmap, grid.get_state_array()[2:4, 1:4])
+
+
+def test_extended_states():
+    assert np.array_equal(rle.decode(".A2pAyO!")[1], [[0, 1, 25, 25, 255]])
+    assert np.array_equal(rle.decode("x = 3, y = 1\n.A2pAyO!")[1], [[0, 1, 25]])  # auf die Header-Größe gekürzt
+    assert "yO" in rle.encode(np.array([[255, 1]]))
+
+
+def test_extended_state_prefix_split_between_blocks(small_blocks):
+    assert np.array_equal(rle.decode("bbbpA!")[1], [[0, 0, 0, 25]])
+    assert np.array_equal(rle.decode("b12pB$!")[1][0, 1:], [26] * 12)
+
+
+@pytest.mark.parametrize("code, message", [
+    ("2o\N{MULTIPLICATION SIGN}o!", "non-ASCII"),
+    ("bpo!", "followed by A..X"),
+    ("bop!", "followed by A..X"),
+    ("yX!", "out of range"),
+])
+def test_invalid_bodies_raise_value_error(code, message):
+    with pytest.raises(ValueError, match=message):
+        rle.decode(code)
+
+
+def test_encode_rejects_states_out_of_range():
+    with pytest.raises(ValueError):
+        rle.encode(np.array([[256]]))
+
+
+@pytest.mark.parametrize("name", sorted(patterns))
+def test_parse_rle_matches_the_old_parser(name):
+    assert Grid.parse_rle(patterns[name]) == legacy_parse_rle(patterns[name])
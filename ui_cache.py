@@ -0,0 +1,69 @@
+from collections import OrderedDict
+from typing import Callable, Hashable, Tuple
+
+import pygame
+
+
+# LRU-Cache für gerenderte Texte, damit unveränderte Labels nicht jedes Frame neu gerastert werden
+class TextCache:
+    """Rendered text surfaces keyed by (text, colour, antialias), with LRU eviction.
+
+    ``render`` has the same arguments as ``Font.render`` and returns the
+    cached surface if the same text was rendered before. Labels whose text
+    changes every frame (counters) simply push the oldest entries out once
+    ``capacity`` surfaces are stored.
+    """
+
+    def __init__(self, font: pygame.font.Font, capacity: int = 256) -> None:
+        self.font = font
+        self.capacity = capacity
+        self._surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def render(self, text: str, antialias: bool, color: Tuple[int, int, int]) -> pygame.Surface:
+        key = (text, tuple(color), bool(antialias))
+        surface = self._surfaces.get(key)
+        if surface is not None:
+            self._surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = self._surfaces[key] = self.font.render(text, antialias, color)
+        if len(self._surfaces) > self.capacity:
+            self._surfaces.popitem(last=False)
+        return surface
+
+
+# Vorab zusammengesetzte Ebene (z. B. Buttons oder Legende), die nur bei geändertem Inhalt neu gebaut wird
+class CachedLayer:
+    """Surface composited once by ``build(surface, key)`` and rebuilt only when ``key`` changes.
+
+    ``key`` describes everything the content depends on (e.g. the current
+    rule for the legend). ``background`` fills the surface before building;
+    without it the layer is transparent.
+    """
+
+    def __init__(self, size: Tuple[int, int], build: Callable[[pygame.Surface, Hashable], None],
+                 background: Tuple[int, int, int] = None) -> None:
+        self.size = size
+        self.build = build
+        self.background = background
+        self.rebuilds = 0
+        self._surface = None
+        self._key = None
+
+    def get(self, key: Hashable = None) -> pygame.Surface:
+        if self._surface is None or key != self._key:
+            if self.background is None:
+                self._surface = pygame.Surface(self.size, pygame.SRCALPHA)
+            else:
+                self._surface = pygame.Surface(self.size)
+                self._surface.fill(self.background)
+            self.build(self._surface, key)
+            self._key = key
+            self.rebuilds += 1
+        return self._surface
@@ -0,0 +1,85 @@
+from typing import Optional, Tuple
+
+
+# Kamera über der festen Welt: Zoom und Verschieben ändern nur den Ausschnitt
+class Viewport:
+    """Camera over a fixed-size world of cells.
+
+    The world (the grid) keeps its size; zooming only changes ``cell_size``
+    and panning only moves the top-left visible cell ``(x0, y0)``. Nothing is
+    allocated or copied, so cells outside the visible area keep their state.
+    ``visible`` returns the slices of the world that are on screen.
+    """
+
+    def __init__(self, world_width: int, world_height: int, cell_size: int,
+                 screen_width: int = 900, screen_height: int = 900) -> None:
+        self.world_width = world_width
+        self.world_height = world_height
+        self.screen_width = screen_width
+        self.screen_height = screen_height
+        self.cell_size = cell_size
+        self.x0, self.y0 = 0, 0
+        self.center()
+
+    @property
+    def columns(self) -> int:
+        """Number of visible cells in x (at most the world width)."""
+        return min(self.screen_width // self.cell_size, self.world_width)
+
+    @property
+    def rows(self) -> int:
+        return min(self.screen_height // self.cell_size, self.world_height)
+
+    @property
+    def visible(self) -> Tuple[slice, slice]:
+        """Slices of the world that are on screen, indexed [x, y]."""
+        return slice(self.x0, self.x0 + self.columns), slice(self.y0, self.y0 + self.rows)
+
+    @property
+    def board_size(self) -> Tuple[int, int]:
+        """Size of the board on screen in pixels."""
+        return self.columns * self.cell_size, self.rows * self.cell_size
+
+    def _clamp(self):
+        self.x0 = min(max(self.x0, 0), self.world_width - self.columns)
+        self.y0 = min(max(self.y0, 0), self.world_height - self.rows)
+
+    def center(self):
+        """Show the middle of the world."""
+        self.x0 = (self.world_width - self.columns) // 2
+        self.y0 = (self.world_height - self.rows) // 2
+        self._clamp()
+
+    def zoom(self, cell_size: int, anchor: Optional[Tuple[int, int]] = None):
+        """Change the cell size, keeping the cell under ``anchor`` (screen pixels) in place.
+
+        Without an anchor the centre of the board stays in place.
+        """
+        if cell_size == self.cell_size:
+            return
+        if anchor is None:
+            anchor = (self.columns * self.cell_size // 2, self.rows * self.cell_size // 2)
+        world_x = self.x0 + anchor[0] / self.cell_size
+        world_y = self.y0 + anchor[1] / self.cell_size
+        self.cell_size = cell_size
+        self.x0 = round(world_x - anchor[0] / cell_size)
+        self.y0 = round(world_y - anchor[1] / cell_size)
+        self._clamp()
+
+    def pan(self, dx: int, dy: int):
+        """Move the view by ``dx``/``dy`` cells."""
+        self.x0 += dx
+        self.y0 += dy
+        self._clamp()
+
+    def to_cell(self, pos: Tuple[int, int]) -> Optional[Tuple[int, int]]:
+        """World cell under a screen position, or None outside the board."""
+        if not (0 <= pos[0] < self.columns * self.cell_size and 0 <= pos[1] < self.rows * self.cell_size):
+            return None
+        return self.x0 + pos[0] // self.cell_size, self.y0 + pos[1] // self.cell_size
+
+    def to_world(self, pos: Tuple[int, int]) -> Optional[Tuple[float, float]]:
+        """World position (in cells, fractional) under a screen position, or None outside the board."""
+        if self.to_cell(pos) is None:
+            return None
+        return self.x0 + pos[0] / self.cell_size, self.y0 + pos[1] / self.cell_size